@@ -0,0 +1,395 @@
+"""Local stand-ins for every service the command handlers talk to, seeded with synthetic data.
+
+    async with local_backends(Scale(users=200, games=2_000, sessions=5_000)) as backends:
+        interaction = FakeInteraction(backends.dataset.discord_id(1))
+        await handle_my_games(interaction)
+
+Supabase is the sqlite-backed FakePostgREST from the test suite, BoardGameGeek is a small
+aiohttp server answering /search and /thing from the same catalogue, and OpenAI is a canned
+streaming completion. Optional latencies make the fakes behave more like the real services.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List, NamedTuple, Optional
+from unittest.mock import patch
+from xml.sax.saxutils import quoteattr
+import discord
+from aiohttp import web
+from helpers import query_tracker, supa_helpers
+from helpers.bgg_client import bgg
+from helpers.game_index import game_index
+from tests.fake_postgrest import FakePostgREST
+
+SERVER_ID = 1
+DISCORD_ID_OFFSET = 10_000_000
+BGG_ID_OFFSET = 100_000
+
+WORDS = [
+    "catan", "ticket", "ride", "pandemic", "legacy", "terraforming", "mars", "azul", "wingspan",
+    "gloomhaven", "root", "scythe", "everdell", "brass", "birmingham", "carcassonne", "dominion",
+    "splendor", "agricola", "twilight", "imperium", "spirit", "island", "arkham", "horror",
+    "kingdom", "castles", "burgundy", "codenames", "dune", "empire", "frontier", "galaxy",
+]
+
+
+class Scale(NamedTuple):
+    users: int = 50
+    games: int = 500
+    sessions: int = 1_000
+    # Games in each user's collection.
+    games_per_user: int = 30
+    # Titles BGG knows about beyond the ones stored locally, which makes searches broad.
+    bgg_catalogue: int = 5_000
+
+    def __str__(self) -> str:
+        return f"{self.users} users × {self.games} games × {self.sessions} sessions"
+
+
+@dataclass
+class Dataset:
+    scale: Scale
+    tables: Dict[str, List[dict]] = field(default_factory=dict)
+    catalogue: Dict[int, str] = field(default_factory=dict)
+    # Sessions not yet handed out by take_session_id.
+    unused_session_ids: List[int] = field(default_factory=list)
+
+    @staticmethod
+    def discord_id(user_id: int) -> int:
+        return DISCORD_ID_OFFSET + user_id
+
+    @property
+    def game_names(self) -> List[str]:
+        return [g["name"] for g in self.tables["games"]]
+
+    def take_session_id(self, rng: random.Random) -> int:
+        """A random session that no earlier call has been given, for commands that delete it."""
+        if not self.unused_session_ids:
+            raise RuntimeError(f"All {self.scale.sessions} sessions have been used; seed more sessions")
+        return self.unused_session_ids.pop(rng.randrange(len(self.unused_session_ids)))
+
+
+def game_name(rng: random.Random, index: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))).title() + f" {index}"
+
+
+def synthetic_dataset(scale: Scale, seed: int = 42) -> Dataset:
+    """Rows for every table, with ids assigned up front so they can be referenced directly."""
+    rng = random.Random(seed)
+    synced_at = datetime.now(timezone.utc).isoformat()
+    dataset = Dataset(scale)
+    t = dataset.tables
+
+    t["users"] = [
+        {"id": i, "discord_id": dataset.discord_id(i), "username": f"player{i}", "nickname": f"Player {i}" if i % 3 else ""}
+        for i in range(1, scale.users + 1)
+    ]
+    t["users_servers"] = [{"user_id": i, "server_id": SERVER_ID} for i in range(1, scale.users + 1)]
+
+    dataset.catalogue = {BGG_ID_OFFSET + i: game_name(rng, i) for i in range(1, max(scale.games, scale.bgg_catalogue) + 1)}
+    t["games"] = [
+        {
+            "id": i, "bgg_id": BGG_ID_OFFSET + i, "name": dataset.catalogue[BGG_ID_OFFSET + i],
+            "publisher": "", "designer": "", "min_players": 2, "max_players": 4, "bgg_synced_at": synced_at,
+        }
+        for i in range(1, scale.games + 1)
+    ]
+    t["users_games"] = [
+        {"user_id": u, "game_id": g}
+        for u in range(1, scale.users + 1)
+        for g in rng.sample(range(1, scale.games + 1), min(scale.games_per_user, scale.games))
+    ]
+
+    start = datetime(2023, 1, 1)
+    t["sessions"], t["sessions_users"], t["sessions_winners"] = [], [], []
+    for s in range(1, scale.sessions + 1):
+        t["sessions"].append({
+            "id": s, "game_id": rng.randint(1, scale.games), "server_id": SERVER_ID, "name": f"Game night {s}",
+            "date": (start + timedelta(days=rng.randint(0, 900))).date().isoformat(),
+        })
+        players = rng.sample(range(1, scale.users + 1), min(rng.randint(2, 5), scale.users))
+        t["sessions_users"] += [{"session_id": s, "user_id": u} for u in players]
+        t["sessions_winners"].append({"session_id": s, "user_id": rng.choice(players)})
+    dataset.unused_session_ids = [s["id"] for s in t["sessions"]]
+    return dataset
+
+
+def seed(db: FakePostgREST, dataset: Dataset):
+    for table in ("users", "users_servers", "games", "users_games", "sessions", "sessions_users", "sessions_winners"):
+        db.seed(table, dataset.tables[table])
+    db.rpc_overrides["get_game_stats"] = game_stats_rpc
+
+
+def game_stats_rpc(db, args: dict) -> List[dict]:
+    """migrations/002_get_game_stats.sql for sqlite, which has no ordered jsonb_agg."""
+    game_id, server_id = args["p_game_id"], args["p_server_id"]
+    [(total_plays,)] = db.execute("select count(*) from sessions where game_id = ? and server_id = ?", (game_id, server_id))
+    [(rating_avg, rating_count)] = db.execute("select avg(rating), count(*) from users_game_ratings where game_id = ?", (game_id,))
+    wins = db.execute(
+        """select sw.user_id, u.username, u.nickname, count(*) as wins
+           from sessions_winners sw
+           join sessions s on s.id = sw.session_id
+           left join users u on u.id = sw.user_id
+           where s.game_id = ? and s.server_id = ?
+           group by sw.user_id
+           order by wins desc, sw.user_id""",
+        (game_id, server_id),
+    )
+    return [{"total_plays": total_plays, "rating_avg": rating_avg, "rating_count": rating_count, "win_counts": [dict(w) for w in wins]}]
+
+
+class FakeBGG:
+    """BoardGameGeek XML API stand-in serving a synthetic catalogue."""
+
+    def __init__(self, catalogue: Dict[int, str], latency: float = 0.0):
+        self.catalogue = catalogue
+        self.latency = latency
+        self.requests = 0
+        self.url: Optional[str] = None
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_get("/search", self.handle_search)
+        app.router.add_get("/thing", self.handle_thing)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.url = f"http://{bound_host}:{bound_port}"
+        return self.url
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _respond(self, body: str) -> web.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return web.Response(text=f'<?xml version="1.0" encoding="utf-8"?>{body}', content_type="text/xml")
+
+    async def handle_search(self, request: web.Request) -> web.Response:
+        query = request.query.get("query", "").lower()
+        items = "".join(
+            f'<item type="boardgame" id="{bgg_id}"><name type="primary" value={quoteattr(name)}/>'
+            f'<yearpublished value="{1990 + bgg_id % 35}"/></item>'
+            for bgg_id, name in self.catalogue.items() if query in name.lower()
+        )
+        return await self._respond(f'<items total="{items.count("<item ")}">{items}</items>')
+
+    async def handle_thing(self, request: web.Request) -> web.Response:
+        ids = [int(i) for i in request.query.get("id", "").split(",") if i]
+        return await self._respond("<items>" + "".join(self.thing_xml(i) for i in ids if i in self.catalogue) + "</items>")
+
+    def thing_xml(self, bgg_id: int) -> str:
+        return (
+            f'<item type="boardgame" id="{bgg_id}">'
+            f"<thumbnail>https://example.invalid/{bgg_id}_t.jpg</thumbnail><image>https://example.invalid/{bgg_id}.jpg</image>"
+            f'<name type="primary" value={quoteattr(self.catalogue[bgg_id])}/>'
+            f'<yearpublished value="{1990 + bgg_id % 35}"/><minplayers value="2"/><maxplayers value="{2 + bgg_id % 5}"/>'
+            f'<playingtime value="{30 + bgg_id % 8 * 15}"/>'
+            f'<link type="boardgamedesigner" id="1" value="Designer {bgg_id % 50}"/>'
+            f'<link type="boardgamepublisher" id="2" value="Publisher {bgg_id % 20}"/>'
+            f'<statistics><ratings><usersrated value="{bgg_id % 9000}"/><average value="{6 + bgg_id % 30 / 10}"/>'
+            f'<ranks><rank type="subtype" name="boardgame" value="{bgg_id % 5000 + 1}"/></ranks>'
+            f'<averageweight value="{1 + bgg_id % 40 / 10}"/></ratings></statistics></item>'
+        )
+
+
+class FakeOpenAI:
+    """Enough of AsyncOpenAI for commands/ask_ai.py: a streamed chat completion."""
+
+    def __init__(self, chunks: int = 40, chunk_delay: float = 0.0):
+        self.chunks = chunks
+        self.chunk_delay = chunk_delay
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        return self._stream()
+
+    async def _stream(self):
+        for i in range(self.chunks):
+            if self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=f"word{i} "))])
+
+
+class FakeUser:
+    def __init__(self, user_id: int, name: str = "player", administrator: bool = True):
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.mention = f"<@{user_id}>"
+        self.guild_permissions = SimpleNamespace(administrator=administrator)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class FakeResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    def is_done(self) -> bool:
+        return self._interaction.acked_at is not None
+
+    def _ack(self, content: Any = None, **kwargs):
+        if self._interaction.acked_at is None:
+            self._interaction.acked_at = time.perf_counter()
+        self._interaction.record(content, **kwargs)
+
+    async def defer(self, **kwargs):
+        self._ack()
+
+    async def send_message(self, content: Any = None, **kwargs):
+        self._ack(content, **kwargs)
+
+    async def edit_message(self, content: Any = None, **kwargs):
+        self._ack(content, **kwargs)
+
+    async def send_modal(self, modal: Any):
+        self._ack(view=modal)
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    async def send(self, content: Any = None, **kwargs):
+        self._interaction.record(content, **kwargs)
+
+
+class FakeInteraction:
+    """Records when the interaction was first acknowledged, every message it sent, and the
+    view (or modal) it left on screen, which `press` can interact with next."""
+
+    def __init__(self, discord_id: int, guild_id: int = SERVER_ID):
+        self.user = FakeUser(discord_id, name=f"user{discord_id}")
+        self.guild_id = guild_id
+        self.created_at = time.perf_counter()
+        self.acked_at: Optional[float] = None
+        self.messages: List[Any] = []
+        self.surface: Any = None
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.channel = SimpleNamespace(send=self.followup.send)
+
+    def record(self, content: Any = None, **kwargs):
+        if content is not None:
+            self.messages.append(content)
+        if "view" in kwargs:
+            self.surface = kwargs["view"]
+
+    async def edit_original_response(self, content: Any = None, **kwargs):
+        self.record(content, **kwargs)
+
+
+def _does_something(item: discord.ui.Item) -> bool:
+    # A plain ui.Button without a callback (e.g. delete_session's Cancel) does nothing when clicked.
+    return getattr(item.callback, "__func__", None) is not discord.ui.Button.callback
+
+
+async def press(surface: Any, interaction: FakeInteraction) -> bool:
+    """Use the first enabled component of a view that has a callback (first option of a select),
+    or submit a modal with its inputs left blank. Returns False if there was nothing to press."""
+    if isinstance(surface, discord.ui.Modal):
+        for child in surface.children:
+            child._refresh_state(interaction, {})
+        await surface.on_submit(interaction)
+        return True
+    if not isinstance(surface, discord.ui.View):
+        return False
+    for item in surface.children:
+        if isinstance(item, discord.ui.Select) and item.options:
+            item._refresh_state(interaction, {"values": [item.options[0].value]})
+        elif not (isinstance(item, discord.ui.Button) and not item.disabled and item.url is None and _does_something(item)):
+            continue
+        await item.callback(interaction)
+        return True
+    return False
+
+
+class BackgroundLoop:
+    """An event loop on its own thread, so the fake services don't compete with the bot's loop."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="fake-backends", daemon=True)
+        self.thread.start()
+
+    async def run(self, coro):
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+@dataclass
+class Backends:
+    dataset: Dataset
+    db: FakePostgREST
+    bgg: FakeBGG
+    openai: FakeOpenAI
+
+
+@asynccontextmanager
+async def local_backends(
+    scale: Scale = Scale(),
+    seed_value: int = 42,
+    bgg_latency: float = 0.0,
+    openai_chunk_delay: float = 0.0,
+    isolated: bool = False,
+):
+    """Start and seed every fake, and point the bot's clients and caches at them for the duration.
+
+    With `isolated`, the fake servers run on a BackgroundLoop instead of the caller's loop.
+    """
+    background = BackgroundLoop() if isolated else None
+
+    async def on_backend_loop(coro):
+        return await (background.run(coro) if background else coro)
+
+    dataset = synthetic_dataset(scale, seed_value)
+    db = FakePostgREST()
+    await on_backend_loop(db.start())
+    seed(db, dataset)
+    client = db.client()
+    query_tracker.install(client)
+
+    fake_bgg = FakeBGG(dataset.catalogue, latency=bgg_latency)
+    await on_backend_loop(fake_bgg.start())
+    fake_openai = FakeOpenAI(chunk_delay=openai_chunk_delay)
+
+    def reset_caches():
+        game_index.replace([])
+        game_index.loaded = False
+        supa_helpers.user_cache.clear()
+        bgg.search_cache.clear()
+        bgg.thing_cache.clear()
+
+    from commands import ask_ai
+    base_url = bgg.base_url
+    reset_caches()
+    bgg.base_url = fake_bgg.url
+    try:
+        with patch.object(supa_helpers, "supabase", client), patch.object(ask_ai, "client", fake_openai):
+            yield Backends(dataset, db, fake_bgg, fake_openai)
+    finally:
+        bgg.base_url = base_url
+        reset_caches()
+        await bgg.close()
+        await client.postgrest.aclose()
+        await on_backend_loop(fake_bgg.close())
+        await on_backend_loop(db.close())
+        if background:
+            background.stop()
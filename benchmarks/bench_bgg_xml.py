@@ -0,0 +1,73 @@
+"""Compare building a full ElementTree for a BGG search response with the streaming
+ItemReader that stops after the first 20 items.
+
+    python -m benchmarks.bench_bgg_xml [--items 500 5000 20000] [--file recorded_search.xml] [--repeat 5]
+
+Without --file, a search payload shaped like BGG's answer to a broad query ("the") is generated.
+"""
+
+import argparse
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from helpers.bgg_client import BGG_SEARCH_LIMIT
+from helpers.bgg_xml import parse_items
+
+
+def search_payload(count: int) -> bytes:
+    items = "".join(
+        f'<item type="boardgame" id="{100000 + i}">'
+        f'<name type="{"primary" if i % 3 else "alternate"}" value="The Game of Things, Volume {i}"/>'
+        f'<yearpublished value="{1950 + i % 75}"/></item>'
+        for i in range(count)
+    )
+    return (
+        f'<?xml version="1.0" encoding="utf-8"?>'
+        f'<items total="{count}" termsofuse="https://boardgamegeek.com/xmlapi/termsofuse">{items}</items>'
+    ).encode()
+
+
+def full_tree(payload: bytes) -> list:
+    return ET.fromstring(payload).findall("item")[:BGG_SEARCH_LIMIT]
+
+
+def streamed(payload: bytes) -> list:
+    return parse_items(payload, limit=BGG_SEARCH_LIMIT)
+
+
+def measure(parse, payload: bytes, repeat: int) -> tuple[float, float]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(payload)
+    elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+
+    tracemalloc.start()
+    parse(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, nargs="+", default=[500, 5_000, 20_000])
+    parser.add_argument("--file", help="a recorded BGG search response to use instead of generated payloads")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "rb") as f:
+            payloads = [(args.file, f.read())]
+    else:
+        payloads = [(f"{count} items", search_payload(count)) for count in args.items]
+
+    print(f"{'payload':>14} {'size KB':>9} {'tree ms':>9} {'tree KB':>9} {'stream ms':>10} {'stream KB':>10}")
+    for label, payload in payloads:
+        assert [i.get("id") for i in full_tree(payload)] == [i.get("id") for i in streamed(payload)]
+        tree_ms, tree_kb = measure(full_tree, payload, args.repeat)
+        stream_ms, stream_kb = measure(streamed, payload, args.repeat)
+        print(f"{label:>14} {len(payload) / 1024:>9.0f} {tree_ms:>9.2f} {tree_kb:>9.0f} {stream_ms:>10.2f} {stream_kb:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compare the old search_games_fuzzy (thefuzz over every row, full sort) with the
+resident GameNameIndex at several catalogue sizes.
+
+    python -m benchmarks.bench_game_index [--sizes 1000 10000 100000] [--queries 20]
+"""
+
+import argparse
+import random
+import time
+from thefuzz import fuzz
+from helpers.game_index import GameNameIndex
+
+WORDS = [
+    "catan", "ticket", "ride", "pandemic", "legacy", "terraforming", "mars", "azul", "wingspan",
+    "gloomhaven", "root", "scythe", "everdell", "brass", "birmingham", "carcassonne", "dominion",
+    "splendor", "agricola", "twilight", "imperium", "spirit", "island", "arkham", "horror",
+    "kingdom", "castles", "burgundy", "codenames", "dune", "empire", "frontier", "galaxy",
+]
+QUERIES = ["catan", "ticket to ride", "spirit island", "arkham", "dune imperium", "brass", "wing"]
+
+
+def synthetic_games(count: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {"id": i, "name": " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title() + f" {i}"}
+        for i in range(1, count + 1)
+    ]
+
+
+def full_scan_search(all_games: list[dict], query: str, limit: int = 10) -> list[dict]:
+    scored = [(g, fuzz.partial_ratio(query.lower(), g["name"].lower())) for g in all_games]
+    top_matches = sorted(scored, key=lambda x: x[1], reverse=True)[:limit]
+    return [g for g, _ in top_matches]
+
+
+def time_per_query(search, queries: list[str]) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    queries = [QUERIES[i % len(QUERIES)] for i in range(args.queries)]
+    print(f"{'games':>8} {'full scan ms':>14} {'index ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        games = synthetic_games(size)
+        index = GameNameIndex()
+        index.replace(games)
+
+        # The old path also paid for downloading every row; this only measures the CPU side.
+        baseline = time_per_query(lambda q: full_scan_search(games, q), queries)
+        indexed = time_per_query(lambda q: index.search(q), queries)
+        print(f"{size:>8} {baseline:>14.2f} {indexed:>10.2f} {baseline / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Latency, database round-trips and peak memory for every slash command handler.
+
+Each `handle_*` coroutine is driven with a fake interaction against the local backends in
+benchmarks/backends.py (FakePostgREST, a fake BGG server and a canned OpenAI stream),
+seeded with a synthetic users × games × sessions dataset. Commands whose database work
+happens after a click (picking a game, turning a page, submitting the session modal) also
+press the first live component of each view they put up, `clicks` times, and those steps are
+timed and counted with the command.
+
+    python -m benchmarks.bench_handlers [--users 50] [--games 500] [--sessions 1000] [--iterations 30]
+    python -m benchmarks.bench_handlers --save baseline.json
+    python -m benchmarks.bench_handlers --compare baseline.json    # exits 1 on a regression
+
+One warm-up call per command is not measured, so resident caches (game index, user cache)
+are in their steady state. Peak memory comes from a separate tracemalloc pass because
+tracing slows everything else down.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+from benchmarks.backends import FakeInteraction, Scale, WORDS, local_backends, Dataset, press
+from helpers.query_tracker import track_queries
+from commands.add_game import handle_add_game
+from commands.add_session_users import handle_add_session_users
+from commands.add_winners import handle_add_session_winners
+from commands.ask_ai import handle_ask_ai
+from commands.bot_metrics import handle_bot_metrics
+from commands.create_session import handle_create_session
+from commands.delete_session import handle_delete_session
+from commands.find_game import handle_find_game
+from commands.game_info import handle_game_info
+from commands.game_stats import handle_game_stats
+from commands.list_sessions import handle_list_sessions
+from commands.my_games import handle_my_games
+from commands.rate_game import handle_rate_game
+from commands.register_user import handle_register_user
+from commands.remove_game import handle_remove_game
+from commands.update_nickname import handle_update_nickname
+from commands.user_stats import handle_user_stats
+
+
+class Case(NamedTuple):
+    command: str
+    handler: Callable
+    # (rng, dataset) -> arguments after the interaction
+    make_args: Callable[[random.Random, Dataset], tuple]
+    # Follow-up presses of the view each step leaves on screen (see backends.press)
+    clicks: int = 0
+
+
+def word(rng: random.Random, dataset: Dataset) -> tuple:
+    return (rng.choice(WORDS),)
+
+
+def vowel(rng: random.Random, dataset: Dataset) -> tuple:
+    # Matches most of a collection, so remove_game shows its dropdown instead of removing directly.
+    return (rng.choice("aeio"),)
+
+
+def session_id(rng: random.Random, dataset: Dataset) -> tuple:
+    return (rng.randint(1, dataset.scale.sessions),)
+
+
+def unused_session_id(rng: random.Random, dataset: Dataset) -> tuple:
+    # Every confirmed delete removes its session, so no session is asked for twice.
+    return (dataset.take_session_id(rng),)
+
+
+# Named after the slash commands in bot.py.
+CASES = [
+    Case("who_game", handle_find_game, word, clicks=1),
+    # game button → add to collection
+    Case("add_game", handle_add_game, word, clicks=1),
+    Case("owned_games", handle_my_games, lambda rng, d: (None,), clicks=1),
+    # pick from the matches
+    Case("remove_game", handle_remove_game, vowel, clicks=1),
+    Case("register_user", handle_register_user, lambda rng, d: ("",)),
+    # game select → session modal → player select
+    Case("create_session", handle_create_session, word, clicks=3),
+    # game button → page 2
+    Case("list_sessions", handle_list_sessions, word, clicks=2),
+    # game button → add to collection
+    Case("game_info", handle_game_info, word, clicks=2),
+    Case("add_session_users", handle_add_session_users, session_id, clicks=1),
+    Case("add_winner", handle_add_session_winners, session_id, clicks=1),
+    Case("ask_ai", handle_ask_ai, lambda rng, d: (f"How does scoring work in {rng.choice(d.game_names)}?",)),
+    Case("user_stats", handle_user_stats, lambda rng, d: (None,)),
+    Case("game_stats", handle_game_stats, word, clicks=1),
+    # confirm
+    Case("delete_session", handle_delete_session, unused_session_id, clicks=1),
+    Case("update_nickname", handle_update_nickname, lambda rng, d: (f"Nick {rng.randint(1, 999)}",)),
+    Case("rate_game", handle_rate_game, word, clicks=1),
+    Case("bot_metrics", handle_bot_metrics, lambda rng, d: ()),
+]
+
+
+class Result(NamedTuple):
+    p50_ms: float
+    p95_ms: float
+    queries: float
+    peak_kb: float
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def call(case: Case, rng: random.Random, dataset: Dataset) -> tuple[float, int]:
+    discord_id = dataset.discord_id(rng.randint(1, dataset.scale.users))
+    interaction = FakeInteraction(discord_id)
+    args = case.make_args(rng, dataset)
+    with track_queries(case.command) as log:
+        start = time.perf_counter()
+        await case.handler(interaction, *args)
+        for _ in range(case.clicks):
+            click = FakeInteraction(discord_id)
+            if not await press(interaction.surface, click):
+                break
+            interaction = click
+        elapsed = time.perf_counter() - start
+    return elapsed, log.count
+
+
+async def bench_case(case: Case, dataset: Dataset, iterations: int, memory_iterations: int, seed: int) -> Result:
+    rng = random.Random(seed)
+    await call(case, rng, dataset)
+
+    timings, queries = [], []
+    for _ in range(iterations):
+        elapsed, count = await call(case, rng, dataset)
+        timings.append(elapsed * 1000)
+        queries.append(count)
+
+    tracemalloc.start()
+    peak = 0
+    for _ in range(memory_iterations):
+        tracemalloc.reset_peak()
+        await call(case, rng, dataset)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    return Result(percentile(timings, 0.5), percentile(timings, 0.95), statistics.median(queries), peak / 1024)
+
+
+async def run(args) -> Dict[str, Result]:
+    scale = Scale(users=args.users, games=args.games, sessions=args.sessions)
+    print(f"Seeding {scale}…", file=sys.stderr)
+    results = {}
+    async with local_backends(scale, args.seed, bgg_latency=args.bgg_latency) as backends:
+        for case in CASES:
+            if args.only and case.command not in args.only:
+                continue
+            results[case.command] = await bench_case(case, backends.dataset, args.iterations, args.memory_iterations, args.seed)
+            print(format_row(case.command, results[case.command]), flush=True)
+    return results
+
+
+def format_row(command: str, result: Result, baseline: Optional[dict] = None) -> str:
+    row = f"{command:<18} {result.p50_ms:>8.2f} {result.p95_ms:>8.2f} {result.queries:>8.1f} {result.peak_kb:>9.0f}"
+    if baseline:
+        row += f"  p95 {change(baseline['p95_ms'], result.p95_ms):>7}  queries {change(baseline['queries'], result.queries):>7}"
+    return row
+
+
+def change(before: float, after: float) -> str:
+    return f"{(after - before) / before:+.0%}" if before else ("+new" if after else "0%")
+
+
+def regressions(results: Dict[str, Result], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Commands that got slower than `threshold` (a fraction) at p95 or issue more queries."""
+    found = []
+    for command, result in results.items():
+        before = baseline.get(command)
+        if before is None:
+            continue
+        if result.queries > before["queries"]:
+            found.append(f"{command}: {before['queries']:g} → {result.queries:g} queries")
+        if before["p95_ms"] and result.p95_ms > before["p95_ms"] * (1 + threshold):
+            found.append(f"{command}: p95 {before['p95_ms']:.2f} → {result.p95_ms:.2f} ms")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--sessions", type=int, default=1_000)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--memory-iterations", type=int, default=3)
+    parser.add_argument("--bgg-latency", type=float, default=0.0, help="seconds the fake BGG server waits before answering")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="+", help="commands to run (default: all)")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare against a JSON file written by --save")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p95 slowdown reported as a regression (default 0.2 = 20%%)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    print(f"{'command':<18} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8} {'peak KB':>9}")
+    results = asyncio.run(run(args))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"scale": Scale(args.users, args.games, args.sessions)._asdict(),
+                       "results": {c: r._asdict() for c, r in results.items()}}, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        print(f"\nAgainst {args.compare}:")
+        for command, result in results.items():
+            print(format_row(command, result, baseline.get(command)))
+        found = regressions(results, baseline, args.threshold)
+        if found:
+            print("\nRegressions:\n  " + "\n  ".join(found))
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+"""Game-night burst simulator: many people hitting commands and buttons in the same minute.
+
+Synthetic INTERACTION_CREATE payloads go through the bot's real ConnectionState, so slash
+commands are routed by `bot.tree` and button/select clicks by the view store, as they are in
+production. Discord's HTTP side is a recording webhook adapter with a simulated round-trip
+time, and the backends from benchmarks/backends.py run on their own thread so their work isn't
+scheduled on the bot's event loop (it still competes for the GIL, so expect some lag at high
+concurrency that production wouldn't see).
+
+    python -m benchmarks.load_sim [--scenario rate|players|pages|mixed] [--users 40] [--ramp 0]
+
+The report gives ack latency against Discord's 3 s deadline, completion latency, throughput
+and event-loop lag. While the loop is stalled, a watchdog thread samples the loop thread's stack,
+so a blocking sync call shows up by file and line at the top of the report.
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from unittest.mock import patch
+import discord
+from discord.webhook.async_ import async_context
+from benchmarks.backends import SERVER_ID, WORDS, Scale, local_backends
+
+# Discord fails an interaction that hasn't been acknowledged within this many seconds.
+ACK_DEADLINE = 3.0
+APPLICATION_ID = 900_000_000_000_000_001
+CHANNEL_ID = 900_000_000_000_000_002
+BOT_USER = {"id": str(APPLICATION_ID), "username": "Squire", "discriminator": "0", "avatar": None, "bot": True, "verified": True, "mfa_enabled": False}
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class Trace:
+    """One simulated interaction, from dispatch to its last response."""
+    kind: str
+    created: float
+    message_id: Optional[int] = None
+    acked: Optional[float] = None
+    last: Optional[float] = None
+    messages: List[dict] = field(default_factory=list)
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    handled: bool = False
+
+
+class RecordingAdapter:
+    """Stands in for discord.py's webhook HTTP adapter, timestamping every response per interaction."""
+
+    def __init__(self, sim: "Simulator", latency: float):
+        self.sim = sim
+        self.latency = latency
+
+    async def _round_trip(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def create_interaction_response(self, interaction_id, token, *, params, **kwargs):
+        await self._round_trip()
+        payload = params.payload or {}
+        trace = self.sim.respond(token, ack=True)
+        data = payload.get("data") or {}
+        # 7 = UPDATE_MESSAGE: a component interaction editing the message it is attached to
+        if payload.get("type") == 7 and trace is not None and trace.message_id is not None:
+            self.sim.update_message(trace.message_id, data)
+        return {"interaction": {"id": str(interaction_id), "type": 2}}
+
+    async def execute_webhook(self, webhook_id, token, *, payload=None, **kwargs):
+        await self._round_trip()
+        message = self.sim.new_message(payload or {})
+        self.sim.respond(token, message=message)
+        return message
+
+    async def edit_original_interaction_response(self, application_id, token, *, payload=None, **kwargs):
+        await self._round_trip()
+        message = self.sim.new_message(payload or {})
+        self.sim.respond(token, message=message)
+        return message
+
+    async def get_original_interaction_response(self, application_id, token, **kwargs):
+        await self._round_trip()
+        return self.sim.new_message({})
+
+    async def edit_webhook_message(self, webhook_id, token, message_id, *, payload=None, **kwargs):
+        await self._round_trip()
+        self.sim.respond(token)
+        return self.sim.update_message(int(message_id), payload or {})
+
+    async def delete_original_interaction_response(self, *args, **kwargs):
+        await self._round_trip()
+
+    async def delete_webhook_message(self, *args, **kwargs):
+        await self._round_trip()
+
+
+class LoopMonitor:
+    """Measures event-loop lag and samples the loop thread's stack whenever it stalls."""
+
+    def __init__(self, interval: float = 0.01, stall_threshold: float = 0.05):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.lags: List[float] = []
+        self.stalls: Counter = Counter()
+        self.stall_max: Dict[str, float] = defaultdict(float)
+        self._beat = time.perf_counter()
+        self._loop_thread = threading.get_ident()
+        self._stop = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+
+    def start(self):
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._watchdog.join()
+
+    async def _heartbeat(self):
+        while True:
+            before = time.perf_counter()
+            self._beat = before
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - before - self.interval))
+
+    def _watch(self):
+        sampled_beat = None
+        while not self._stop.wait(self.stall_threshold / 2):
+            beat = self._beat
+            stalled = time.perf_counter() - beat
+            if stalled < self.stall_threshold or beat == sampled_beat:
+                continue
+            # One sample per stall, taken while the loop thread is still stuck in it.
+            sampled_beat = beat
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                where = blocking_location(traceback.extract_stack(frame))
+                self.stalls[where] += 1
+                self.stall_max[where] = max(self.stall_max[where], stalled)
+
+
+def blocking_location(stack: traceback.StackSummary) -> str:
+    """Innermost bot frame, plus the innermost frame overall when that is library code."""
+    ours = [
+        f for f in stack
+        if f.filename.startswith(PROJECT_ROOT) and "site-packages" not in f.filename and f.filename != __file__
+    ]
+    inner = stack[-1]
+    if not ours:
+        return f"(event loop, no bot code) {os.path.basename(inner.filename)}:{inner.lineno} {inner.name}"
+    frame = ours[-1]
+    where = f"{os.path.relpath(frame.filename, PROJECT_ROOT)}:{frame.lineno} {frame.name}"
+    if frame is not inner:
+        where += f" → {os.path.basename(inner.filename)}:{inner.lineno} {inner.name}"
+    return where
+
+
+class Simulator:
+    def __init__(self, bot: discord.Client, discord_latency: float = 0.05, timeout: float = 30.0):
+        self.bot = bot
+        self.state = bot._connection
+        # What READY would have filled in on a real connection.
+        self.state.user = discord.ClientUser(state=self.state, data=BOT_USER)
+        self.state.application_id = APPLICATION_ID
+        self.adapter = RecordingAdapter(self, discord_latency)
+        self.timeout = timeout
+        self.traces: List[Trace] = []
+        self.messages: Dict[int, dict] = {}
+        # message id -> the command whose interaction posted it, for labelling clicks
+        self.origins: Dict[int, str] = {}
+        self._by_token: Dict[str, Trace] = {}
+        self._ids = itertools.count(1_000_000_000_000_000_000)
+
+    # -- recording, called by RecordingAdapter --
+
+    def respond(self, token: str, ack: bool = False, message: Optional[dict] = None) -> Optional[Trace]:
+        trace = self._by_token.get(token)
+        if trace is None:
+            return None
+        now = time.perf_counter()
+        if ack and trace.acked is None:
+            trace.acked = now
+        trace.last = now
+        if message is not None:
+            trace.messages.append(message)
+            self.origins[int(message["id"])] = self.origins.get(trace.message_id, trace.kind)
+        return trace
+
+    def new_message(self, payload: dict) -> dict:
+        message_id = next(self._ids)
+        message = {
+            "id": str(message_id), "channel_id": str(CHANNEL_ID), "type": 0, "webhook_id": str(APPLICATION_ID),
+            "application_id": str(APPLICATION_ID), "author": BOT_USER,
+            "content": payload.get("content") or "", "embeds": payload.get("embeds") or [], "components": payload.get("components") or [],
+            "attachments": [], "mentions": [], "mention_roles": [], "mention_everyone": False, "pinned": False, "tts": False,
+            "flags": payload.get("flags") or 0, "timestamp": "2025-01-01T20:00:00+00:00", "edited_timestamp": None,
+        }
+        self.messages[message_id] = message
+        return message
+
+    def update_message(self, message_id: int, payload: dict) -> dict:
+        message = self.messages.setdefault(message_id, self.new_message({}))
+        for key in ("content", "embeds", "components"):
+            if key in payload:
+                message[key] = payload[key] or ([] if key != "content" else "")
+        return message
+
+    # -- sending interactions --
+
+    def _payload(self, user_id: int, interaction_type: int, data: dict, message: Optional[dict] = None) -> dict:
+        interaction_id = next(self._ids)
+        payload = {
+            "id": str(interaction_id), "application_id": str(APPLICATION_ID), "type": interaction_type,
+            "token": f"sim-{interaction_id}", "version": 1, "guild_id": str(SERVER_ID), "channel_id": str(CHANNEL_ID),
+            "channel": {"id": str(CHANNEL_ID), "type": 0, "guild_id": str(SERVER_ID), "name": "game-night", "position": 0, "permission_overwrites": [], "nsfw": False, "parent_id": None},
+            "member": {
+                "user": {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "global_name": None, "avatar": None},
+                "roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "permissions": "8", "flags": 0,
+            },
+            "data": data, "locale": "en-US", "guild_locale": "en-US", "app_permissions": "0", "entitlements": [],
+            "authorizing_integration_owners": {}, "context": 0,
+        }
+        if message is not None:
+            payload["message"] = message
+        return payload
+
+    async def _dispatch(self, kind: str, payload: dict, message_id: Optional[int] = None) -> Trace:
+        trace = Trace(kind, time.perf_counter(), message_id)
+        self.traces.append(trace)
+        self._by_token[payload["token"]] = trace
+        self.state.parse_interaction_create(payload)
+        try:
+            await asyncio.wait_for(trace.done.wait(), self.timeout)
+        except asyncio.TimeoutError:
+            pass
+        return trace
+
+    async def command(self, user_id: int, name: str, **options: Any) -> Trace:
+        data = {
+            "id": str(APPLICATION_ID + 1), "name": name, "type": 1,
+            "options": [{"name": k, "type": 4 if isinstance(v, int) else 3, "value": v} for k, v in options.items()],
+        }
+        return await self._dispatch(f"/{name}", self._payload(user_id, 2, data))
+
+    async def click(self, user_id: int, message: dict, label: Optional[str] = None, values: Optional[List[str]] = None) -> Optional[Trace]:
+        """Press the button with `label` (or the first select, with `values`) on a message the bot sent."""
+        message = self.messages.get(int(message["id"]), message)
+        component = find_component(message, label=label, select=values is not None)
+        if component is None:
+            return None
+        data = {"custom_id": component["custom_id"], "component_type": component["type"]}
+        if values is not None:
+            data["values"] = values
+        origin = self.origins.get(int(message["id"]), "?")
+        kind = f"{origin} → {'select' if values is not None else label or 'first button'}"
+        return await self._dispatch(kind, self._payload(user_id, 3, data, message), int(message["id"]))
+
+    def mark_done(self, interaction: discord.Interaction):
+        trace = self._by_token.get(interaction.token)
+        if trace is not None:
+            trace.handled = True
+            trace.done.set()
+
+
+def find_component(message: dict, label: Optional[str] = None, select: bool = False) -> Optional[dict]:
+    for row in message.get("components") or []:
+        for component in row.get("components", []):
+            if select and component["type"] == 3:
+                return component
+            if not select and component["type"] == 2 and not component.get("disabled") and (label is None or component.get("label") == label):
+                return component
+    return None
+
+
+def with_view(trace: Trace) -> Optional[dict]:
+    """The last message from an interaction that has components to interact with."""
+    return next((m for m in reversed(trace.messages) if m.get("components")), None)
+
+
+# -- scenarios: each user runs `flow(sim, discord_id, rng)` concurrently --
+
+async def rate_flow(sim: Simulator, discord_id: int, rng: random.Random, poll: dict):
+    await sim.click(discord_id, poll, label=f"{rng.randint(1, 5)} ⭐")
+
+
+async def players_flow(sim: Simulator, discord_id: int, rng: random.Random, sessions: int):
+    trace = await sim.command(discord_id, "add_session_users", session_id=rng.randint(1, sessions))
+    message = with_view(trace)
+    if message:
+        options = find_component(message, select=True)["options"]
+        picks = rng.sample(options, min(len(options), rng.randint(1, 3)))
+        await sim.click(discord_id, message, values=[o["value"] for o in picks])
+
+
+async def pages_flow(sim: Simulator, discord_id: int, rng: random.Random, pages: int = 3):
+    message = with_view(await sim.command(discord_id, "owned_games"))
+    for _ in range(pages if message else 0):
+        await sim.click(discord_id, message, label="Next ➡️")
+
+    message = with_view(await sim.command(discord_id, "list_sessions", game=rng.choice(WORDS)))
+    if message:
+        await sim.click(discord_id, message)
+        for _ in range(pages):
+            await sim.click(discord_id, message, label="Next ➡️")
+
+
+async def lookup_flow(sim: Simulator, discord_id: int, rng: random.Random):
+    name, option, value = rng.choice([
+        ("user_stats", None, None),
+        ("game_stats", "query", rng.choice(WORDS)),
+        ("who_game", "game", rng.choice(WORDS)),
+        ("create_session", "game_query", rng.choice(WORDS)),
+    ])
+    await sim.command(discord_id, name, **({option: value} if option else {}))
+
+
+async def run_scenario(sim: Simulator, scenario: str, discord_ids: List[int], scale: Scale, seed: int, ramp: float):
+    rng = random.Random(seed)
+    flows: List[Callable[[], Awaitable]] = []
+    if scenario in ("rate", "mixed"):
+        host = await sim.command(discord_ids[0], "rate_game", query=rng.choice(WORDS))
+        poll = with_view(host)
+        if poll is None:
+            raise SystemExit("/rate_game did not post a poll; check the logs above")
+        flows += [lambda d=d, r=random.Random(rng.random()): rate_flow(sim, d, r, poll) for d in discord_ids]
+    if scenario in ("players", "mixed"):
+        flows += [lambda d=d, r=random.Random(rng.random()): players_flow(sim, d, r, scale.sessions) for d in discord_ids]
+    if scenario in ("pages", "mixed"):
+        flows += [lambda d=d, r=random.Random(rng.random()): pages_flow(sim, d, r) for d in discord_ids]
+    if scenario == "mixed":
+        flows += [lambda d=d, r=random.Random(rng.random()): lookup_flow(sim, d, r) for d in discord_ids]
+
+    async def start(flow, delay):
+        await asyncio.sleep(delay)
+        await flow()
+
+    rng.shuffle(flows)
+    await asyncio.gather(*(start(flow, rng.uniform(0, ramp)) for flow in flows))
+
+
+# -- report --
+
+def ms(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.0f}"
+
+
+def pct(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def report(sim: Simulator, monitor: LoopMonitor, elapsed: float) -> str:
+    traces = sim.traces
+    acks = [t.acked - t.created for t in traces if t.acked is not None]
+    done = [t.last - t.created for t in traces if t.last is not None]
+    unacked = [t for t in traces if t.acked is None]
+    missed = sum(1 for a in acks if a > ACK_DEADLINE) + len(unacked)
+
+    lines = []
+    if monitor.stalls:
+        lines.append(f"⚠️  Event loop blocked (> {monitor.stall_threshold * 1000:.0f} ms) — loop thread was at:")
+        for where, count in monitor.stalls.most_common(10):
+            lines.append(f"  {count:>4}× up to {ms(monitor.stall_max[where]):>5} ms  {where}")
+        lines.append("")
+    else:
+        lines.append(f"No event-loop stalls over {monitor.stall_threshold * 1000:.0f} ms.\n")
+
+    lines += [
+        f"{len(traces)} interactions in {elapsed:.2f} s ({len(traces) / elapsed:.1f}/s), "
+        f"{missed} missed the {ACK_DEADLINE:.0f} s ack deadline, {sum(not t.handled for t in traces)} not handled",
+        f"event loop lag   p50 {ms(pct(monitor.lags, 0.5))} ms  p95 {ms(pct(monitor.lags, 0.95))} ms  max {ms(max(monitor.lags, default=None))} ms",
+        f"ack latency      p50 {ms(pct(acks, 0.5))} ms  p95 {ms(pct(acks, 0.95))} ms  max {ms(max(acks, default=None))} ms",
+        f"completion       p50 {ms(pct(done, 0.5))} ms  p95 {ms(pct(done, 0.95))} ms  max {ms(max(done, default=None))} ms",
+        "",
+        f"{'interaction':<34} {'count':>6} {'ack p95':>8} {'ack max':>8} {'done p95':>9} {'missed':>7}",
+    ]
+    by_kind: Dict[str, List[Trace]] = defaultdict(list)
+    for t in traces:
+        by_kind[t.kind].append(t)
+    for kind, group in sorted(by_kind.items(), key=lambda kv: -(pct([t.acked - t.created for t in kv[1] if t.acked], 0.95) or 0)):
+        kind_acks = [t.acked - t.created for t in group if t.acked is not None]
+        kind_done = [t.last - t.created for t in group if t.last is not None]
+        kind_missed = sum(1 for t in group if t.acked is None or t.acked - t.created > ACK_DEADLINE)
+        lines.append(f"{kind[:34]:<34} {len(group):>6} {ms(pct(kind_acks, 0.95)):>8} {ms(max(kind_acks, default=None)):>8} {ms(pct(kind_done, 0.95)):>9} {kind_missed:>7}")
+    return "\n".join(lines)
+
+
+async def simulate(args) -> str:
+    import bot as bot_module
+    from helpers.lazy import preload
+
+    preload()
+    scale = Scale(users=max(args.users, 2), games=args.games, sessions=args.sessions)
+    async with local_backends(scale, args.seed, bgg_latency=args.bgg_latency, openai_chunk_delay=0.02, isolated=True) as backends:
+        bot = bot_module.bot
+        async with bot:
+            sim = Simulator(bot, discord_latency=args.discord_latency)
+            original_call = bot.tree._call
+            original_scheduled = discord.ui.View._scheduled_task
+
+            async def call(interaction):
+                try:
+                    await original_call(interaction)
+                finally:
+                    sim.mark_done(interaction)
+
+            async def scheduled(view, item, interaction):
+                try:
+                    await original_scheduled(view, item, interaction)
+                finally:
+                    sim.mark_done(interaction)
+
+            async_context.set(sim.adapter)
+            # Completion hooks only; routing, option parsing and view dispatch are discord.py's own.
+            with patch.object(bot.tree, "_call", call), patch.object(discord.ui.View, "_scheduled_task", scheduled):
+                monitor = LoopMonitor(stall_threshold=args.stall_threshold)
+                monitor.start()
+                start = time.perf_counter()
+                discord_ids = [backends.dataset.discord_id(u) for u in range(1, args.users + 1)]
+                await run_scenario(sim, args.scenario, discord_ids, scale, args.seed, args.ramp)
+                elapsed = time.perf_counter() - start
+                await monitor.stop()
+
+    header = f"Scenario {args.scenario}: {args.users} users, Discord RTT {args.discord_latency * 1000:.0f} ms, ramp {args.ramp:g} s, {scale}\n"
+    return header + report(sim, monitor, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=["rate", "players", "pages", "mixed"], default="mixed")
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--ramp", type=float, default=0.0, help="spread user starts over this many seconds (default: all at once)")
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--sessions", type=int, default=1_000)
+    parser.add_argument("--discord-latency", type=float, default=0.05, help="simulated Discord API round trip in seconds")
+    parser.add_argument("--bgg-latency", type=float, default=0.3)
+    parser.add_argument("--stall-threshold", type=float, default=0.05, help="loop stall in seconds that triggers a stack sample")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    print(asyncio.run(simulate(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,12 @@
-import os
+import argparse
 import logging
-from dotenv import load_dotenv
+import sys
 import discord
 from discord.ext import commands
 from discord import app_commands, Intents, Interaction
 # bot.py
-from config import DISCORD_TOKEN, IS_PROD
-
-
-# Load environment variables early
-load_dotenv()
-
-# Validate required environment variables
-required_env_vars = ["GUILD_ID"]
-for var in required_env_vars:
-    if not os.getenv(var):
-        raise EnvironmentError(f"Missing required environment variable: {var}")
-
-GUILD_ID = int(os.getenv("GUILD_ID"))
-GUILD_ID_2 = int(os.getenv("GUILD_ID_2"))
+from config import DISCORD_TOKEN, METRICS_PORT
+from helpers.lazy import lazy_handler, preload, warm_up
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -28,121 +16,208 @@ logger = logging.getLogger("game-night-bot")
 intents = Intents.default()
 intents.message_content = True  # Only enable if you need to read message content (e.g., for moderation or manual commands)
 
-bot = commands.Bot(command_prefix="!", intents=intents)
-
 # -- Slash Command Handlers --
-from commands.find_game import handle_find_game
-from commands.add_game import handle_add_game
-from commands.my_games import handle_my_games
-from commands.remove_game import handle_remove_game
-from commands.register_user import handle_register_user
-from commands.create_session import handle_create_session
-from commands.list_sessions import handle_list_sessions
-from commands.game_info import handle_game_info
-from commands.add_session_users import handle_add_session_users
-from commands.add_winners import handle_add_session_winners
-from commands.ask_ai import handle_ask_ai
-from commands.user_stats import handle_user_stats
-from commands.game_stats import handle_game_stats
-from commands.update_nickname import handle_update_nickname
-from commands.rate_game import handle_rate_game
+# Handler modules, and the Supabase/OpenAI SDKs behind them, are imported on first use or by
+# warm_up() once the gateway is connected (see helpers/lazy.py).
+handle_find_game = lazy_handler("commands.find_game", "handle_find_game")
+handle_add_game = lazy_handler("commands.add_game", "handle_add_game")
+handle_my_games = lazy_handler("commands.my_games", "handle_my_games")
+handle_remove_game = lazy_handler("commands.remove_game", "handle_remove_game")
+handle_register_user = lazy_handler("commands.register_user", "handle_register_user")
+handle_create_session = lazy_handler("commands.create_session", "handle_create_session")
+handle_list_sessions = lazy_handler("commands.list_sessions", "handle_list_sessions")
+handle_game_info = lazy_handler("commands.game_info", "handle_game_info")
+handle_add_session_users = lazy_handler("commands.add_session_users", "handle_add_session_users")
+handle_add_session_winners = lazy_handler("commands.add_winners", "handle_add_session_winners")
+handle_ask_ai = lazy_handler("commands.ask_ai", "handle_ask_ai")
+handle_user_stats = lazy_handler("commands.user_stats", "handle_user_stats")
+handle_game_stats = lazy_handler("commands.game_stats", "handle_game_stats")
+handle_update_nickname = lazy_handler("commands.update_nickname", "handle_update_nickname")
+handle_rate_game = lazy_handler("commands.rate_game", "handle_rate_game")
+handle_delete_session = lazy_handler("commands.delete_session", "handle_delete_session")
+handle_bot_metrics = lazy_handler("commands.bot_metrics", "handle_bot_metrics")
+from helpers.bgg_prefetch import prefetcher
+from helpers.command_sync import resolve_guild_ids, sync_commands
+from helpers.metrics import timed_command, start_metrics_server
+from helpers.startup_profile import DEFERRED_MARKER, is_profiling_child, profile_startup
+
+
+class GameNightBot(commands.AutoShardedBot):
+    """Sharded bot; one process can run every shard or, via launcher.py, a range of them."""
+
+    def __init__(self, shard_ids: list[int] | None = None, shard_count: int | None = None, force_sync: bool = False):
+        super().__init__(command_prefix="!", intents=intents, shard_ids=shard_ids, shard_count=shard_count)
+        self.force_sync = force_sync
+
+    @property
+    def is_primary(self) -> bool:
+        # Process-wide jobs (command sync, BGG prefetch) run only in the process that owns shard 0.
+        return self.shard_ids is None or 0 in self.shard_ids
+
+    async def setup_hook(self):
+        # Runs once per process before connecting, unlike on_ready which fires again after reconnects.
+        # Scopes whose command payload hasn't changed since the last sync are skipped.
+        if not self.is_primary:
+            return
+        try:
+            await sync_commands(self.tree, await resolve_guild_ids(), force=self.force_sync)
+        except Exception as e:
+            logger.error(f"Failed to sync commands: {e}")
+
+
+def parse_args(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Run the Game Night bot.")
+    parser.add_argument("--shard-count", type=int, help="total shards across all processes (default: Discord's recommendation)")
+    parser.add_argument("--shard-ids", type=int, nargs="+", help="shards to run in this process (default: all); needs --shard-count")
+    parser.add_argument("--profile-startup", action="store_true", help="print an import-time breakdown of startup and exit")
+    parser.add_argument("--force-sync", action="store_true", help="sync slash commands even if they haven't changed since the last sync")
+    args = parser.parse_args(argv)
+    if args.shard_ids and not args.shard_count:
+        parser.error("--shard-ids needs --shard-count")
+    return args
+
+
+# Importing this module (e.g. from benchmarks/load_sim.py) builds the bot and its command tree
+# with default options; only running it as a script reads the command line and connects.
+args = parse_args() if __name__ == "__main__" else parse_args([])
+if __name__ == "__main__" and is_profiling_child():
+    # Re-run of this script under -X importtime: load what would otherwise be deferred, then stop.
+    print(DEFERRED_MARKER, file=sys.stderr, flush=True)
+    preload()
+    sys.exit()
+if __name__ == "__main__" and args.profile_startup:
+    sys.exit(profile_startup(__file__, sys.argv[1:]))
+
+bot = GameNightBot(shard_ids=args.shard_ids, shard_count=args.shard_count, force_sync=args.force_sync)
 
 
 @bot.event
 async def on_ready():
+    logger.info(f"🤖 Logged in as {bot.user} | shards {bot.shard_ids or 'all'} of {bot.shard_count} | {len(bot.guilds)} guilds")
+
+    # Import the command handlers and build the SDK clients off the event loop before the first interaction needs them.
     try:
-        if IS_PROD:
-            print("In production, syncing all commands.")
-            await bot.tree.sync()
-        await bot.tree.sync(guild=discord.Object(id=GUILD_ID))
-        logger.info(f"🤖 Logged in as {bot.user} | Synced commands to guild {GUILD_ID}")
+        await warm_up()
     except Exception as e:
-        logger.error(f"Failed to sync commands: {e}")
+        logger.error(f"Failed to preload command handlers: {e}")
 
-# Register commands with guild scoping
-@bot.tree.command(name="who_game", description="Find out who owns a game", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+    # Keep stored BGG metadata fresh in the background, within the configured request budget.
+    if bot.is_primary:
+        prefetcher.start()
+
+    if METRICS_PORT:
+        try:
+            await start_metrics_server(METRICS_PORT)
+            logger.info(f"📈 Serving metrics on http://127.0.0.1:{METRICS_PORT}/metrics")
+        except OSError as e:
+            logger.error(f"Failed to start metrics server: {e}")
+
+# Commands are defined globally; helpers/command_sync.py decides whether they are synced globally or per guild
+@bot.tree.command(name="who_game", description="Find out who owns a game")
 @app_commands.describe(game="The name of the game to search")
+@timed_command
 async def who_game(interaction: Interaction, game: str):
     await handle_find_game(interaction, game)
 
-@bot.tree.command(name="add_game", description="Search and add a board game from BGG", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="add_game", description="Search and add a board game from BGG")
 @app_commands.describe(query="The name of the game to search")
+@timed_command
 async def add_game(interaction: Interaction, query: str):
     await handle_add_game(interaction, query)
 
-@bot.tree.command(name="owned_games", description="Show your board game collection", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="owned_games", description="Show your board game collection")
+@timed_command
 async def owned_games(interaction: Interaction,  user: discord.User = None):
     await handle_my_games(interaction, user)
 
-@bot.tree.command(name="remove_game", description="Remove a game from your collection", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="remove_game", description="Remove a game from your collection")
 @app_commands.describe(query="The name of the game to search")
+@timed_command
 async def remove_game(interaction: Interaction, query: str):
     await handle_remove_game(interaction, query)
 
-@bot.tree.command(name="register_user", description="Register yourself in the game database", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="register_user", description="Register yourself in the game database")
 @app_commands.describe(nickname="Optional nickname to display")
+@timed_command
 async def register_user(interaction: Interaction, nickname: str = ""):
     await handle_register_user(interaction, nickname)
 
-@bot.tree.command(name="create_session", description="Log a session for a game", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="create_session", description="Log a session for a game")
 @app_commands.describe(game_query="Search for a game by name")
+@timed_command
 async def create_session(interaction: discord.Interaction, game_query: str):
     await handle_create_session(interaction, game_query)
 
 
-@bot.tree.command(name="list_sessions", description="List sessions for a game", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="list_sessions", description="List sessions for a game")
 @app_commands.describe(game="Name of the game")
+@timed_command
 async def list_sessions(interaction: Interaction, game: str):
     await handle_list_sessions(interaction, game)
 
-@bot.tree.command(name="game_info", description="View game details from BGG", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="game_info", description="View game details from BGG")
 @app_commands.describe(query="The name of the game to search")
+@timed_command
 async def game_info(interaction: Interaction, query: str):
     await handle_game_info(interaction, query)
 
-@bot.tree.command(name="add_session_users", description="Add users to an existing session", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="add_session_users", description="Add users to an existing session")
 @app_commands.describe(session_id="ID of the session")
+@timed_command
 async def add_session_users(interaction: Interaction, session_id: int):
     await handle_add_session_users(interaction, session_id)
 
-@bot.tree.command(name="add_winner", description="Add winners to a session", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="add_winner", description="Add winners to a session")
 @app_commands.describe(session_id="ID of the session")
+@timed_command
 async def add_winner(interaction: Interaction, session_id: int):
     await handle_add_session_winners(interaction, session_id)
 
-@bot.tree.command(name="ask_ai", description="Ask the AI a question about board game rules", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="ask_ai", description="Ask the AI a question about board game rules")
 @app_commands.describe(question="Your question about board game rules")
+@timed_command
 async def ask_ai(interaction: Interaction, question: str):
     await handle_ask_ai(interaction, question)
 
-@bot.tree.command(name="user_stats", description="View stats for yourself or another user", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="user_stats", description="View stats for yourself or another user")
 @app_commands.describe(user="Optional user to view stats for")
+@timed_command
 async def user_stats(interaction: Interaction, user: discord.User = None):
     await handle_user_stats(interaction, user)
 
-@bot.tree.command(name="game_stats", description="See how many times a game has been played and top winners.", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="game_stats", description="See how many times a game has been played and top winners.")
 @app_commands.describe(query="Name of the game to search")
+@timed_command
 async def game_stats(interaction: discord.Interaction, query: str):
     await handle_game_stats(interaction, query)
 
-@bot.tree.command(name="delete_session", description="Delete a game session by ID", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="delete_session", description="Delete a game session by ID")
 @app_commands.describe(session_id="The ID of the session you want to delete")
+@timed_command
 async def delete_session(interaction: discord.Interaction, session_id: int):
-    from commands.delete_session import handle_delete_session
     await handle_delete_session(interaction, session_id)
 
-@bot.tree.command(name="update_nickname", description="Update your nickname in the database.", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="update_nickname", description="Update your nickname in the database.")
 @app_commands.describe(nickname="The new nickname to display")
+@timed_command
 async def update_nickname(interaction: Interaction, nickname: str):
     await handle_update_nickname(interaction, nickname)
 
-@bot.tree.command(name="rate_game", description="Create a poll to rate a game from 1 to 5", guilds=[discord.Object(id=GUILD_ID), discord.Object(id=GUILD_ID_2)])
+@bot.tree.command(name="rate_game", description="Create a poll to rate a game from 1 to 5")
 @app_commands.describe(query="The name of the game to rate")
+@timed_command
 async def rate_game(interaction: Interaction, query: str):
     await handle_rate_game(interaction, query)
 
+@bot.tree.command(name="bot_metrics", description="Admin: command and dependency latency since startup")
+@app_commands.default_permissions(administrator=True)
+@timed_command
+async def bot_metrics(interaction: Interaction):
+    await handle_bot_metrics(interaction)
+
 # Safely start the bot
-try:
-    bot.run(DISCORD_TOKEN)
-except Exception as e:
-    logger.critical(f"Bot failed to start: {e}")
+if __name__ == "__main__":
+    try:
+        bot.run(DISCORD_TOKEN)
+    except Exception as e:
+        logger.critical(f"Bot failed to start: {e}")
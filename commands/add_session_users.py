@@ -1,10 +1,12 @@
+import asyncio
 import discord
 from discord import Interaction, ui, SelectOption
 from helpers.supa_helpers import (
     get_all_registered_users,
     get_users_in_session,
-    link_user_to_session,
+    link_users_to_session,
 )
+from helpers.metrics import timed_component
 
 class UserSelect(ui.Select):
     def __init__(self, session_id: int, options: list[SelectOption]):
@@ -16,19 +18,23 @@ class UserSelect(ui.Select):
             options=options,
         )
 
+    @timed_component("add_session_users.select")
     async def callback(self, interaction: Interaction):
         selected_ids = [int(uid) for uid in self.values]
         added = 0
+        skipped = 0
         failed = 0
 
-        for user_id in selected_ids:
-            try:
-                link_user_to_session(self.session_id, user_id)
-                added += 1
-            except Exception as e:
-                failed += 1  # You could log e for debugging
+        try:
+            results = await link_users_to_session(self.session_id, selected_ids)
+            added = sum(results.values())
+            skipped = len(results) - added
+        except Exception as e:
+            failed = len(selected_ids)  # You could log e for debugging
 
         msg = f"✅ Added {added} user(s) to the session."
+        if skipped > 0:
+            msg += f" ℹ️ {skipped} already in the session."
         if failed > 0:
             msg += f" ⚠️ Failed to add {failed} user(s)."
 
@@ -46,8 +52,11 @@ async def handle_add_session_users(interaction: Interaction, session_id: int):
     await interaction.response.defer(ephemeral=True)
 
     try:
-        all_users = get_all_registered_users()
-        already_linked = [u["user_id"] for u in get_users_in_session(session_id)]
+        all_users, session_users = await asyncio.gather(
+            get_all_registered_users(),
+            get_users_in_session(session_id),
+        )
+        already_linked = [u["user_id"] for u in session_users]
     except Exception as e:
         await interaction.followup.send("❌ Failed to retrieve users.", ephemeral=True)
         return
@@ -1,11 +1,13 @@
+import asyncio
 import discord
 from discord import Interaction, ui, SelectOption
 from helpers.supa_helpers import (
     get_all_registered_users,
     get_users_in_session,
     get_winners_in_session,
-    link_winner_to_session
+    link_winners_to_session
 )
+from helpers.metrics import timed_component
 
 class UserSelect(ui.Select):
     def __init__(self, session_id: int, options: list[SelectOption]):
@@ -17,19 +19,23 @@ class UserSelect(ui.Select):
             options=options,
         )
 
+    @timed_component("add_winner.select")
     async def callback(self, interaction: Interaction):
         selected_ids = [int(uid) for uid in self.values]
         added = 0
+        skipped = 0
         failed = 0
 
-        for user_id in selected_ids:
-            try:
-                link_winner_to_session(self.session_id, user_id)
-                added += 1
-            except Exception as e:
-                failed += 1  # You could log e for debugging
+        try:
+            results = await link_winners_to_session(self.session_id, selected_ids)
+            added = sum(results.values())
+            skipped = len(results) - added
+        except Exception as e:
+            failed = len(selected_ids)  # You could log e for debugging
 
         msg = f"✅ Added {added} winner(s) to the session."
+        if skipped > 0:
+            msg += f" ℹ️ {skipped} already recorded as winner(s)."
         if failed > 0:
             msg += f" ⚠️ Failed to add {failed} user(s)."
 
@@ -47,9 +53,11 @@ async def handle_add_session_winners(interaction: Interaction, session_id: int):
     await interaction.response.defer(ephemeral=True)
 
     try:
-        all_users = get_all_registered_users()
-        session_users = get_users_in_session(session_id)
-        already_linked = get_winners_in_session(session_id)
+        all_users, session_users, already_linked = await asyncio.gather(
+            get_all_registered_users(),
+            get_users_in_session(session_id),
+            get_winners_in_session(session_id),
+        )
     except Exception as e:
         await interaction.followup.send("❌ Failed to retrieve users.", ephemeral=True)
         return
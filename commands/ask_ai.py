@@ -1,31 +1,77 @@
 # commands/ask_ai.py
 
-import os
-from openai import OpenAI
+import re
+import time
 from discord import Interaction
 from config import OPENAI_API_KEY
+from helpers.ttl_cache import TTLCache
+from helpers.lazy import LazyClient
+from helpers.metrics import timed
+
+
+def _create_client():
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+
+# The openai SDK takes about as long to import as discord.py, so it is loaded on first use.
+client = LazyClient(_create_client)
+
+# Repeat questions within a game night are answered from memory instead of a new completion.
+answer_cache = TTLCache(maxsize=256, ttl=12 * 60 * 60)
+
+# Minimum seconds between message edits while the answer streams in (Discord rate-limits edits).
+EDIT_INTERVAL = 1.0
+
+DISCLAIMER = "⚠️ *This response is AI generated and may be inaccurate or completely wrong. Use your judgment and refer to the official rules when in doubt.*\n\n"
+
+
+def normalize_question(question: str) -> str:
+    question = re.sub(r"\s+", " ", question.strip().lower())
+    return question.rstrip("?!. ")
+
+
+def format_answer(question: str, answer: str) -> str:
+    return f"{DISCLAIMER}**Question:** {question}\n\n**Answer:** {answer}"
 
-client = OpenAI(api_key=OPENAI_API_KEY)
 
 async def handle_ask_ai(interaction: Interaction, question: str):
     await interaction.response.defer()
 
+    cache_key = normalize_question(question)
+    cached = answer_cache.get(cache_key)
+    if cached is not None:
+        await interaction.edit_original_response(content=format_answer(question, cached))
+        return
+
     prompt = f"You are a mideval squire with a penchant for board games and their rules. Please answer the following question clearly, concisely and accurately:\n\n{question}"
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=500
-        )
+        answer = ""
+        last_edit = time.monotonic()
+        # Includes the throttled progress edits made while the answer streams in.
+        async with timed("dependency", dependency="openai", operation="chat.completions"):
+            stream = await client.chat.completions.create(
+                model="gpt-4o",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.7,
+                max_tokens=500,
+                stream=True
+            )
 
-        answer = response.choices[0].message.content.strip()
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                answer += chunk.choices[0].delta.content
+                if time.monotonic() - last_edit >= EDIT_INTERVAL:
+                    await interaction.edit_original_response(content=format_answer(question, answer.strip() + " …"))
+                    last_edit = time.monotonic()
 
-        await interaction.followup.send(
-            f"⚠️ *This response is AI generated and may be inaccurate or completely wrong. Use your judgment and refer to the official rules when in doubt.*\n\n"
-            f"**Question:** {question}\n\n**Answer:** {answer}"
-        )
+        answer = answer.strip()
+        # An empty stream (filtered, or every delta blank) is worth retrying, not remembering.
+        if answer:
+            answer_cache.set(cache_key, answer)
+        await interaction.edit_original_response(content=format_answer(question, answer))
 
     except Exception as e:
         await interaction.followup.send(
@@ -0,0 +1,31 @@
+from discord import Interaction
+from helpers.metrics import metrics
+
+# Rows shown per section; Discord messages are capped at 2000 characters.
+MAX_ROWS = 12
+
+
+def format_section(title: str, rows: list[tuple[str, object]]) -> str:
+    if not rows:
+        return f"**{title}**: no calls recorded yet."
+    lines = [f"{'name':<30} {'calls':>6} {'errs':>5} {'avg ms':>7} {'p95 ms':>7}"]
+    for name, s in rows[:MAX_ROWS]:
+        lines.append(f"{name[:30]:<30} {s.calls:>6} {s.errors:>5} {s.average * 1000:>7.0f} {s.quantile(0.95) * 1000:>7.0f}")
+    return f"**{title}** (slowest total time first)\n```\n" + "\n".join(lines) + "\n```"
+
+
+async def handle_bot_metrics(interaction: Interaction):
+    permissions = getattr(interaction.user, "guild_permissions", None)
+    if permissions is None or not permissions.administrator:
+        await interaction.response.send_message("❌ Only server administrators can view bot metrics.", ephemeral=True)
+        return
+
+    commands = sorted(metrics.of_kind("command"), key=lambda x: x[1].total, reverse=True)
+    dependencies = sorted(metrics.of_kind("dependency"), key=lambda x: x[1].total, reverse=True)
+
+    content = "\n".join([
+        "📈 **Bot latency since startup**",
+        format_section("Commands", [(f"/{labels['command']}", s) for labels, s in commands]),
+        format_section("Dependencies", [(f"{labels['dependency']}.{labels['operation']}", s) for labels, s in dependencies]),
+    ])
+    await interaction.response.send_message(content[:2000], ephemeral=True)
@@ -1,3 +1,4 @@
+import asyncio
 import discord
 from discord import Interaction, ui, SelectOption
 from helpers.supa_helpers import (
@@ -5,9 +6,10 @@ from helpers.supa_helpers import (
     create_session_entry,
     get_all_registered_users,
     get_users_in_session,
-    link_user_to_session
+    link_users_to_session
 )
 from helpers.input_sanitizer import sanitize_query_input
+from helpers.metrics import timed_component
 from datetime import datetime
 
 # Step 1: Modal for name and date
@@ -20,6 +22,7 @@ class SessionInfoModal(discord.ui.Modal, title="Session Info"):
         self.game_id = game_id
         self.server_id = server_id
 
+    @timed_component("create_session.details")
     async def on_submit(self, interaction: Interaction):
         try:
             date_str = self.date.value.strip()
@@ -36,7 +39,7 @@ class SessionInfoModal(discord.ui.Modal, title="Session Info"):
             else:
                 formatted_date = None
 
-            session = create_session_entry(
+            session = await create_session_entry(
                 self.game_id,
                 self.server_id,
                 name=self.name.value.strip(),
@@ -44,7 +47,7 @@ class SessionInfoModal(discord.ui.Modal, title="Session Info"):
             )
 
             if session:
-                view = build_user_select_view(session["id"], self.server_id)
+                view = await build_user_select_view(session["id"], self.server_id)
                 await interaction.response.send_message(
                     f"✅ Session {session.get('id', '(Error gettings id)')} **{session.get('name', '(unnamed)')}** created for **{session.get('date', 'unspecified')}**!\nNow select players:",
                     view=view,
@@ -79,7 +82,7 @@ class GameSelectView(ui.View):
 async def handle_create_session(interaction: Interaction, game_query: str):
     await interaction.response.defer(ephemeral=True)
     query = sanitize_query_input(game_query)
-    games = search_games_fuzzy(query)
+    games = await search_games_fuzzy(query)
 
     if not games:
         await interaction.followup.send("❌ No games matched your search.", ephemeral=True)
@@ -90,9 +93,12 @@ async def handle_create_session(interaction: Interaction, game_query: str):
 
 
 # User picker view
-def build_user_select_view(session_id: int, server_id: int):
-    users = get_all_registered_users(server_id)
-    already_linked = {u["user_id"] for u in get_users_in_session(session_id)}
+async def build_user_select_view(session_id: int, server_id: int):
+    users, session_users = await asyncio.gather(
+        get_all_registered_users(server_id),
+        get_users_in_session(session_id),
+    )
+    already_linked = {u["user_id"] for u in session_users}
     eligible_users = [u for u in users if u["id"] not in already_linked]
 
     options = [
@@ -112,15 +118,14 @@ def build_user_select_view(session_id: int, server_id: int):
                 options=options
             )
 
+        @timed_component("create_session.select_players")
         async def callback(self, interaction: Interaction):
             selected_ids = [int(uid) for uid in self.values]
-            added = 0
-            for user_id in selected_ids:
-                try:
-                    link_user_to_session(session_id, user_id)
-                    added += 1
-                except Exception:
-                    pass
+            try:
+                results = await link_users_to_session(session_id, selected_ids)
+                added = sum(results.values())
+            except Exception:
+                added = 0
 
             await interaction.response.edit_message(
                 content=f"✅ Added {added} user(s) to session {session_id}!",
@@ -1,3 +1,4 @@
+import asyncio
 import discord
 from discord import Interaction, ui
 from helpers.supa_helpers import (
@@ -7,6 +8,7 @@ from helpers.supa_helpers import (
     get_users_by_ids,
     delete_session_by_id,
 )
+from helpers.metrics import timed_component
 
 class ConfirmDeleteView(ui.View):
     def __init__(self, session_id: int):
@@ -24,9 +26,10 @@ class DeleteButton(ui.Button):
         super().__init__(label="🗑 Confirm Delete", style=discord.ButtonStyle.danger, row=0, custom_id="confirm_delete")
         self.session_id = session_id
 
+    @timed_component("delete_session.confirm")
     async def callback(self, interaction: Interaction):
         try:
-            delete_session_by_id(self.session_id)
+            await delete_session_by_id(self.session_id)
             await interaction.response.edit_message(content="✅ Session deleted.", view=None)
         except Exception as e:
             await interaction.response.edit_message(content=f"❌ Failed to delete session: {str(e)}", view=None)
@@ -34,14 +37,16 @@ class DeleteButton(ui.Button):
 async def handle_delete_session(interaction: Interaction, session_id: int):
     await interaction.response.defer(ephemeral=True)
 
-    session = get_session_by_id(session_id)
+    session = await get_session_by_id(session_id)
     if not session:
         await interaction.followup.send("❌ Session not found.", ephemeral=True)
         return
 
-    game = get_game_by_id(session["game_id"])
-    winners = get_winners_in_session(session_id)
-    users = get_users_by_ids(winners)
+    game, winners = await asyncio.gather(
+        get_game_by_id(session["game_id"]),
+        get_winners_in_session(session_id),
+    )
+    users = await get_users_by_ids(winners)
     winner_names = ", ".join([u["nickname"] or u["username"] for u in users]) if users else "None selected"
 
     content = (
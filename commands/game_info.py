@@ -1,62 +1,42 @@
-import aiohttp
-import xml.etree.ElementTree as ET
 from discord import Interaction, ui, Embed, ButtonStyle
 from helpers.supa_helpers import (
-    get_or_create_game,
     get_user_by_discord_id,
-    user_has_game,
     link_user_game
 )
-from helpers.input_sanitizer import sanitize_query_input, escape_query_param
+from helpers.input_sanitizer import sanitize_query_input
+from helpers.bgg_client import bgg
+from helpers.game_metadata import get_game_record
+from helpers.metrics import timed_component
 
 
 async def fetch_bgg_search(query: str):
-    query = escape_query_param(sanitize_query_input(query))
-    url = f"https://boardgamegeek.com/xmlapi2/search?query={query}&type=boardgame"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            if response.status != 200:
-                raise Exception("Failed to fetch search results from BGG.")
-            xml = await response.text()
-    return ET.fromstring(xml).findall("item")
-
-
-async def fetch_bgg_game_details(bgg_id: int):
-    url = f"https://boardgamegeek.com/xmlapi2/thing?id={bgg_id}&stats=1"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            if response.status != 200:
-                raise Exception("Failed to fetch game details from BGG.")
-            xml = await response.text()
-    return ET.fromstring(xml).find("item")
-
-
-def parse_game_embed(game_xml) -> Embed:
-    name = game_xml.find("name").attrib["value"]
-    year = game_xml.find("yearpublished").attrib.get("value", "N/A")
-    min_players = game_xml.find("minplayers").attrib.get("value", "?")
-    max_players = game_xml.find("maxplayers").attrib.get("value", "?")
-    play_time = game_xml.find("playingtime").attrib.get("value", "?")
-    image_url = game_xml.find("image").text if game_xml.find("image") is not None else None
+    return await bgg.search(sanitize_query_input(query))
+
+
+def build_game_embed(game: dict) -> Embed:
+    year = game.get("year_published") or "N/A"
+    play_time = game.get("playing_time") or "?"
 
     embed = Embed(
-        title=f"{name} ({year})",
-        url=f"https://boardgamegeek.com/boardgame/{game_xml.attrib['id']}",
+        title=f"{game['name']} ({year})",
+        url=f"https://boardgamegeek.com/boardgame/{game['bgg_id']}",
         description="BoardGameGeek Information"
     )
-    embed.add_field(name="Players", value=f"{min_players} - {max_players}", inline=True)
+    embed.add_field(name="Players", value=f"{game.get('min_players') or '?'} - {game.get('max_players') or '?'}", inline=True)
     embed.add_field(name="Play Time", value=f"{play_time} minutes", inline=True)
+    if game.get("rating_avg"):
+        embed.add_field(name="BGG Rating", value=f"{float(game['rating_avg']):.2f} ({game.get('rating_count') or 0} ratings)", inline=True)
 
-    publishers = [e.attrib["value"] for e in game_xml.findall("link") if e.attrib["type"] == "boardgamepublisher"]
-    designers = [e.attrib["value"] for e in game_xml.findall("link") if e.attrib["type"] == "boardgamedesigner"]
+    designers = game.get("designers") or ([game["designer"]] if game.get("designer") else [])
+    publishers = game.get("publishers") or ([game["publisher"]] if game.get("publisher") else [])
 
     if designers:
         embed.add_field(name="Designer", value=", ".join(designers), inline=False)
     if publishers:
         embed.add_field(name="Publisher", value=", ".join(publishers), inline=False)
 
-    if image_url:
-        embed.set_thumbnail(url=image_url)
+    if game.get("image_url"):
+        embed.set_thumbnail(url=game["image_url"])
 
     return embed
 
@@ -75,7 +55,7 @@ async def handle_game_info(interaction: Interaction, query: str):
         return
 
     game_options = []
-    for item in items[:20]:  # Keep under 25 for button limit
+    for item in items:  # bgg.search keeps this under the 25 button limit
         bgg_id = int(item.attrib["id"])
         name = item.find("name").attrib.get("value", "Unknown")
         year_tag = item.find("yearpublished")
@@ -93,43 +73,37 @@ async def handle_game_info(interaction: Interaction, query: str):
             self.bgg_id = bgg_id
             self.label = label
 
+        @timed_component("game_info.select_game")
         async def callback(self, i: Interaction):
             try:
-                game_xml = await fetch_bgg_game_details(self.bgg_id)
-                embed = parse_game_embed(game_xml)
+                game = await get_game_record(self.bgg_id)
             except Exception as e:
                 await i.response.send_message(f"❌ Could not fetch game details: {str(e)}", ephemeral=True)
                 return
 
-            name = game_xml.find("name").attrib.get("value", "Unknown")
-            publisher = next((e.attrib["value"] for e in game_xml.findall("link") if e.attrib["type"] == "boardgamepublisher"), "")
-            designer = next((e.attrib["value"] for e in game_xml.findall("link") if e.attrib["type"] == "boardgamedesigner"), "")
-            min_players = int(game_xml.find("minplayers").attrib.get("value", 0))
-            max_players = int(game_xml.find("maxplayers").attrib.get("value", 0))
+            if game is None:
+                await i.response.send_message("❌ Game details not found.", ephemeral=True)
+                return
 
-            game_id = get_or_create_game(self.bgg_id, {
-                "name": name,
-                "publisher": publisher,
-                "designer": designer,
-                "min_players": min_players,
-                "max_players": max_players
-            })
+            embed = build_game_embed(game)
+            game_id = game["id"]
+            name = game["name"]
 
             class AddButton(ui.Button):
                 def __init__(self):
                     super().__init__(label="Add to My Collection", style=ButtonStyle.success)
 
+                @timed_component("game_info.add")
                 async def callback(self, button_interaction: Interaction):
-                    user = get_user_by_discord_id(button_interaction.user.id)
+                    user = await get_user_by_discord_id(button_interaction.user.id)
                     if not user:
                         await button_interaction.response.send_message("❌ User is not registered. Use /register_user.", ephemeral=True)
                         return
 
-                    if user_has_game(user["id"], game_id):
-                        await button_interaction.response.send_message("✅ Already in your collection.", ephemeral=True)
-                    else:
-                        link_user_game(user["id"], game_id)
+                    if await link_user_game(user["id"], game_id):
                         await button_interaction.response.send_message(f"🎉 Added **{name}** to your collection!", ephemeral=True)
+                    else:
+                        await button_interaction.response.send_message("✅ Already in your collection.", ephemeral=True)
 
             view = ui.View(timeout=300)
             view.add_item(AddButton())
@@ -2,13 +2,9 @@ import discord
 from discord import Interaction, ui, ButtonStyle
 from helpers.supa_helpers import (
     search_games_fuzzy,
-    get_sessions_for_game,
-    get_winners_in_session,
-    get_users_by_ids,
-    get_ratings_for_game
+    get_game_stats
 )
-from collections import Counter
-from statistics import mean
+from helpers.metrics import timed_component
 
 
 class ShareStatsButton(ui.View):
@@ -39,36 +35,27 @@ class GameSelectView(ui.View):
             self.game = game
             self.interaction = interaction
 
+        @timed_component("game_stats.select_game")
         async def callback(self, interaction: Interaction):
-            sessions = get_sessions_for_game(self.game["id"], interaction.guild_id)
-            if not sessions:
+            stats = await get_game_stats(self.game["id"], interaction.guild_id)
+            if not stats["total_plays"]:
                 await interaction.response.edit_message(
                     content=f"📉 **{self.game['name']}** has no logged sessions yet.",
                     view=None
                 )
                 return
 
-            total_plays = len(sessions)
-            win_counter = Counter()
-
-            for session in sessions:
-                winners = get_winners_in_session(session["id"])
-                win_counter.update(winners)
-
-            top_winners = win_counter.most_common(3)
+            total_plays = stats["total_plays"]
+            top_winners = stats["win_counts"][:3]
             if not top_winners:
                 winners_text = "_No winners have been recorded yet._"
             else:
-                user_ids = [uid for uid, _ in top_winners]
-                users = get_users_by_ids(user_ids)
-                id_to_name = {u["id"]: u.get("nickname") or u.get("username") for u in users}
                 winners_text = "\n".join(
-                    f"🏆 {id_to_name.get(uid, 'Unknown')} — {count} win(s)"
-                    for uid, count in top_winners
+                    f"🏆 {w.get('nickname') or w.get('username') or 'Unknown'} — {w['wins']} win(s)"
+                    for w in top_winners
                 )
             # Ratings
-            ratings = get_ratings_for_game(self.game["id"])
-            avg_rating = round(mean(r["rating"] for r in ratings), 2) if ratings else None
+            avg_rating = round(float(stats["rating_avg"]), 2) if stats["rating_count"] else None
             rating_text = f"⭐ Average rating: **{avg_rating} / 5**\n" if avg_rating else ""
 
 
@@ -88,7 +75,7 @@ class GameSelectView(ui.View):
 async def handle_game_stats(interaction: Interaction, query: str):
     await interaction.response.defer(ephemeral=True)
 
-    matched_games = search_games_fuzzy(query)
+    matched_games = await search_games_fuzzy(query)
     if not matched_games:
         await interaction.followup.send("❌ No games matched your query.", ephemeral=True)
         return
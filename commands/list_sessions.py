@@ -2,22 +2,37 @@ import discord
 from discord import Interaction, ui, ButtonStyle
 from helpers.supa_helpers import (
     search_games_fuzzy,
-    get_sessions_for_game,
-    get_winners_in_session,
-    get_users_by_ids
+    get_sessions_page
 )
 from helpers.input_sanitizer import sanitize_query_input
+from helpers.ttl_cache import TTLCache
+from helpers.metrics import timed_component
 from math import ceil
 
 
+def winner_names(session: dict) -> list[str]:
+    users = [w["users"] for w in session.get("sessions_winners") or [] if w.get("users")]
+    return [u.get("nickname") or u.get("username") for u in users]
+
+
 class GameSessionPaginator(ui.View):
-    def __init__(self, game_name: str, sessions: list[dict], per_page: int = 5):
+    """Session history fetched one keyset page at a time, newest first.
+
+    cursors[i] is the (date, id) of the last session before page i; pages are only
+    reached by stepping, so the cursor for the next page is always known.
+    """
+
+    def __init__(self, game_id: int, server_id: int, game_name: str, per_page: int = 5, cache_size: int = 5):
         super().__init__(timeout=60)
+        self.game_id = game_id
+        self.server_id = server_id
         self.game_name = game_name
-        self.sessions = sessions
         self.per_page = per_page
         self.page = 0
-        self.total_pages = ceil(len(sessions) / per_page)
+        self.total_pages = 1
+        self.has_next = False
+        self.cursors: list = [None]
+        self.pages = TTLCache(maxsize=cache_size, ttl=self.timeout)
 
         self.prev_button = ui.Button(label="⬅️ Prev", style=ButtonStyle.secondary)
         self.next_button = ui.Button(label="Next ➡️", style=ButtonStyle.secondary)
@@ -31,39 +46,52 @@ class GameSessionPaginator(ui.View):
 
     def update_buttons(self):
         self.prev_button.disabled = self.page == 0
-        self.next_button.disabled = self.page >= self.total_pages - 1
+        self.next_button.disabled = not self.has_next
+
+    async def load_page(self, page: int) -> list[dict]:
+        cached = self.pages.get(page)
+        if cached is None:
+            # One extra row tells us whether there is a next page without another query.
+            sessions, total = await get_sessions_page(
+                self.game_id, self.server_id, self.per_page + 1, after=self.cursors[page], count=page == 0
+            )
+            if total is not None:
+                self.total_pages = max(1, ceil(total / self.per_page))
+            has_next = len(sessions) > self.per_page
+            sessions = sessions[:self.per_page]
+            if has_next and len(self.cursors) == page + 1:
+                self.cursors.append((sessions[-1]["date"], sessions[-1]["id"]))
+            cached = (sessions, has_next)
+            self.pages.set(page, cached)
+
+        self.page = page
+        sessions, self.has_next = cached
+        self.update_buttons()
+        return sessions
 
-    def get_page_content(self):
-        start = self.page * self.per_page
-        end = start + self.per_page
-        sessions_page = self.sessions[start:end]
+    def get_page_content(self, sessions: list[dict]) -> str:
         lines = []
 
-        for s in sessions_page:
-            winners_ids = get_winners_in_session(s["id"])
-            if winners_ids:
-                winner_users = get_users_by_ids(winners_ids)
-                winner_names = [u.get("nickname") or u.get("username") for u in winner_users]
-                winner_text = ", ".join(winner_names)
-            else:
-                winner_text = "not selected"
+        for s in sessions:
+            names = winner_names(s)
+            winner_text = ", ".join(names) if names else "not selected"
 
             lines.append(
-                f"**(Session ID: {s.get('id', '?')})  {s.get('date', 'No Date')}** — {s.get('name') or '(no name)'}\n"
+                f"**(Session ID: {s.get('id', '?')})  {s.get('date') or 'No Date'}** — {s.get('name') or '(no name)'}\n"
                 f"   🏆 Winners: {winner_text}"
             )
 
         return f"📋 Sessions for **{self.game_name}** (Page {self.page + 1}/{self.total_pages}):\n\n" + "\n\n".join(lines)
 
+    @timed_component("list_sessions.page")
     async def prev_page(self, interaction: Interaction):
-        self.page -= 1
-        self.update_buttons()
-        await interaction.response.edit_message(content=self.get_page_content(), view=self)
+        sessions = await self.load_page(self.page - 1)
+        await interaction.response.edit_message(content=self.get_page_content(sessions), view=self)
 
+    @timed_component("list_sessions.page")
     async def next_page(self, interaction: Interaction):
-        self.page += 1
-        self.update_buttons()
-        await interaction.response.edit_message(content=self.get_page_content(), view=self)
+        sessions = await self.load_page(self.page + 1)
+        await interaction.response.edit_message(content=self.get_page_content(sessions), view=self)
 
 
 async def handle_list_sessions(interaction: Interaction, query: str):
@@ -71,7 +99,7 @@ async def handle_list_sessions(interaction: Interaction, query: str):
     query = sanitize_query_input(query)
 
     try:
-        games = search_games_fuzzy(query)
+        games = await search_games_fuzzy(query)
     except Exception as e:
         await interaction.followup.send(f"❌ Error searching for games: {str(e)}", ephemeral=True)
         return
@@ -86,9 +114,11 @@ async def handle_list_sessions(interaction: Interaction, query: str):
             self.game_id = game_id
             self.label_text = label
 
+        @timed_component("list_sessions.select_game")
         async def callback(self, i: Interaction):
+            view = GameSessionPaginator(self.game_id, i.guild_id, self.label_text)
             try:
-                sessions = get_sessions_for_game(self.game_id, i.guild_id)
+                sessions = await view.load_page(0)
             except Exception as e:
                 await i.response.edit_message(content=f"❌ Failed to fetch sessions: {str(e)}", view=None)
                 return
@@ -97,8 +127,7 @@ async def handle_list_sessions(interaction: Interaction, query: str):
                 await i.response.edit_message(content="📭 No sessions found for that game.", view=None)
                 return
 
-            view = GameSessionPaginator(self.label_text, sessions)
-            await i.response.edit_message(content=view.get_page_content(), view=view)
+            await i.response.edit_message(content=view.get_page_content(sessions), view=view)
 
     class GameButtonView(ui.View):
         def __init__(self, games):
@@ -1,26 +1,53 @@
 import discord
 from discord import Interaction, ui, ButtonStyle
-from helpers.supa_helpers import get_user_by_discord_id, get_user_games_sorted_by_name
+from helpers.supa_helpers import get_user_by_discord_id, get_user_games_page
+from helpers.ttl_cache import TTLCache
+from helpers.metrics import timed_component
+
+PAGE_SIZE = 10
+
+
+def render_page(games: list[dict], page: int, total_pages: int) -> str:
+    return (
+        f"📚 **Your Games (Page {page + 1}/{total_pages})**:\n" +
+        "\n".join(f"• {g['name']}" for g in games)
+    )
+
 
 class GamePagination(ui.View):
-    def __init__(self, pages: list[str]):
+    """Fetches collection pages on demand with range queries; only a few rendered pages are kept."""
+
+    def __init__(self, user_id: int, total: int, page_size: int = PAGE_SIZE, cache_size: int = 5):
         super().__init__(timeout=120)
-        self.pages = pages
+        self.user_id = user_id
+        self.page_size = page_size
+        self.total_pages = max(1, (total + page_size - 1) // page_size)
+        self.pages = TTLCache(maxsize=cache_size, ttl=self.timeout)
         self.current = 0
 
+    async def get_page(self, page: int) -> str:
+        content = self.pages.get(page)
+        if content is None:
+            games, _ = await get_user_games_page(self.user_id, page * self.page_size, self.page_size)
+            content = render_page(games, page, self.total_pages)
+            self.pages.set(page, content)
+        return content
+
     @ui.button(label="⬅️ Prev", style=ButtonStyle.secondary)
+    @timed_component("owned_games.page")
     async def prev(self, interaction: Interaction, button: ui.Button):
         if self.current > 0:
             self.current -= 1
-            await interaction.response.edit_message(content=self.pages[self.current], view=self)
+            await interaction.response.edit_message(content=await self.get_page(self.current), view=self)
         else:
             await interaction.response.defer()
 
     @ui.button(label="Next ➡️", style=ButtonStyle.secondary)
+    @timed_component("owned_games.page")
     async def next(self, interaction: Interaction, button: ui.Button):
-        if self.current < len(self.pages) - 1:
+        if self.current < self.total_pages - 1:
             self.current += 1
-            await interaction.response.edit_message(content=self.pages[self.current], view=self)
+            await interaction.response.edit_message(content=await self.get_page(self.current), view=self)
         else:
             await interaction.response.defer()
 
@@ -30,25 +57,19 @@ async def handle_my_games(interaction: Interaction, user: discord.User = None):
     if user is None:
         user = interaction.user
 
-    db_user = get_user_by_discord_id(int(user.id), interaction.guild_id)
+    db_user = await get_user_by_discord_id(int(user.id), interaction.guild_id)
 
     if not db_user:
         await interaction.followup.send("❌ User not registered yet. Use `/register_user` to begin.", ephemeral=True)
         return
 
-    game_names = get_user_games_sorted_by_name(db_user["id"])
-    if not game_names:
+    # The first page and the collection size come back in one request
+    games, total = await get_user_games_page(db_user["id"], 0, PAGE_SIZE, count=True)
+    if not games:
         await interaction.followup.send("🕹️ User doesn't have any games in your collection. Use `/add_game` to add one.", ephemeral=True)
         return
 
-    page_size = 10
-    total_pages = (len(game_names) + page_size - 1) // page_size
-
-    pages = [
-        f"📚 **Your Games (Page {page_idx + 1}/{total_pages})**:\n" +
-        "\n".join(f"• {name}" for name in game_names[i:i + page_size])
-        for page_idx, i in enumerate(range(0, len(game_names), page_size))
-    ]
-
-    view = GamePagination(pages)
-    await interaction.followup.send(content=pages[0], view=view, ephemeral=True)
+    view = GamePagination(db_user["id"], total or len(games))
+    first_page = render_page(games, 0, view.total_pages)
+    view.pages.set(0, first_page)
+    await interaction.followup.send(content=first_page, view=view, ephemeral=True)
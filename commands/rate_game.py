@@ -2,6 +2,7 @@ import discord
 from discord import Interaction, ui
 from datetime import datetime, timedelta
 from helpers.supa_helpers import search_games_fuzzy, add_or_update_rating, get_user_by_discord_id
+from helpers.metrics import timed_component
 
 POLL_DURATION_DAYS = 7
 
@@ -11,17 +12,18 @@ class RatingButton(ui.Button):
         self.game_id = game_id
         self.rating = rating
 
+    @timed_component("rate_game.rate")
     async def callback(self, interaction: Interaction):
         user = interaction.user
         expires_at = datetime.utcnow() + timedelta(days=POLL_DURATION_DAYS)
-        user_record = get_user_by_discord_id(user.id, interaction.guild_id)
+        user_record = await get_user_by_discord_id(user.id, interaction.guild_id)
         if not user_record:
             await interaction.response.send_message("❌ You must register first using `/register_user`.", ephemeral=True)
             return
 
         user_id = user_record["id"]  # Supabase user ID
         
-        add_or_update_rating(user_id, self.game_id, self.rating, expires_at)
+        await add_or_update_rating(user_id, self.game_id, self.rating, expires_at)
 
         await interaction.response.send_message(
             f"⭐ You rated the game **{self.rating}/5**. Thanks!",
@@ -37,7 +39,7 @@ class RatingView(ui.View):
 async def handle_rate_game(interaction: Interaction, query: str):
     await interaction.response.defer(ephemeral=False)
 
-    games = search_games_fuzzy(query)
+    games = await search_games_fuzzy(query)
     if not games:
         await interaction.followup.send("❌ No matching games found.")
         return
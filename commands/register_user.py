@@ -11,13 +11,13 @@ async def handle_register_user(interaction: Interaction, nickname: str):
     username = str(interaction.user)
     server_id = int(interaction.guild_id)
 
-    user = get_user_by_discord_id(discord_id)
+    user = await get_user_by_discord_id(discord_id)
 
     if not user:
-        user = create_user(discord_id, username, nickname)
+        user = await create_user(discord_id, username, nickname)
 
     if user:
-        registered = register_user_to_server(user["id"], server_id)
+        registered = await register_user_to_server(user["id"], server_id)
     else:
         await interaction.followup.send("❌ Registration failed. Please try again later or contact support.", ephemeral=True)
         return
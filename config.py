@@ -16,4 +16,33 @@ else:
     DISCORD_TOKEN = os.getenv("DISCORD_TOKEN_DEV")
     SUPABASE_URL = os.getenv("SUPABASE_URL_DEV")
     SUPABASE_KEY = os.getenv("SUPABASE_KEY_DEV")
-    OPENAI_API_KEY = os.getenv("OPEN_AI_DEV_KEY")
\ No newline at end of file
+    OPENAI_API_KEY = os.getenv("OPEN_AI_DEV_KEY")
+
+# Request budget for the background BGG prefetch worker (helpers/bgg_prefetch.py).
+BGG_REQUESTS_PER_SECOND = float(os.getenv("BGG_REQUESTS_PER_SECOND", "0.5"))
+
+# Port for the local Prometheus /metrics endpoint (helpers/metrics.py); unset disables it.
+METRICS_PORT = int(os.getenv("METRICS_PORT")) if os.getenv("METRICS_PORT") else None
+
+# Seconds a process's game-name index may go without checking for games other processes added (helpers/game_index.py).
+GAME_INDEX_MAX_AGE = float(os.getenv("GAME_INDEX_MAX_AGE", "60"))
+# Seconds between full reloads of that index, which pick up games renamed or deleted elsewhere.
+GAME_INDEX_RELOAD_AGE = float(os.getenv("GAME_INDEX_RELOAD_AGE", "3600"))
+
+# Database round-trips one slash command or component callback may make before a warning is logged (helpers/query_tracker.py); 0 disables.
+DB_QUERY_BUDGET = int(os.getenv("DB_QUERY_BUDGET", "10"))
+
+
+def _parse_ids(value: str) -> list[int]:
+    return [int(v) for v in value.replace(" ", "").split(",") if v]
+
+
+# Guilds that get guild-scoped copies of the slash commands (instant updates, meant for dev).
+# GUILD_IDS takes a comma-separated list; the older GUILD_ID / GUILD_ID_2 pair is still honoured.
+GUILD_IDS = _parse_ids(os.getenv("GUILD_IDS", "")) or _parse_ids(f"{os.getenv('GUILD_ID', '')},{os.getenv('GUILD_ID_2', '')}")
+# Also scope commands to every server that has registered users (users_servers).
+GUILD_IDS_FROM_DB = os.getenv("GUILD_IDS_FROM_DB", "").lower() in ("1", "true", "yes")
+# "global" registers commands once for every server the bot is in; "guild" copies them to the guilds above.
+COMMAND_SCOPE = os.getenv("COMMAND_SCOPE", "global" if IS_PROD else "guild")
+# Where the hash of the last synced command tree is kept, so restarts skip unchanged syncs (helpers/command_sync.py).
+COMMAND_SYNC_STATE = os.getenv("COMMAND_SYNC_STATE", ".command_sync.json")
@@ -0,0 +1,103 @@
+import aiohttp
+import xml.etree.ElementTree as ET
+from typing import Iterable, List, Optional
+from helpers.bgg_xml import CHUNK_SIZE, read_items
+from helpers.input_sanitizer import escape_query_param
+from helpers.metrics import timed
+from helpers.ttl_cache import TTLCache
+
+BGG_BASE_URL = "https://boardgamegeek.com/xmlapi2"
+BGG_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5)
+# Most ids the thing endpoint accepts in one request.
+BGG_THING_BATCH_SIZE = 20
+# Search results shown in a button view; Discord allows at most 25 components.
+BGG_SEARCH_LIMIT = 20
+
+
+class BGGError(Exception):
+    """BoardGameGeek answered, but not with a usable 200 response."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class BGGClient:
+    """Shared BoardGameGeek XML API client.
+
+    One long-lived aiohttp session (and connection pool) is reused for every request,
+    and search/thing results are cached so repeated lookups skip the network.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BGG_BASE_URL,
+        timeout: aiohttp.ClientTimeout = BGG_TIMEOUT,
+        cache_size: int = 512,
+        search_ttl: float = 15 * 60,
+        thing_ttl: float = 6 * 60 * 60,
+        connection_limit: int = 10,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.connection_limit = connection_limit
+        self.search_cache = TTLCache(maxsize=cache_size, ttl=search_ttl)
+        self.thing_cache = TTLCache(maxsize=cache_size, ttl=thing_ttl)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so it binds to the running event loop.
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=self.connection_limit, ttl_dns_cache=300),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_text(self, url: str, operation: str) -> str:
+        async with timed("dependency", dependency="bgg", operation=operation):
+            async with self._get_session().get(url) as response:
+                if response.status != 200:
+                    raise BGGError(f"BoardGameGeek returned HTTP {response.status}.", response.status)
+                return await response.text()
+
+    async def search(self, query: str, limit: int = BGG_SEARCH_LIMIT) -> List[ET.Element]:
+        """The first `limit` <item> elements of a boardgame search. `query` should already be sanitized.
+
+        The body is parsed as it streams in and the download stops once `limit` items
+        are read, so broad queries don't pull megabytes of XML.
+        """
+        key = (query.strip().lower(), limit)
+        cached = self.search_cache.get(key)
+        if cached is not None:
+            return cached
+        url = f"{self.base_url}/search?query={escape_query_param(query)}&type=boardgame"
+        async with timed("dependency", dependency="bgg", operation="search"):
+            async with self._get_session().get(url) as response:
+                if response.status != 200:
+                    raise BGGError(f"BoardGameGeek returned HTTP {response.status}.", response.status)
+                items = await read_items(response.content.iter_chunked(CHUNK_SIZE), limit)
+        self.search_cache.set(key, items)
+        return items
+
+    async def thing(self, bgg_id: int) -> str:
+        """Raw XML for a single game, including stats."""
+        cached = self.thing_cache.get(bgg_id)
+        if cached is not None:
+            return cached
+        xml = await self._get_text(f"{self.base_url}/thing?id={bgg_id}&stats=1", "thing")
+        self.thing_cache.set(bgg_id, xml)
+        return xml
+
+    async def things(self, bgg_ids: Iterable[int]) -> str:
+        """Raw XML for up to BGG_THING_BATCH_SIZE games in one request. Not cached."""
+        ids = ",".join(str(bgg_id) for bgg_id in bgg_ids)
+        return await self._get_text(f"{self.base_url}/thing?id={ids}&stats=1", "things")
+
+
+bgg = BGGClient()
@@ -0,0 +1,189 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+from config import BGG_REQUESTS_PER_SECOND
+from helpers.bgg_client import bgg, BGGClient, BGGError, BGG_THING_BATCH_SIZE
+from helpers.game_metadata import GAME_METADATA_TTL, parse_things
+from helpers.supa_helpers import get_stale_game_bgg_ids, mark_games_synced, upsert_games
+
+logger = logging.getLogger(__name__)
+
+# BGG answers 429 when we are going too fast and 202 when it has queued the request.
+RETRY_STATUSES = {202, 429, 503}
+
+
+class BGGBatchError(BGGError):
+    """Some chunks of a batch fetch failed even after retrying; `records` holds the ones that didn't."""
+
+    def __init__(self, records: Dict[int, Dict[str, Any]], failed_ids: List[int], status: Optional[int] = None):
+        super().__init__(f"BoardGameGeek fetch failed for {len(failed_ids)} games: {failed_ids}", status)
+        self.records = records
+        self.failed_ids = failed_ids
+
+
+class BGGPrefetchWorker:
+    """Keeps stored game metadata warm without user-facing BGG calls.
+
+    BGG ids are queued (deduplicated, bounded) and fetched in multi-id `thing` batches,
+    no faster than `requests_per_second`. Throttled batches are retried with exponential
+    backoff. Every `scan_interval` seconds games synced longer than GAME_METADATA_TTL ago
+    (or never) are queued, as many as the queue has room for.
+    """
+
+    def __init__(
+        self,
+        client: BGGClient = bgg,
+        requests_per_second: float = BGG_REQUESTS_PER_SECOND,
+        batch_size: int = BGG_THING_BATCH_SIZE,
+        max_queue: int = 1000,
+        scan_interval: float = 60 * 60,
+        base_backoff: float = 5,
+        max_backoff: float = 5 * 60,
+        max_attempts: int = 5,
+    ):
+        self.client = client
+        self.min_interval = 1 / requests_per_second
+        self.batch_size = batch_size
+        self.scan_interval = scan_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self.queue: "asyncio.Queue[int]" = asyncio.Queue(maxsize=max_queue)
+        self.fetched = 0
+        self._queued: Set[int] = set()
+        self._next_request_at = 0.0
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return any(not t.done() for t in self._tasks)
+
+    def enqueue(self, bgg_id: int) -> bool:
+        """Queue a game for refresh. Returns False if it is already queued or the queue is full."""
+        if bgg_id in self._queued:
+            return False
+        try:
+            self.queue.put_nowait(bgg_id)
+        except asyncio.QueueFull:
+            return False
+        self._queued.add(bgg_id)
+        return True
+
+    async def enqueue_stale_games(self) -> int:
+        room = self.queue.maxsize - self.queue.qsize()
+        if room <= 0:
+            return 0
+        bgg_ids = await get_stale_game_bgg_ids(datetime.now(timezone.utc) - GAME_METADATA_TTL, room)
+        return sum(self.enqueue(bgg_id) for bgg_id in bgg_ids)
+
+    async def next_batch(self) -> List[int]:
+        batch = [await self.queue.get()]
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _wait_for_budget(self):
+        # Reserve the next slot before sleeping so concurrent chunks stay spaced out.
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next_request_at)
+        self._next_request_at = start + self.min_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def _fetch_chunk(self, bgg_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """One thing request, retried with exponential backoff while BGG throttles us."""
+        for attempt in range(self.max_attempts):
+            await self._wait_for_budget()
+            try:
+                return parse_things(await self.client.things(bgg_ids))
+            except BGGError as e:
+                if e.status not in RETRY_STATUSES:
+                    raise
+                delay = min(self.max_backoff, self.base_backoff * 2 ** attempt)
+                logger.info(f"BGG returned {e.status}; retrying {len(bgg_ids)} games in {delay:.0f}s")
+                await asyncio.sleep(delay)
+        raise BGGError(f"BoardGameGeek kept throttling after {self.max_attempts} attempts.", 429)
+
+    async def fetch_records(self, bgg_ids: Iterable[int], concurrency: int = 4) -> Dict[int, Dict[str, Any]]:
+        """Parsed BGG records for many games, keyed by BGG id.
+
+        Ids are deduplicated and split into `batch_size` thing requests, at most
+        `concurrency` in flight, all within this worker's request budget. Ids BGG doesn't
+        know are left out. If a chunk still fails after retrying, BGGBatchError is raised
+        with the records that were fetched and the ids that weren't.
+        """
+        ids = list(dict.fromkeys(bgg_ids))
+        chunks = [ids[i:i + self.batch_size] for i in range(0, len(ids), self.batch_size)]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_chunk(chunk):
+            async with semaphore:
+                return await self._fetch_chunk(chunk)
+
+        records, failed_ids, status = {}, [], None
+        for chunk, result in zip(chunks, await asyncio.gather(*(fetch_chunk(c) for c in chunks), return_exceptions=True)):
+            if isinstance(result, Exception):
+                logger.warning(f"BGG batch fetch of {chunk} failed: {result}")
+                failed_ids.extend(chunk)
+                status = getattr(result, "status", status)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                records.update(result)
+        if failed_ids:
+            raise BGGBatchError(records, failed_ids, status)
+        return records
+
+    async def fetch_batch(self, bgg_ids: List[int]) -> int:
+        """Fetch and store one batch. Returns the number of games stored."""
+        records = await self.fetch_records(bgg_ids)
+        await upsert_games(records)
+        missing = [bgg_id for bgg_id in bgg_ids if bgg_id not in records]
+        if missing:
+            logger.info(f"BGG has no thing record for {missing}; marking them synced")
+            await mark_games_synced(missing)
+        self.fetched += len(records)
+        return len(records)
+
+    async def process(self):
+        while True:
+            batch = await self.next_batch()
+            try:
+                await self.fetch_batch(batch)
+            except Exception as e:
+                logger.warning(f"BGG prefetch of {batch} failed: {e}")
+            finally:
+                self._queued.difference_update(batch)
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def scan(self):
+        while True:
+            try:
+                queued = await self.enqueue_stale_games()
+                if queued:
+                    logger.info(f"Queued {queued} stale games for BGG refresh")
+            except Exception as e:
+                logger.warning(f"Scanning games for BGG refresh failed: {e}")
+            await asyncio.sleep(self.scan_interval)
+
+    def start(self):
+        # on_ready can fire again after a reconnect; only one worker should run.
+        if not self.running:
+            self._tasks = [asyncio.create_task(self.process()), asyncio.create_task(self.scan())]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+prefetcher = BGGPrefetchWorker()
+
+
+async def fetch_game_records(bgg_ids: Iterable[int], concurrency: int = 4) -> Dict[int, Dict[str, Any]]:
+    """Batch-fetch BGG records through the shared worker, so callers share its rate budget."""
+    return await prefetcher.fetch_records(bgg_ids, concurrency)
@@ -0,0 +1,71 @@
+import xml.etree.ElementTree as ET
+from typing import AsyncIterable, List, Optional, Union
+
+# Bytes fed to the parser at a time when reading a response body.
+CHUNK_SIZE = 16 * 1024
+
+
+class ItemReader:
+    """Incrementally collects the top-level <item> elements of a BGG XML response.
+
+    Each finished item is detached from the document root as soon as it is parsed,
+    so only the items being kept stay in memory, and feeding stops paying off once
+    `limit` items have been seen.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.items: List[ET.Element] = []
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root: Optional[ET.Element] = None
+        self._depth = 0
+
+    @property
+    def done(self) -> bool:
+        return self.limit is not None and len(self.items) >= self.limit
+
+    def feed(self, data: Union[bytes, str]) -> bool:
+        """Parse another chunk. Returns True once `limit` items have been collected."""
+        self._parser.feed(data)
+        self._collect()
+        return self.done
+
+    def close(self) -> List[ET.Element]:
+        if not self.done:
+            self._parser.close()
+            self._collect()
+        return self.items
+
+    def _collect(self):
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = element
+                self._depth += 1
+                continue
+            self._depth -= 1
+            if self._depth == 1 and element.tag == "item":
+                self._root.remove(element)
+                if not self.done:
+                    self.items.append(element)
+
+
+def parse_items(data: Union[bytes, str], limit: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> List[ET.Element]:
+    """The first `limit` <item> elements of an in-memory BGG response."""
+    reader = ItemReader(limit)
+    for start in range(0, len(data), chunk_size):
+        if reader.feed(data[start:start + chunk_size]):
+            break
+    return reader.close()
+
+
+async def read_items(chunks: AsyncIterable[bytes], limit: Optional[int] = None) -> List[ET.Element]:
+    """The first `limit` <item> elements of a streamed BGG response, e.g. `response.content.iter_chunked(...)`.
+
+    Stops consuming the stream as soon as enough items have been parsed.
+    """
+    reader = ItemReader(limit)
+    async for chunk in chunks:
+        if reader.feed(chunk):
+            break
+    return reader.close()
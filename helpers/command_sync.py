@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Optional
+import discord
+from discord import app_commands
+from config import COMMAND_SCOPE, COMMAND_SYNC_STATE, GUILD_IDS, GUILD_IDS_FROM_DB
+from helpers.supa_helpers import get_registered_server_ids
+
+logger = logging.getLogger(__name__)
+
+
+async def resolve_guild_ids() -> List[int]:
+    """Configured guilds, plus every server with registered users when GUILD_IDS_FROM_DB is set."""
+    guild_ids = set(GUILD_IDS)
+    if GUILD_IDS_FROM_DB:
+        guild_ids.update(await get_registered_server_ids())
+    return sorted(guild_ids)
+
+
+def tree_hash(tree: app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> str:
+    """Hash of the command payload Discord would receive for one scope."""
+    payload = sorted((command.to_dict(tree) for command in tree.get_commands(guild=guild)), key=lambda c: (c["type"], c["name"]))
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def load_sync_state(path: str = COMMAND_SYNC_STATE) -> Dict[str, str]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_sync_state(state: Dict[str, str], path: str = COMMAND_SYNC_STATE):
+    # Write then rename so a crash mid-write can't leave a half-written file behind.
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+async def sync_commands(
+    tree: app_commands.CommandTree,
+    guild_ids: Iterable[int] = (),
+    scope: str = COMMAND_SCOPE,
+    force: bool = False,
+    state_path: str = COMMAND_SYNC_STATE,
+) -> List[str]:
+    """Push the command tree to Discord and return the scopes that were synced.
+
+    Commands are defined globally. With scope "global" they are synced once for every server,
+    and each guild in `guild_ids` has its guild-scoped commands cleared (left over from running
+    with scope "guild", they would otherwise show up twice there); otherwise they are copied to
+    each guild and synced there. A scope whose payload hash matches
+    the one stored in `state_path` by the last successful sync is skipped unless `force` is set.
+    A guild that fails (e.g. the bot was removed from it) is logged and skipped so the others still sync.
+    """
+    state = load_sync_state(state_path)
+    # The same state file may be shared by the dev and prod bots.
+    prefix = f"{tree.client.application_id}:"
+
+    guilds = [(f"guild:{g}", discord.Object(id=g)) for g in guild_ids]
+    targets = [("global", None)] + guilds if scope == "global" else guilds
+    synced_scopes = []
+    for name, guild in targets:
+        if guild is not None and scope == "global":
+            # Stored as the hash of an empty payload, so each guild is only cleared once.
+            tree.clear_commands(guild=guild)
+        elif guild is not None:
+            tree.copy_global_to(guild=guild)
+        digest = tree_hash(tree, guild)
+        if not force and state.get(prefix + name) == digest:
+            logger.info(f"Commands for {name} unchanged; skipping sync")
+            continue
+        try:
+            synced = await tree.sync(guild=guild)
+        except discord.HTTPException as e:
+            logger.warning(f"Failed to sync commands to {name}: {e}")
+            continue
+        logger.info(f"Synced {len(synced)} commands to {name}")
+        state[prefix + name] = digest
+        synced_scopes.append(name)
+
+    if synced_scopes:
+        try:
+            save_sync_state(state, state_path)
+        except OSError as e:
+            logger.warning(f"Could not save command sync state to {state_path}: {e}")
+    return synced_scopes
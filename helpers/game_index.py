@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from rapidfuzz import fuzz, process
+
+logger = logging.getLogger(__name__)
+
+
+class GameNameIndex:
+    """Resident copy of the games catalogue for fuzzy name search.
+
+    Loaded from the database once, then kept current by `add` (which also applies renames)
+    and `remove` whenever this process writes a game, so searches never download the whole
+    `games` table. Games inserted by other bot processes are picked up by `ensure_loaded`,
+    which fetches ids above the last one loaded from the database at most every `max_age`
+    seconds, and reloads everything every `reload_age` seconds to catch renames and deletes
+    made elsewhere.
+    """
+
+    def __init__(self):
+        self._games: List[Dict[str, Any]] = []
+        self._names: List[str] = []
+        # game id -> position in _games/_names
+        self._positions: Dict[int, int] = {}
+        self._lock = asyncio.Lock()
+        self.loaded = False
+        # Highest id seen in a database load. Ids added locally don't advance it, so a game
+        # another process inserted with a lower id is still fetched.
+        self.loaded_max_id = 0
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def replace(self, games: List[Dict[str, Any]]):
+        self._games = []
+        self._names = []
+        self._positions = {}
+        self.loaded_max_id = 0
+        self._merge(games)
+        self._loaded_at = self._checked_at
+        self.loaded = True
+
+    def invalidate(self):
+        """Reload the whole catalogue on the next `ensure_loaded`."""
+        self.loaded = False
+
+    def _merge(self, games: List[Dict[str, Any]]):
+        for game in games:
+            self.add(game["id"], game["name"])
+            self.loaded_max_id = max(self.loaded_max_id, game["id"])
+        self._checked_at = time.monotonic()
+
+    def add(self, game_id: int, name: str):
+        """Index a game, or update its name if it is already indexed."""
+        position = self._positions.get(game_id)
+        if position is None:
+            self._positions[game_id] = len(self._games)
+            self._games.append({"id": game_id, "name": name})
+            self._names.append(name.lower())
+        elif self._games[position]["name"] != name:
+            self._games[position] = {"id": game_id, "name": name}
+            self._names[position] = name.lower()
+
+    def remove(self, game_id: int):
+        position = self._positions.pop(game_id, None)
+        if position is None:
+            return
+        # Move the last entry into the gap so removal stays O(1).
+        last_game, last_name = self._games.pop(), self._names.pop()
+        if position < len(self._games):
+            self._games[position], self._names[position] = last_game, last_name
+            self._positions[last_game["id"]] = position
+
+    @staticmethod
+    def _due(since: float, max_age: Optional[float]) -> bool:
+        return max_age is not None and time.monotonic() - since >= max_age
+
+    async def ensure_loaded(
+        self,
+        loader: Callable[[], Awaitable[List[Dict[str, Any]]]],
+        load_newer: Optional[Callable[[int], Awaitable[List[Dict[str, Any]]]]] = None,
+        max_age: Optional[float] = None,
+        reload_age: Optional[float] = None,
+    ):
+        """Load the catalogue on first use, and again once it is `reload_age` seconds old. With
+        `load_newer` and `max_age`, also fetch the games with ids above `loaded_max_id` once the
+        last database read is `max_age` seconds old."""
+        def stale() -> bool:
+            return not self.loaded or self._due(self._loaded_at, reload_age) or bool(load_newer and self._due(self._checked_at, max_age))
+
+        if not stale():
+            return
+        async with self._lock:
+            if not stale():
+                return
+            if not self.loaded:
+                self.replace(await loader())
+                return
+            try:
+                if self._due(self._loaded_at, reload_age):
+                    self.replace(await loader())
+                else:
+                    self._merge(await load_newer(self.loaded_max_id))
+            except Exception as e:
+                # Serve the index we have; the next search retries.
+                logger.warning(f"Refreshing the game index failed: {e}")
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        # Same scorer as thefuzz.partial_ratio on lowercased names, but top-k is selected
+        # by RapidFuzz in C instead of scoring in Python and sorting every row.
+        matches = process.extract(query.lower(), self._names, scorer=fuzz.partial_ratio, processor=None, limit=limit)
+        return [self._games[index] for _, _, index in matches]
+
+
+game_index = GameNameIndex()
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from helpers.bgg_client import bgg
+from helpers.supa_helpers import get_game_by_bgg_id, upsert_game
+
+logger = logging.getLogger(__name__)
+
+# Stored records older than this are still served, but refreshed from BGG in the background.
+GAME_METADATA_TTL = timedelta(days=7)
+
+_refresh_tasks: Dict[int, asyncio.Task] = {}
+
+
+def _value(item: ET.Element, path: str) -> Optional[str]:
+    element = item.find(path)
+    return element.get("value") if element is not None else None
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_thing_item(item: ET.Element) -> Dict[str, Any]:
+    """Flatten a BGG `thing` <item> into the columns stored on `games`."""
+    names = item.findall("name")
+    name = next((n.get("value") for n in names if n.get("type") == "primary"), None)
+    if name is None:
+        name = names[0].get("value", "Unknown Game") if names else "Unknown Game"
+
+    links = item.findall("link")
+    designers = [e.get("value") for e in links if e.get("type") == "boardgamedesigner"]
+    publishers = [e.get("value") for e in links if e.get("type") == "boardgamepublisher"]
+    image = item.find("image")
+    thumbnail = item.find("thumbnail")
+    rating_avg = _float(_value(item, "statistics/ratings/average"))
+
+    return {
+        "name": name,
+        "publisher": publishers[0] if publishers else "",
+        "designer": designers[0] if designers else "",
+        "min_players": _int(_value(item, "minplayers")) or 0,
+        "max_players": _int(_value(item, "maxplayers")) or 0,
+        "year_published": _int(_value(item, "yearpublished")),
+        "playing_time": _int(_value(item, "playingtime")),
+        "image_url": image.text.strip() if image is not None and image.text else None,
+        "thumbnail_url": thumbnail.text.strip() if thumbnail is not None and thumbnail.text else None,
+        "designers": designers,
+        "publishers": publishers,
+        "rating_avg": round(rating_avg, 2) if rating_avg else None,
+        "rating_count": _int(_value(item, "statistics/ratings/usersrated")),
+        "weight": _float(_value(item, "statistics/ratings/averageweight")) or None,
+        "bgg_rank": _int(_value(item, "statistics/ratings/ranks/rank[@name='boardgame']")),
+    }
+
+
+def parse_things(xml: str) -> Dict[int, Dict[str, Any]]:
+    """Parsed records keyed by BGG id for every <item> in a thing response."""
+    return {int(item.get("id")): parse_thing_item(item) for item in ET.fromstring(xml).findall("item")}
+
+
+def is_stale(game: Dict[str, Any], ttl: timedelta = GAME_METADATA_TTL) -> bool:
+    synced = game.get("bgg_synced_at")
+    if not synced:
+        return True
+    synced_at = datetime.fromisoformat(synced)
+    if synced_at.tzinfo is None:
+        synced_at = synced_at.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - synced_at > ttl
+
+
+async def refresh_game(bgg_id: int) -> Optional[Dict[str, Any]]:
+    """Fetch the thing record from BGG and store it. Returns the stored row, or None if BGG has no such game."""
+    record = parse_things(await bgg.thing(bgg_id)).get(bgg_id)
+    if record is None:
+        return None
+    return await upsert_game(bgg_id, record)
+
+
+async def _refresh_quietly(bgg_id: int):
+    try:
+        await refresh_game(bgg_id)
+    except Exception as e:
+        logger.warning(f"Background refresh of BGG game {bgg_id} failed: {e}")
+
+
+def schedule_refresh(bgg_id: int) -> asyncio.Task:
+    """Refresh a stored game in the background; concurrent requests for the same game share one task."""
+    task = _refresh_tasks.get(bgg_id)
+    if task is None:
+        task = asyncio.create_task(_refresh_quietly(bgg_id))
+        _refresh_tasks[bgg_id] = task
+        task.add_done_callback(lambda _: _refresh_tasks.pop(bgg_id, None))
+    return task
+
+
+async def get_game_record(bgg_id: int) -> Optional[Dict[str, Any]]:
+    """The stored game row for `bgg_id`.
+
+    BGG is only contacted in the foreground when the game has never been synced;
+    stale rows are returned as-is and refreshed in the background.
+    """
+    game = await get_game_by_bgg_id(bgg_id)
+    if game and game.get("bgg_synced_at"):
+        if is_stale(game):
+            schedule_refresh(bgg_id)
+        return game
+    return await refresh_game(bgg_id)
@@ -0,0 +1,78 @@
+"""Deferred imports and client construction, so the bot reaches the gateway sooner.
+
+Command handlers are registered as `lazy_handler` stand-ins that import their module on
+first call, and SDK clients (Supabase, OpenAI) are `LazyClient`s built on first attribute
+access. `warm_up()` does both in a worker thread once the bot is connected, so the first
+interaction doesn't pay for the imports on the event loop either.
+"""
+
+import asyncio
+import importlib
+import threading
+from typing import Any, Callable, List
+
+_handlers: List["LazyHandler"] = []
+_clients: List["LazyClient"] = []
+
+
+class LazyHandler:
+    """Async callable standing in for `module.name` until it is first called."""
+
+    def __init__(self, module: str, name: str):
+        self.module = module
+        self.name = name
+        self._func = None
+
+    def resolve(self) -> Callable:
+        if self._func is None:
+            self._func = getattr(importlib.import_module(self.module), self.name)
+        return self._func
+
+    async def __call__(self, *args, **kwargs):
+        return await self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self.module}.{self.name}>"
+
+
+def lazy_handler(module: str, name: str) -> LazyHandler:
+    handler = LazyHandler(module, name)
+    _handlers.append(handler)
+    return handler
+
+
+class LazyClient:
+    """Proxy that builds its client with `factory` the first time an attribute is used."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+        _clients.append(self)
+
+    @property
+    def built(self) -> bool:
+        return self._client is not None
+
+    def get(self) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+
+def preload():
+    """Import every registered handler module, then build every registered client."""
+    for handler in _handlers:
+        handler.resolve()
+    # Handler modules may register clients of their own, so build them last.
+    for client in list(_clients):
+        client.get()
+
+
+async def warm_up():
+    await asyncio.to_thread(preload)
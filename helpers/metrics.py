@@ -0,0 +1,205 @@
+"""In-process latency metrics for commands and the services they call.
+
+Every slash command is timed as a "command", every button/select/modal callback as a
+"component" and every Supabase, BGG and OpenAI call as a "dependency". Each series keeps a latency histogram plus call and error counts, which are
+served in Prometheus text format by `start_metrics_server` and summarised by /bot_metrics.
+"""
+
+import functools
+import inspect
+import time
+from bisect import bisect_left
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+from aiohttp import web
+from config import DB_QUERY_BUDGET
+from helpers.query_tracker import check_budget, current_log, query_operation, track_queries
+
+# Histogram bucket upper bounds, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_PREFIX = "gamenight"
+
+
+class Series:
+    """Latency histogram, call count and error count for one labelled series."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.calls = 0
+        self.errors = 0
+        self.max = 0.0
+
+    def observe(self, seconds: float, error: bool = False):
+        self.bucket_counts[bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.calls += 1
+        self.errors += error
+        self.max = max(self.max, seconds)
+
+    @property
+    def average(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (the slowest call for the overflow bucket)."""
+        target = q * self.calls
+        seen = 0
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            seen += count
+            if count and seen >= target:
+                return bound
+        return self.max
+
+
+class MetricsRegistry:
+    def __init__(self):
+        # (kind, labels) -> Series, where labels is a sorted tuple of (name, value) pairs
+        self.series: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Series] = {}
+
+    def observe(self, kind: str, seconds: float, error: bool = False, **labels: str):
+        key = (kind, tuple(sorted(labels.items())))
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = Series()
+        series.observe(seconds, error)
+
+    def of_kind(self, kind: str) -> List[Tuple[Dict[str, str], Series]]:
+        return [(dict(labels), s) for (k, labels), s in self.series.items() if k == kind]
+
+    def clear(self):
+        self.series.clear()
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for kind in sorted({k for k, _ in self.series}):
+            name = f"{METRIC_PREFIX}_{kind}"
+            lines.append(f"# HELP {name}_seconds Latency of {kind} calls.")
+            lines.append(f"# TYPE {name}_seconds histogram")
+            counters = []
+            for labels, series in self.of_kind(kind):
+                label_text = ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+                cumulative = 0
+                for bound, count in zip(series.buckets + (float("inf"),), series.bucket_counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_seconds_bucket{{{label_text},le="{le}"}} {cumulative}')
+                lines.append(f"{name}_seconds_sum{{{label_text}}} {series.total:.6f}")
+                lines.append(f"{name}_seconds_count{{{label_text}}} {series.calls}")
+                counters.append((label_text, series))
+            for suffix, attribute in (("calls", "calls"), ("errors", "errors")):
+                lines.append(f"# TYPE {name}_{suffix}_total counter")
+                lines.extend(f"{name}_{suffix}_total{{{label_text}}} {getattr(s, attribute)}" for label_text, s in counters)
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+@asynccontextmanager
+async def timed(kind: str, **labels: str):
+    """Time the enclosed block as one call; an exception counts as an error and is re-raised."""
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        metrics.observe(kind, time.perf_counter() - start, error, **labels)
+
+
+def instrument(kind: str, **labels: str):
+    """Decorator form of `timed` for async functions."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            async with timed(kind, **labels):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_command(func):
+    """Time a slash command callback and check its database query budget.
+
+    Goes directly above the `async def`, below @bot.tree.command/@describe.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with track_queries(f"/{name}") as log:
+            try:
+                async with timed("command", command=name):
+                    return await func(*args, **kwargs)
+            finally:
+                check_budget(log, DB_QUERY_BUDGET)
+    return wrapper
+
+
+def timed_component(name: str):
+    """Time a button, select or modal callback and check its database query budget.
+
+    Component callbacks run in their own task, outside the slash command that sent the
+    view, so each click gets its own QueryLog. When a command awaits a callback itself
+    (a single-match shortcut), its queries count towards the command instead.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if current_log() is not None:
+                async with timed("component", component=name):
+                    return await func(*args, **kwargs)
+            with track_queries(name) as log:
+                try:
+                    async with timed("component", component=name):
+                        return await func(*args, **kwargs)
+                finally:
+                    check_budget(log, DB_QUERY_BUDGET)
+        return wrapper
+    return decorator
+
+
+def instrument_module(namespace: dict, dependency: str):
+    """Wrap every public coroutine function defined in a module as a `dependency` call named after it.
+
+    Database queries issued inside each call are attributed to it (helpers/query_tracker.py).
+    """
+    for name, func in list(namespace.items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(func):
+            continue
+        if getattr(func, "__module__", None) != namespace["__name__"]:
+            continue
+        namespace[name] = _instrument_operation(func, dependency, name)
+
+
+def _instrument_operation(func, dependency: str, operation: str):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with query_operation(operation):
+            async with timed("dependency", dependency=dependency, operation=operation):
+                return await func(*args, **kwargs)
+    return wrapper
+
+
+_server: Optional[web.AppRunner] = None
+
+
+async def start_metrics_server(port: int, host: str = "127.0.0.1") -> web.AppRunner:
+    """Serve /metrics in Prometheus text format. Safe to call more than once."""
+    global _server
+    if _server is None:
+        async def handle_metrics(request: web.Request) -> web.Response:
+            return web.Response(text=metrics.render_prometheus(), content_type="text/plain", charset="utf-8")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle_metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        _server = runner
+    return _server
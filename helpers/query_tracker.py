@@ -0,0 +1,99 @@
+"""Per-interaction database round-trip counting.
+
+`install(client)` hooks the supabase client's HTTP session so every PostgREST request
+is recorded against the QueryLog of the interaction being handled, tagged with the
+supa_helpers function that issued it. Slash commands are tracked by @timed_command
+and component callbacks by @timed_component (helpers/metrics.py), which warn when an
+interaction goes over DB_QUERY_BUDGET queries or repeats the same query shape often
+enough to look like an N+1 loop.
+"""
+
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator, List, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# The same helper hitting the same table this many times in one interaction is reported as a likely N+1.
+N_PLUS_ONE_THRESHOLD = 5
+
+
+class Query(NamedTuple):
+    operation: str
+    method: str
+    resource: str
+
+
+class QueryLog:
+    def __init__(self, name: str):
+        self.name = name
+        self.queries: List[Query] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    def by_operation(self) -> Counter:
+        return Counter(q.operation for q in self.queries)
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[tuple]:
+        """(query, times) for every query shape issued at least `threshold` times."""
+        return [(q, n) for q, n in Counter(self.queries).most_common() if n >= threshold]
+
+
+_current_log: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+_current_operation: ContextVar[Optional[str]] = ContextVar("query_operation", default=None)
+
+
+@contextmanager
+def track_queries(name: str) -> Iterator[QueryLog]:
+    """Collect the queries issued inside the block, including by tasks it starts."""
+    log = QueryLog(name)
+    token = _current_log.set(log)
+    try:
+        yield log
+    finally:
+        _current_log.reset(token)
+
+
+def current_log() -> Optional[QueryLog]:
+    return _current_log.get()
+
+
+@contextmanager
+def query_operation(name: str):
+    """Attribute queries issued inside the block to `name` (set around each supa_helpers call)."""
+    token = _current_operation.set(name)
+    try:
+        yield
+    finally:
+        _current_operation.reset(token)
+
+
+def check_budget(log: QueryLog, budget: int):
+    if budget and log.count > budget:
+        breakdown = ", ".join(f"{op}×{n}" for op, n in log.by_operation().most_common())
+        logger.warning(f"{log.name} issued {log.count} database queries (budget {budget}): {breakdown}")
+    for query, times in log.repeated():
+        logger.warning(f"{log.name}: possible N+1, {query.operation} ran {query.method} {query.resource} {times} times")
+
+
+async def _record_request(request: "httpx.Request"):
+    log = _current_log.get()
+    if log is not None:
+        resource = request.url.path.split("/rest/v1/", 1)[-1]
+        log.queries.append(Query(_current_operation.get() or "unknown", request.method, resource))
+
+
+def install(client) -> None:
+    """Start recording requests made through a supabase client. Idempotent."""
+    session = client.postgrest.session
+    hooks = session.event_hooks
+    if _record_request not in hooks["request"]:
+        hooks["request"] = [*hooks["request"], _record_request]
+        session.event_hooks = hooks
@@ -0,0 +1,70 @@
+"""`python bot.py --profile-startup`: where cold-start import time goes.
+
+The bot is re-run with `-X importtime`. In that child, bot.py imports everything it needs to
+connect, prints DEFERRED_MARKER, runs `helpers.lazy.preload()` and exits without connecting.
+The parent groups the child's import timings by top-level package on each side of the marker.
+"""
+
+import os
+import subprocess
+import sys
+from collections import Counter
+from typing import List, NamedTuple, Tuple
+
+DEFERRED_MARKER = "-- deferred imports --"
+PROFILE_ENV = "GAMENIGHT_PROFILE_STARTUP"
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def is_profiling_child() -> bool:
+    return os.environ.get(PROFILE_ENV) == "1" and "importtime" in sys._xoptions
+
+
+def parse_importtime(lines: List[str]) -> Tuple[List[ImportTime], List[ImportTime]]:
+    """Split `-X importtime` output into (startup, deferred) entries around DEFERRED_MARKER."""
+    startup: List[ImportTime] = []
+    deferred: List[ImportTime] = []
+    current = startup
+    for line in lines:
+        if line.strip() == DEFERRED_MARKER:
+            current = deferred
+            continue
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        current.append(ImportTime(module.strip(), int(self_us), int(cumulative_us)))
+    return startup, deferred
+
+
+def by_package(entries: List[ImportTime]) -> Counter:
+    packages = Counter()
+    for entry in entries:
+        packages[entry.module.split(".")[0]] += entry.self_us
+    return packages
+
+
+def format_breakdown(title: str, entries: List[ImportTime], top: int = 12) -> str:
+    packages = by_package(entries)
+    total = sum(packages.values())
+    lines = [f"{title}: {total / 1000:.0f} ms across {len(entries)} modules"]
+    for package, us in packages.most_common(top):
+        lines.append(f"  {us / 1000:8.1f} ms  {us / total:6.1%}  {package}" if total else f"  {package}")
+    return "\n".join(lines)
+
+
+def profile_startup(script: str, argv: List[str]) -> int:
+    env = {**os.environ, PROFILE_ENV: "1"}
+    result = subprocess.run([sys.executable, "-X", "importtime", script, *argv], capture_output=True, text=True, env=env)
+    if result.returncode:
+        sys.stderr.write(result.stderr)
+        return result.returncode
+    startup, deferred = parse_importtime(result.stderr.splitlines())
+    print(format_breakdown("Imported before connecting", startup))
+    print()
+    print(format_breakdown("Deferred until first use (warmed up after connecting)", deferred))
+    return 0
@@ -1,46 +1,79 @@
 import os
-from typing import Optional, List, Dict, Any
-from dotenv import load_dotenv
-from thefuzz import fuzz
-from supabase import create_client, Client
-from supabase.lib.client_options import ClientOptions
-from config import SUPABASE_URL, SUPABASE_KEY
-from datetime import datetime
+import re
+from typing import Optional, List, Dict, Any, Tuple
+from config import SUPABASE_URL, SUPABASE_KEY, GAME_INDEX_MAX_AGE, GAME_INDEX_RELOAD_AGE
+from helpers.game_index import game_index
+from helpers.ttl_cache import TTLCache
+from helpers.lazy import LazyClient
+from helpers.metrics import instrument_module
+from helpers.query_tracker import install as install_query_tracking
+from datetime import datetime, timezone
 
 
 
-# Load .env config
-load_dotenv()
+def _create_client():
+    # The async client lets handlers await PostgREST round-trips without blocking the
+    # discord.py event loop. The SDK is imported here because it is slow to import.
+    from supabase import AsyncClient, AsyncClientOptions
+    client = AsyncClient(SUPABASE_URL, SUPABASE_KEY, options=AsyncClientOptions(schema="public"))
+    install_query_tracking(client)
+    return client
 
-# Initialize client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY, options=ClientOptions(schema="public"))
+
+# Built on first use (see helpers/lazy.py)
+supabase = LazyClient(_create_client)
 
 # -----------------------
 # USER HELPERS
 # -----------------------
 
-def create_user(discord_id, username, nickname="") -> int:
-    existing = supabase.table("users").select("id").eq("discord_id", discord_id).execute()
-    if existing.data:
-        return existing.data[0]
-    inserted = supabase.table("users").insert({
+# Registered users keyed by (discord_id, server_id). Only found users are cached, and the
+# create/register/update helpers below drop affected entries.
+user_cache = TTLCache(maxsize=2048, ttl=10 * 60)
+
+def invalidate_cached_user(user_id: Optional[int] = None, discord_id: Optional[int] = None):
+    for key, user in user_cache.items():
+        if (user_id is not None and user["id"] == user_id) or (discord_id is not None and key[0] == discord_id):
+            user_cache.pop(key)
+
+def get_user_cache_stats() -> Dict[str, int]:
+    return user_cache.stats()
+
+async def create_user(discord_id, username, nickname="") -> int:
+    invalidate_cached_user(discord_id=discord_id)
+    # Insert-or-ignore on the discord_id key; only an existing user needs the follow-up read,
+    # so a concurrent registration can't create a duplicate or overwrite their nickname.
+    inserted = await supabase.table("users").upsert({
         "discord_id": discord_id,
         "username": username,
         "nickname": nickname
-    }).execute()
-    return inserted.data[0]
-
-def get_user_by_id(user_id):
-    user = supabase.table("users").select("*").eq("id", user_id).execute()
+    }, on_conflict="discord_id", ignore_duplicates=True).execute()
+    if inserted.data:
+        return inserted.data[0]
+    existing = await supabase.table("users").select("id").eq("discord_id", discord_id).execute()
+    return existing.data[0]
+
+async def get_user_by_id(user_id):
+    user = await supabase.table("users").select("*").eq("id", user_id).execute()
     if user.data:
         return user.data[0]
     return None
 
-def get_user_by_discord_id(discord_id: int, server_id=None) -> Optional[Dict[str, Any]]:
+async def get_user_by_discord_id(discord_id: int, server_id=None) -> Optional[Dict[str, Any]]:
+    cache_key = (discord_id, server_id or None)
+    cached = user_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    user = await _fetch_user_by_discord_id(discord_id, server_id)
+    if user:
+        user_cache.set(cache_key, user)
+    return user
+
+async def _fetch_user_by_discord_id(discord_id: int, server_id=None) -> Optional[Dict[str, Any]]:
     if server_id:
         try:
             result = (
-                supabase.table("users")
+                await supabase.table("users")
                 .select("id, username, nickname, discord_id, users_servers!inner(server_id)")
                 .eq("discord_id", discord_id)
                 .eq("users_servers.server_id", server_id)
@@ -53,7 +86,7 @@ def get_user_by_discord_id(discord_id: int, server_id=None) -> Optional[Dict[str
     else:
         try:
             result = (
-                supabase.table("users")
+                await supabase.table("users")
                 .select("id, username, nickname, discord_id")
                 .eq("discord_id", discord_id)
                 .single()
@@ -63,30 +96,33 @@ def get_user_by_discord_id(discord_id: int, server_id=None) -> Optional[Dict[str
         except Exception:
             return None
 
-def get_all_registered_users(server_id=None) -> List[Dict[str, Any]]:
+async def get_all_registered_users(server_id=None) -> List[Dict[str, Any]]:
     if server_id:
         result = (
-            supabase.table("users_servers")
+            await supabase.table("users_servers")
             .select("users(id, username, nickname)")
             .eq("server_id", server_id)
             .execute()
         )
         return [entry["users"] for entry in result.data if "users" in entry]
     else:
-        return supabase.table("users").select("id, username, nickname").execute().data
+        return (await supabase.table("users").select("id, username, nickname").execute()).data
 
-def register_user_to_server(user_id: int, server_id: int) -> int:
-    existing = supabase.table('users_servers').select('*').eq('user_id', user_id).eq('server_id', server_id).execute()
-    if existing.data:
-        return existing.data[0]["id"]
-    created = supabase.table("users_servers").insert({
+async def get_registered_server_ids() -> List[int]:
+    result = await supabase.table("users_servers").select("server_id").execute()
+    return sorted({r["server_id"] for r in result.data or []})
+
+async def register_user_to_server(user_id: int, server_id: int) -> int:
+    invalidate_cached_user(user_id=user_id)
+    registered = await supabase.table("users_servers").upsert({
         "user_id": user_id,
         "server_id": server_id
-    }).execute()
-    return created.data[0]["id"]
+    }, on_conflict="user_id,server_id").execute()
+    return registered.data[0]["id"]
 
-def update_user(user_id: int, updates: dict) -> dict:
-    result = supabase.table("users").update(updates).eq("id", user_id).execute()
+async def update_user(user_id: int, updates: dict) -> dict:
+    result = await supabase.table("users").update(updates).eq("id", user_id).execute()
+    invalidate_cached_user(user_id=user_id)
     return result.data[0] if result.data else {}
 
 
@@ -94,70 +130,86 @@ def update_user(user_id: int, updates: dict) -> dict:
 # GAME HELPERS
 # -----------------------
 
-def get_or_create_game(bgg_id: int, game_data: dict) -> int:
-    existing = supabase.table("games").select("id").eq("bgg_id", bgg_id).execute()
-    if existing.data:
-        return existing.data[0]["id"]
-    inserted = supabase.table("games").insert({
-        "bgg_id": bgg_id,
-        "name": game_data["name"],
-        "publisher": game_data["publisher"],
-        "designer": game_data["designer"],
-        "min_players": game_data["min_players"],
-        "max_players": game_data["max_players"]
-    }).execute()
-    return inserted.data[0]["id"]
-
-def get_game_by_bgg_id(bgg_id: int):
-    result = supabase.table("games").select("*").eq("bgg_id", bgg_id).execute()
+async def upsert_games(records: Dict[int, dict]) -> List[Dict[str, Any]]:
+    # records maps bgg_id -> parsed BGG thing record (helpers.game_metadata.parse_thing_item).
+    # Merge on bgg_id so the stored rows are returned, and refreshed, whether or not they existed.
+    if not records:
+        return []
+    synced_at = datetime.now(timezone.utc).isoformat()
+    upserted = await supabase.table("games").upsert(
+        [{**record, "bgg_id": bgg_id, "bgg_synced_at": synced_at} for bgg_id, record in records.items()],
+        on_conflict="bgg_id"
+    ).execute()
+    for game in upserted.data:
+        game_index.add(game["id"], game["name"])
+    return upserted.data
+
+async def upsert_game(bgg_id: int, game_data: dict) -> Dict[str, Any]:
+    return (await upsert_games({bgg_id: game_data}))[0]
+
+async def get_or_create_game(bgg_id: int, game_data: dict) -> int:
+    return (await upsert_game(bgg_id, game_data))["id"]
+
+async def get_game_by_bgg_id(bgg_id: int):
+    result = await supabase.table("games").select("*").eq("bgg_id", bgg_id).execute()
     return result.data[0] if result.data else None
 
-def get_games_by_ids(game_ids: List[int]) -> List[Dict[str, Any]]:
+async def get_games_by_ids(game_ids: List[int]) -> List[Dict[str, Any]]:
     if not game_ids:
         return []
-    result = supabase.table("games").select("id, name").in_("id", game_ids).order("name").execute()
+    result = await supabase.table("games").select("id, name").in_("id", game_ids).order("name").execute()
     return result.data
 
-def get_game_by_id(game_id: int) -> Optional[Dict[str, Any]]:
-    result = supabase.table("games").select("*").eq("id", game_id).single().execute()
+async def get_game_by_id(game_id: int) -> Optional[Dict[str, Any]]:
+    result = await supabase.table("games").select("*").eq("id", game_id).single().execute()
     return result.data if result.data else None
 
-def get_all_games() -> List[Dict[str, Any]]:
-    result = supabase.table("games").select("id, name").execute()
+async def get_stale_game_bgg_ids(synced_before: datetime, limit: int) -> List[int]:
+    # Never-synced games first, then oldest sync first
+    result = await supabase.table("games").select("bgg_id") \
+        .not_.is_("bgg_id", "null") \
+        .or_(f'bgg_synced_at.is.null,bgg_synced_at.lt."{synced_before.isoformat()}"') \
+        .order("bgg_synced_at", nullsfirst=True) \
+        .limit(limit) \
+        .execute()
+    return [r["bgg_id"] for r in result.data or []]
+
+async def mark_games_synced(bgg_ids: List[int]):
+    # For ids BGG no longer returns: counts as a sync so the stale scan stops queueing them every pass.
+    if not bgg_ids:
+        return
+    synced_at = datetime.now(timezone.utc).isoformat()
+    await supabase.table("games").update({"bgg_synced_at": synced_at}).in_("bgg_id", bgg_ids).execute()
+
+async def get_all_games() -> List[Dict[str, Any]]:
+    result = await supabase.table("games").select("id, name").execute()
     return result.data or []
 
-def search_games_fuzzy(query: str, limit: int = 10) -> List[Dict[str, Any]]:
-    all_games = supabase.table("games").select("id, name").execute().data
-    scored = [(g, fuzz.partial_ratio(query.lower(), g["name"].lower())) for g in all_games]
-    top_matches = sorted(scored, key=lambda x: x[1], reverse=True)[:limit]
-    return [g for g, _ in top_matches]
+async def get_games_added_after(game_id: int) -> List[Dict[str, Any]]:
+    result = await supabase.table("games").select("id, name").gt("id", game_id).order("id").execute()
+    return result.data or []
 
-def add_or_update_rating(user_id: int, game_id: int, rating: int, expires_at: datetime):
+async def search_games_fuzzy(query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    # Other bot processes (launcher.py) insert games too; their additions show up within GAME_INDEX_MAX_AGE,
+    # and their renames and deletes within GAME_INDEX_RELOAD_AGE.
+    await game_index.ensure_loaded(get_all_games, get_games_added_after, GAME_INDEX_MAX_AGE, GAME_INDEX_RELOAD_AGE)
+    return game_index.search(query, limit)
+
+async def add_or_update_rating(user_id: int, game_id: int, rating: int, expires_at: datetime):
+    # One upsert on (user_id, game_id); created_at is left to the column default so
+    # re-rating keeps the original timestamp.
     payload = {
+        "user_id": user_id,
+        "game_id": game_id,
         "rating": rating,
         "expires_at": expires_at.isoformat()
     }
-
-    # Try to update first
-    result = supabase.table("users_game_ratings") \
-        .update(payload) \
-        .eq("user_id", user_id) \
-        .eq("game_id", game_id) \
+    await supabase.table("users_game_ratings") \
+        .upsert(payload, on_conflict="user_id,game_id") \
         .execute()
 
-    # If no rows updated, insert instead
-    if not result.data:
-        insert_payload = {
-            "user_id": user_id,
-            "game_id": game_id,
-            "rating": rating,
-            "created_at": datetime.utcnow().isoformat(),
-            "expires_at": expires_at.isoformat()
-        }
-        supabase.table("users_game_ratings").insert(insert_payload).execute()
-
-def get_ratings_for_game(game_id: int) -> List[Dict[str, Any]]:
-    result = supabase.table("users_game_ratings").select("rating").eq("game_id", game_id).execute()
+async def get_ratings_for_game(game_id: int) -> List[Dict[str, Any]]:
+    result = await supabase.table("users_game_ratings").select("rating").eq("game_id", game_id).execute()
     return result.data or []
 
 
@@ -167,73 +219,110 @@ def get_ratings_for_game(game_id: int) -> List[Dict[str, Any]]:
 # COLLECTION HELPERS
 # -----------------------
 
-def user_has_game(user_id: int, game_id: int) -> bool:
-    result = supabase.table("users_games").select("*").eq("user_id", user_id).eq("game_id", game_id).execute()
+async def user_has_game(user_id: int, game_id: int) -> bool:
+    result = await supabase.table("users_games").select("*").eq("user_id", user_id).eq("game_id", game_id).execute()
     return bool(result.data)
 
-def link_user_game(user_id: int, game_id: int):
-    if user_has_game(user_id, game_id):
-        return  # Avoid duplicates
-    supabase.table("users_games").insert({
+async def link_user_game(user_id: int, game_id: int) -> bool:
+    # Returns True if the game was added, False if it was already in the collection
+    result = await supabase.table("users_games").upsert({
         "user_id": user_id,
         "game_id": game_id
-    }).execute()
-
-def remove_game_link(user_id: int, game_id: int):
-    supabase.table("users_games").delete().eq("user_id", user_id).eq("game_id", game_id).execute()
-
-def get_owned_game_ids(user_id: int) -> List[int]:
-    result = supabase.table("users_games").select("game_id").eq("user_id", user_id).execute()
-    return [r["game_id"] for r in result.data]
-
-def get_user_games_sorted_by_name(user_id: int) -> List[str]:
-    game_ids = get_owned_game_ids(user_id)
-    if not game_ids:
-        return []
-    result = supabase.table("games").select("name").in_("id", game_ids).order("name").execute()
-    return [g["name"] for g in result.data]
-
-def get_user_games(user_id: int) -> List[Dict[str, Any]]:
-    game_ids = get_owned_game_ids(user_id)
-    if not game_ids:
-        return []
-    result = supabase.table("games").select("id, name").in_("id", game_ids).execute()
-    return result.data
-
-def search_user_games_by_name(user_id: int, query: str) -> List[Dict[str, Any]]:
-    return [g for g in get_user_games(user_id) if query.lower() in g["name"].lower()]
+    }, on_conflict="user_id,game_id", ignore_duplicates=True).execute()
+    return bool(result.data)
 
-def find_users_with_game(game_id: int) -> List[str]:
-    result = supabase.table("users_games").select("user_id").eq("game_id", game_id).execute()
+async def remove_game_link(user_id: int, game_id: int):
+    await supabase.table("users_games").delete().eq("user_id", user_id).eq("game_id", game_id).execute()
+
+def escape_like(text: str) -> str:
+    # Backslash-escape LIKE wildcards so user input only matches literally. PostgREST rewrites
+    # every * in a like pattern to %, escaped or not, so a literal * can't be expressed:
+    # it becomes _ instead and matches any single character, the asterisk included.
+    return re.sub(r"([\\%_])", r"\\\1", text).replace("*", "_")
+
+def _user_games_query(user_id: int, name_query: Optional[str] = None, count: Optional[str] = None):
+    # users_games embeds its game (inner join) ordered by game name, optionally filtered
+    # with a case-insensitive substring match
+    query = supabase.table("users_games").select("games!inner(id, name)", count=count).eq("user_id", user_id)
+    if name_query:
+        query = query.ilike("games.name", f"%{escape_like(name_query)}%")
+    return query.order("games(name)")
+
+async def get_user_games(user_id: int, name_query: Optional[str] = None, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    query = _user_games_query(user_id, name_query)
+    if limit is not None:
+        query = query.range(offset, offset + limit - 1)
+    result = await query.execute()
+    return [r["games"] for r in result.data]
+
+async def get_user_games_page(user_id: int, offset: int, limit: int, count: bool = False) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    # One range of the collection; with count=True the exact total comes back in the same request
+    query = _user_games_query(user_id, count="exact" if count else None).range(offset, offset + limit - 1)
+    result = await query.execute()
+    return [r["games"] for r in result.data], result.count
+
+async def get_user_games_sorted_by_name(user_id: int) -> List[str]:
+    return [g["name"] for g in await get_user_games(user_id)]
+
+async def search_user_games_by_name(user_id: int, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    return await get_user_games(user_id, name_query=query, limit=limit)
+
+async def find_users_with_game(game_id: int) -> List[str]:
+    result = await supabase.table("users_games").select("user_id").eq("game_id", game_id).execute()
     user_ids = [u["user_id"] for u in result.data]
     if not user_ids:
         return []
-    users = supabase.table("users").select("username, nickname").in_("id", user_ids).execute()
+    users = await supabase.table("users").select("username, nickname").in_("id", user_ids).execute()
     return [u["nickname"] or u["username"] for u in users.data]
 
-def get_users_with_game(game_id: int) -> List[int]:
-    result = supabase.table("users_games").select("user_id").eq("game_id", game_id).execute()
+async def get_users_with_game(game_id: int) -> List[int]:
+    result = await supabase.table("users_games").select("user_id").eq("game_id", game_id).execute()
     return [r["user_id"] for r in result.data]
 
-def get_users_by_ids(user_ids: List[int]) -> List[Dict[str, Any]]:
+async def get_users_by_ids(user_ids: List[int]) -> List[Dict[str, Any]]:
     if not user_ids:
         return []
-    result = supabase.table("users").select("username, nickname, id").in_("id", user_ids).execute()
+    result = await supabase.table("users").select("username, nickname, id").in_("id", user_ids).execute()
     return result.data
 
 # -----------------------
 # SESSION HELPERS
 # -----------------------
 
-def create_session_entry(game_id: int, server_id: int, name: Optional[str] = None, date: Optional[str] = None) -> Optional[Dict[str, Any]]:
+async def create_session_entry(game_id: int, server_id: int, name: Optional[str] = None, date: Optional[str] = None) -> Optional[Dict[str, Any]]:
     data = {"game_id": game_id, "server_id": server_id}
     if name: data["name"] = name
     if date: data["date"] = date
-    result = supabase.table("sessions").insert(data).execute()
+    result = await supabase.table("sessions").insert(data).execute()
     return result.data[0] if result.data else None
 
-def get_sessions_for_game(game_id: int, server_id: int) -> List[Dict[str, Any]]:
-    result = (supabase.table("sessions")
+async def get_sessions_page(
+    game_id: int,
+    server_id: int,
+    limit: int,
+    after: Optional[Tuple[Optional[str], int]] = None,
+    count: bool = False
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    # Keyset page of a game's sessions, newest first by (date, id) with undated sessions last.
+    # `after` is the (date, id) of the last session already shown. Winners' names are embedded,
+    # and with count=True the exact total comes back in the same request.
+    query = (supabase.table("sessions")
+             .select("id, date, name, sessions_winners(users(username, nickname))", count="exact" if count else None)
+             .eq("game_id", game_id)
+             .eq("server_id", server_id)
+             .order("date", desc=True, nullsfirst=False)
+             .order("id", desc=True))
+    if after is not None:
+        date, session_id = after
+        if date is None:
+            query = query.is_("date", "null").lt("id", session_id)
+        else:
+            query = query.or_(f'date.lt."{date}",and(date.eq."{date}",id.lt.{session_id}),date.is.null')
+    result = await query.limit(limit).execute()
+    return result.data or [], result.count
+
+async def get_sessions_for_game(game_id: int, server_id: int) -> List[Dict[str, Any]]:
+    result = (await supabase.table("sessions")
               .select("*")
               .eq("game_id", game_id)
               .eq("server_id", server_id)
@@ -242,36 +331,65 @@ def get_sessions_for_game(game_id: int, server_id: int) -> List[Dict[str, Any]]:
     )
     return result.data or []
 
-def link_user_to_session(session_id: int, user_id: int):
-    # Prevent duplicates
-    existing = supabase.table("sessions_users").select("*").eq("session_id", session_id).eq("user_id", user_id).execute()
-    if existing.data:
-        return
-    supabase.table("sessions_users").insert({
-        "session_id": session_id,
-        "user_id": user_id
-    }).execute()
-
-def get_users_in_session(session_id: int) -> List[Dict[str, Any]]:
-    result = supabase.table("sessions_users").select("user_id").eq("session_id", session_id).execute()
+async def _link_users(table: str, session_id: int, user_ids: List[int]) -> Dict[int, bool]:
+    # One upsert that ignores existing (session_id, user_id) rows (migrations/004_session_link_constraints.sql).
+    # Only newly inserted rows come back, which tells us who was added and who was skipped.
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return {}
+    result = await supabase.table(table).upsert(
+        [{"session_id": session_id, "user_id": user_id} for user_id in user_ids],
+        on_conflict="session_id,user_id",
+        ignore_duplicates=True
+    ).execute()
+    added = {r["user_id"] for r in result.data or []}
+    return {user_id: user_id in added for user_id in user_ids}
+
+async def link_users_to_session(session_id: int, user_ids: List[int]) -> Dict[int, bool]:
+    return await _link_users("sessions_users", session_id, user_ids)
+
+async def link_winners_to_session(session_id: int, user_ids: List[int]) -> Dict[int, bool]:
+    return await _link_users("sessions_winners", session_id, user_ids)
+
+async def link_user_to_session(session_id: int, user_id: int):
+    await link_users_to_session(session_id, [user_id])
+
+async def get_users_in_session(session_id: int) -> List[Dict[str, Any]]:
+    result = await supabase.table("sessions_users").select("user_id").eq("session_id", session_id).execute()
     return result.data or []
 
-def link_winner_to_session(session_id: int, user_id: int):
-    # Assuming 'supabase' is a pre-configured Supabase client
-    supabase.from_("sessions_winners").insert({"session_id": session_id, "user_id": user_id}).execute()
+async def link_winner_to_session(session_id: int, user_id: int):
+    await link_winners_to_session(session_id, [user_id])
 
-def get_session_by_id(session_id: int):
-    result = supabase.from_("sessions").select("*").eq("id", session_id).single().execute()
+async def get_session_by_id(session_id: int):
+    result = await supabase.from_("sessions").select("*").eq("id", session_id).single().execute()
     return result.data or []
 
-def get_winners_in_session(session_id: int) -> List[int]:
-    result = supabase.table("sessions_winners").select("user_id").eq("session_id", session_id).execute()
+async def get_winners_in_session(session_id: int) -> List[int]:
+    result = await supabase.table("sessions_winners").select("user_id").eq("session_id", session_id).execute()
     return [r["user_id"] for r in result.data] if result.data else []
 
-def delete_session_by_id(session_id: int) -> None:
-    # Delete any user links or winner links first if you have foreign key constraints
-    supabase.table("sessions_users").delete().eq("session_id", session_id).execute()
-    supabase.table("sessions_winners").delete().eq("session_id", session_id).execute()
-    
-    # Now delete the session itself
-    supabase.table("sessions").delete().eq("id", session_id).execute()
\ No newline at end of file
+async def get_user_stats(user_id: int, server_id: int) -> Dict[str, Any]:
+    # Sessions played, wins and most played game, aggregated server-side (migrations/001_get_user_stats.sql)
+    result = await supabase.rpc("get_user_stats", {"p_user_id": user_id, "p_server_id": server_id}).execute()
+    return result.data[0] if result.data else {"sessions_played": 0, "wins": 0, "most_played_name": None, "most_played_count": 0}
+
+async def get_game_stats(game_id: int, server_id: int) -> Dict[str, Any]:
+    # Play count, rating average/count and per-user win counts in one call (migrations/002_get_game_stats.sql)
+    result = await supabase.rpc("get_game_stats", {"p_game_id": game_id, "p_server_id": server_id}).execute()
+    return result.data[0] if result.data else {"total_plays": 0, "rating_avg": None, "rating_count": 0, "win_counts": []}
+
+async def delete_session_by_id(session_id: int) -> None:
+    await delete_sessions_by_ids([session_id])
+
+async def delete_sessions_by_ids(session_ids: List[int]) -> List[int]:
+    # Links and sessions are removed in one transactional RPC (migrations/003_delete_sessions.sql)
+    if not session_ids:
+        return []
+    result = await supabase.rpc("delete_sessions", {"p_session_ids": session_ids}).execute()
+    return result.data or []
+
+
+# Time every public helper above as a Supabase dependency call (see helpers/metrics.py)
+# and count the round-trips each interaction makes (see helpers/query_tracker.py).
+instrument_module(globals(), "supabase")
@@ -0,0 +1,70 @@
+"""Run the bot's shards across several processes.
+
+    python launcher.py --shard-count 8 --processes 2     # shards 0-3 and 4-7
+
+Each child runs `bot.py --shard-count N --shard-ids ...`. Only the process owning shard 0 syncs
+commands and runs the BGG prefetch worker. Each child's game-name index picks up games the
+others insert within GAME_INDEX_MAX_AGE seconds. With METRICS_PORT set, child i serves metrics on
+METRICS_PORT + i. If any child exits, or on Ctrl-C, the rest are stopped so a supervisor
+(e.g. the systemd unit in the readme) can restart the whole group.
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BOT_PATH = Path(__file__).resolve().parent / "bot.py"
+
+
+def shard_ranges(shard_count: int, processes: int) -> list[list[int]]:
+    """Split shards 0..shard_count-1 into `processes` contiguous, near-equal ranges."""
+    processes = max(1, min(processes, shard_count))
+    size, extra = divmod(shard_count, processes)
+    ranges, start = [], 0
+    for i in range(processes):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def child_env(index: int) -> dict:
+    env = dict(os.environ)
+    if env.get("METRICS_PORT"):
+        env["METRICS_PORT"] = str(int(env["METRICS_PORT"]) + index)
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shard-count", type=int, required=True, help="total number of shards")
+    parser.add_argument("--processes", type=int, default=1, help="number of bot processes to spread the shards over")
+    args = parser.parse_args()
+
+    children = []
+    for index, shard_ids in enumerate(shard_ranges(args.shard_count, args.processes)):
+        command = [sys.executable, str(BOT_PATH), "--shard-count", str(args.shard_count), "--shard-ids", *map(str, shard_ids)]
+        print(f"Starting shards {shard_ids[0]}-{shard_ids[-1]} of {args.shard_count}")
+        children.append(subprocess.Popen(command, env=child_env(index)))
+
+    try:
+        while all(child.poll() is None for child in children):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for child in children:
+            if child.poll() is None:
+                child.send_signal(signal.SIGINT)
+        for child in children:
+            child.wait()
+
+    sys.exit(max(child.returncode or 0 for child in children))
+
+
+if __name__ == "__main__":
+    main()
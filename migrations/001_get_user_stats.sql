@@ -0,0 +1,42 @@
+-- /user_stats aggregates for one user on one server in a single round-trip.
+-- Replaces the per-game and per-session query fan-out in commands/user_stats.py.
+create or replace function get_user_stats(p_user_id bigint, p_server_id bigint)
+returns table (
+    sessions_played bigint,
+    wins bigint,
+    most_played_name text,
+    most_played_count bigint
+)
+language sql
+stable
+as $$
+    with played as (
+        select distinct s.id, s.game_id
+        from sessions s
+        join games g on g.id = s.game_id
+        join sessions_users su on su.session_id = s.id
+        where s.server_id = p_server_id
+          and su.user_id = p_user_id
+    ),
+    won as (
+        select distinct s.id
+        from sessions s
+        join games g on g.id = s.game_id
+        join sessions_winners sw on sw.session_id = s.id
+        where s.server_id = p_server_id
+          and sw.user_id = p_user_id
+    ),
+    most_played as (
+        select g.name, count(*) as plays
+        from played p
+        join games g on g.id = p.game_id
+        group by g.id, g.name
+        order by plays desc, g.name
+        limit 1
+    )
+    select
+        (select count(*) from played) as sessions_played,
+        (select count(*) from won) as wins,
+        (select name from most_played) as most_played_name,
+        coalesce((select plays from most_played), 0) as most_played_count
+$$;
@@ -0,0 +1,41 @@
+-- /game_stats aggregates for one game on one server in a single round-trip.
+-- Replaces one sessions_winners query per session in commands/game_stats.py.
+-- Ratings are not server-scoped, matching get_ratings_for_game.
+create or replace function get_game_stats(p_game_id bigint, p_server_id bigint)
+returns table (
+    total_plays bigint,
+    rating_avg numeric,
+    rating_count bigint,
+    win_counts jsonb
+)
+language sql
+stable
+as $$
+    with game_sessions as (
+        select s.id
+        from sessions s
+        where s.game_id = p_game_id
+          and s.server_id = p_server_id
+    ),
+    wins as (
+        select sw.user_id, count(*) as wins
+        from sessions_winners sw
+        join game_sessions gs on gs.id = sw.session_id
+        group by sw.user_id
+    )
+    select
+        (select count(*) from game_sessions) as total_plays,
+        (select avg(r.rating) from users_game_ratings r where r.game_id = p_game_id) as rating_avg,
+        (select count(*) from users_game_ratings r where r.game_id = p_game_id) as rating_count,
+        coalesce(
+            (
+                select jsonb_agg(
+                    jsonb_build_object('user_id', w.user_id, 'username', u.username, 'nickname', u.nickname, 'wins', w.wins)
+                    order by w.wins desc, w.user_id
+                )
+                from wins w
+                left join users u on u.id = w.user_id
+            ),
+            '[]'::jsonb
+        ) as win_counts
+$$;
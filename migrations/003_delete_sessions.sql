@@ -0,0 +1,12 @@
+-- Delete sessions together with their player and winner links in one call.
+-- The function body runs in a single transaction, so a failure leaves nothing half-deleted.
+-- Returns the ids of the sessions that were actually deleted.
+create or replace function delete_sessions(p_session_ids bigint[])
+returns setof bigint
+language sql
+volatile
+as $$
+    delete from sessions_users where session_id = any(p_session_ids);
+    delete from sessions_winners where session_id = any(p_session_ids);
+    delete from sessions where id = any(p_session_ids) returning id;
+$$;
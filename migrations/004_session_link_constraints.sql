@@ -0,0 +1,19 @@
+-- One row per (session, user) in the player and winner link tables, so bulk links can
+-- upsert with on-conflict-ignore instead of checking for existing rows first.
+delete from sessions_users a
+using sessions_users b
+where a.id > b.id
+  and a.session_id = b.session_id
+  and a.user_id = b.user_id;
+
+alter table sessions_users
+    add constraint sessions_users_session_id_user_id_key unique (session_id, user_id);
+
+delete from sessions_winners a
+using sessions_winners b
+where a.id > b.id
+  and a.session_id = b.session_id
+  and a.user_id = b.user_id;
+
+alter table sessions_winners
+    add constraint sessions_winners_session_id_user_id_key unique (session_id, user_id);
@@ -0,0 +1,92 @@
+-- Unique keys backing the single-statement upserts in helpers/supa_helpers.py.
+-- Duplicates created by the old check-then-insert races are removed first, keeping the oldest row.
+
+-- Duplicate games (same bgg_id) and users (same discord_id) are merged into the oldest row:
+-- every reference is repointed to it before the extra rows are deleted. Link rows that become
+-- duplicates are removed below (ratings, collections, servers) or here (sessions, which are
+-- already unique per 004).
+create temporary table game_merge as
+select id as old_id, min(id) over (partition by bgg_id) as new_id
+from games
+where bgg_id is not null;
+delete from game_merge where old_id = new_id;
+
+update users_games t set game_id = m.new_id from game_merge m where t.game_id = m.old_id;
+update users_game_ratings t set game_id = m.new_id from game_merge m where t.game_id = m.old_id;
+update sessions t set game_id = m.new_id from game_merge m where t.game_id = m.old_id;
+delete from games g using game_merge m where g.id = m.old_id;
+drop table game_merge;
+
+create temporary table user_merge as
+select id as old_id, min(id) over (partition by discord_id) as new_id
+from users
+where discord_id is not null;
+delete from user_merge where old_id = new_id;
+
+-- A session may list both copies of a user; keep the row for the surviving id (or the lowest copy).
+delete from sessions_users a
+using user_merge m
+where a.user_id = m.old_id
+  and exists (
+      select 1
+      from sessions_users b
+      left join user_merge mb on mb.old_id = b.user_id
+      where b.session_id = a.session_id
+        and coalesce(mb.new_id, b.user_id) = m.new_id
+        and (b.user_id = m.new_id or b.user_id < a.user_id)
+  );
+
+delete from sessions_winners a
+using user_merge m
+where a.user_id = m.old_id
+  and exists (
+      select 1
+      from sessions_winners b
+      left join user_merge mb on mb.old_id = b.user_id
+      where b.session_id = a.session_id
+        and coalesce(mb.new_id, b.user_id) = m.new_id
+        and (b.user_id = m.new_id or b.user_id < a.user_id)
+  );
+
+update sessions_users t set user_id = m.new_id from user_merge m where t.user_id = m.old_id;
+update sessions_winners t set user_id = m.new_id from user_merge m where t.user_id = m.old_id;
+update users_servers t set user_id = m.new_id from user_merge m where t.user_id = m.old_id;
+update users_games t set user_id = m.new_id from user_merge m where t.user_id = m.old_id;
+update users_game_ratings t set user_id = m.new_id from user_merge m where t.user_id = m.old_id;
+delete from users u using user_merge m where u.id = m.old_id;
+drop table user_merge;
+
+delete from users_game_ratings a
+using users_game_ratings b
+where a.id > b.id
+  and a.user_id = b.user_id
+  and a.game_id = b.game_id;
+
+alter table users_game_ratings
+    add constraint users_game_ratings_user_id_game_id_key unique (user_id, game_id);
+
+alter table users_game_ratings
+    alter column created_at set default now();
+
+delete from users_games a
+using users_games b
+where a.id > b.id
+  and a.user_id = b.user_id
+  and a.game_id = b.game_id;
+
+alter table users_games
+    add constraint users_games_user_id_game_id_key unique (user_id, game_id);
+
+delete from users_servers a
+using users_servers b
+where a.id > b.id
+  and a.user_id = b.user_id
+  and a.server_id = b.server_id;
+
+alter table users_servers
+    add constraint users_servers_user_id_server_id_key unique (user_id, server_id);
+
+-- games.bgg_id and users.discord_id may already be unique; an index is enough for on_conflict.
+-- The duplicates were merged at the top of this migration.
+create unique index if not exists games_bgg_id_key on games (bgg_id);
+create unique index if not exists users_discord_id_key on users (discord_id);
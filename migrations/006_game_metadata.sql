@@ -0,0 +1,14 @@
+-- Full BGG thing record kept on games so /game_info and /add_game can render without BGG.
+-- bgg_synced_at is null for rows written before this migration; they are refetched on first use.
+alter table games
+    add column if not exists year_published integer,
+    add column if not exists playing_time integer,
+    add column if not exists image_url text,
+    add column if not exists thumbnail_url text,
+    add column if not exists designers text[] not null default '{}',
+    add column if not exists publishers text[] not null default '{}',
+    add column if not exists rating_avg numeric,
+    add column if not exists rating_count integer,
+    add column if not exists weight numeric,
+    add column if not exists bgg_rank integer,
+    add column if not exists bgg_synced_at timestamptz;
@@ -0,0 +1,3 @@
+-- Serves the /list_sessions keyset pages (helpers/supa_helpers.get_sessions_page) straight from the index.
+create index if not exists sessions_game_server_date_id_idx
+    on sessions (game_id, server_id, date desc nulls last, id desc);
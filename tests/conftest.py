@@ -0,0 +1,29 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+from helpers import query_tracker, supa_helpers
+from tests.fake_postgrest import FakePostgREST
+
+
+@pytest_asyncio.fixture
+async def fake_db():
+    """A FakePostgREST server with helpers.supa_helpers pointed at it."""
+    fake = FakePostgREST()
+    await fake.start()
+    client = fake.client()
+    with patch("helpers.supa_helpers.supabase", client):
+        yield fake
+    await client.postgrest.aclose()
+    await fake.close()
+
+
+@pytest.fixture
+def query_counter(fake_db):
+    """Counts PostgREST round-trips made against fake_db, per helper.
+
+        with query_counter("page flip") as log:
+            await view.next_page(interaction)
+        assert log.count <= 1
+    """
+    query_tracker.install(supa_helpers.supabase)
+    return query_tracker.track_queries
@@ -0,0 +1,577 @@
+"""Local PostgREST stand-in backed by sqlite.
+
+Speaks the subset of the PostgREST HTTP protocol that helpers/supa_helpers.py uses
+(filters, embedded resources, ordering, ranges, counts, upserts, single-object responses
+and RPC), so the real supabase AsyncClient can be pointed at it. RPC functions are read
+from migrations/*.sql and run inside one sqlite transaction per call.
+
+    fake = FakePostgREST()
+    await fake.start()
+    client = fake.client()          # supabase AsyncClient aimed at the fake
+    ...
+    await fake.close()
+"""
+
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from aiohttp import web
+from supabase import AsyncClient, AsyncClientOptions
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+SCHEMA = """
+create table users (
+    id integer primary key autoincrement,
+    discord_id integer unique,
+    username text,
+    nickname text default ''
+);
+create table users_servers (
+    id integer primary key autoincrement,
+    user_id integer not null references users(id),
+    server_id integer not null,
+    unique (user_id, server_id)
+);
+create table games (
+    id integer primary key autoincrement,
+    bgg_id integer unique,
+    name text not null,
+    publisher text,
+    designer text,
+    min_players integer,
+    max_players integer,
+    year_published integer,
+    playing_time integer,
+    image_url text,
+    thumbnail_url text,
+    designers json default '[]',
+    publishers json default '[]',
+    rating_avg real,
+    rating_count integer,
+    weight real,
+    bgg_rank integer,
+    bgg_synced_at text
+);
+create table users_games (
+    id integer primary key autoincrement,
+    user_id integer not null references users(id),
+    game_id integer not null references games(id),
+    unique (user_id, game_id)
+);
+create table users_game_ratings (
+    id integer primary key autoincrement,
+    user_id integer not null references users(id),
+    game_id integer not null references games(id),
+    rating integer,
+    created_at text default current_timestamp,
+    expires_at text,
+    unique (user_id, game_id)
+);
+create table sessions (
+    id integer primary key autoincrement,
+    game_id integer not null references games(id),
+    server_id integer not null,
+    name text,
+    date text default current_timestamp
+);
+create table sessions_users (
+    id integer primary key autoincrement,
+    session_id integer not null references sessions(id),
+    user_id integer not null references users(id),
+    unique (session_id, user_id)
+);
+create table sessions_winners (
+    id integer primary key autoincrement,
+    session_id integer not null references sessions(id),
+    user_id integer not null references users(id),
+    unique (session_id, user_id)
+);
+"""
+
+RESERVED_PARAMS = {"select", "limit", "offset", "on_conflict", "columns"}
+SINGLE_OBJECT = "application/vnd.pgrst.object+json"
+
+
+class FakePostgRESTError(Exception):
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+def split_top_level(text: str, sep: str = ",") -> List[str]:
+    parts, depth, current, quoted = [], 0, "", False
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == sep and depth == 0 and not quoted:
+            parts.append(current)
+            current = ""
+        else:
+            current += ch
+    if current:
+        parts.append(current)
+    return parts
+
+
+def singular(table: str) -> str:
+    return table[:-1] if table.endswith("s") else table
+
+
+def coerce(raw: str, like: Any) -> Any:
+    raw = raw.strip('"')
+    if isinstance(like, bool):
+        return raw.lower() in ("true", "t", "1")
+    if isinstance(like, int):
+        try:
+            return int(raw)
+        except ValueError:
+            return float(raw)
+    if isinstance(like, float):
+        return float(raw)
+    return raw
+
+
+def like_pattern(raw: str) -> str:
+    # PostgREST turns every * into % before Postgres sees the pattern (so \* is an escaped %),
+    # then % matches any run, _ matches one character and backslash escapes the next character
+    pattern, escaped = "", False
+    for ch in raw.replace("*", "%"):
+        if escaped:
+            pattern += re.escape(ch)
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch == "%":
+            pattern += ".*"
+        elif ch == "_":
+            pattern += "."
+        else:
+            pattern += re.escape(ch)
+    return f"^{pattern}$"
+
+
+def compare(value: Any, op: str, raw: str) -> bool:
+    if op == "is":
+        if raw == "null":
+            return value is None
+        return bool(value) == (raw == "true")
+    if value is None:
+        return False
+    if op == "in":
+        return value in [coerce(v, value) for v in split_top_level(raw[1:-1])]
+    if op in ("like", "ilike"):
+        return re.match(like_pattern(raw), str(value), re.S | (re.I if op == "ilike" else 0)) is not None
+    other = coerce(raw, value)
+    return {
+        "eq": value == other,
+        "neq": value != other,
+        "gt": value > other,
+        "gte": value >= other,
+        "lt": value < other,
+        "lte": value <= other,
+    }[op]
+
+
+def column_filter(column: str, expression: str) -> Callable[[dict], bool]:
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, raw = expression.partition(".")
+    return lambda row: compare(row.get(column), op, raw) != negate
+
+
+def logic_filter(kind: str, expression: str) -> Callable[[dict], bool]:
+    # expression is the "(a.eq.1,and(b.gt.2,c.lt.3))" part of or=/and=
+    predicates = []
+    for part in split_top_level(expression.strip()[1:-1]):
+        match = re.match(r"^(not\.)?(and|or)(\(.*\))$", part)
+        if match:
+            inner = logic_filter(match.group(2), match.group(3))
+            predicates.append((lambda p: lambda row: not p(row))(inner) if match.group(1) else inner)
+        else:
+            column, _, rest = part.partition(".")
+            predicates.append(column_filter(column, rest))
+    combine = any if kind == "or" else all
+    return lambda row: combine(p(row) for p in predicates)
+
+
+def sort_rows(items: List[tuple], order: List[tuple]) -> List[tuple]:
+    # items are (row, embedded) pairs; order entries are ((embed or None, column), desc, nulls_first)
+    for (rel, column), desc, nulls_first in reversed(order):
+        def value_of(item, rel=rel, column=column):
+            source = (item[1].get(rel) or {}) if rel else item[0]
+            return source.get(column)
+        present = sorted((i for i in items if value_of(i) is not None), key=value_of, reverse=desc)
+        missing = [i for i in items if value_of(i) is None]
+        items = missing + present if nulls_first else present + missing
+    return items
+
+
+class Query:
+    """Filters, embeds and modifiers for one resource, parsed from the query string."""
+
+    def __init__(self, select: str = "*"):
+        self.columns: List[tuple] = []
+        self.embeds: Dict[str, dict] = {}
+        self.filters: List[Callable[[dict], bool]] = []
+        self.order: List[tuple] = []
+        for item in split_top_level(select or "*"):
+            match = re.match(r"^(?:(\w+):)?(\w+)(!inner|!left|!\w+)?\((.*)\)$", item)
+            if match:
+                alias, rel, hint, sub = match.groups()
+                self.embeds[rel] = {"alias": alias or rel, "inner": hint == "!inner", "query": Query(sub)}
+            else:
+                alias, _, column = item.rpartition(":")
+                self.columns.append((alias or column, column))
+
+    def resolve(self, path: List[str]) -> "Query":
+        query = self
+        for rel in path:
+            query = query.embeds[rel]["query"]
+        return query
+
+    def add_param(self, key: str, value: str):
+        # "users_servers.server_id=eq.1" targets the embedded resource, "server_id=eq.1" this one.
+        *path, name = key.split(".")
+        try:
+            target = self.resolve(path)
+        except KeyError:
+            raise FakePostgRESTError(400, "PGRST108", f"'{path[0]}' is not an embedded resource in this request")
+        if name in ("or", "and"):
+            target.filters.append(logic_filter(name, value))
+        elif name == "order":
+            target.order = [self.parse_order(part) for part in value.split(",")]
+        else:
+            target.filters.append(column_filter(name, value))
+
+    @staticmethod
+    def parse_order(part: str) -> tuple:
+        pieces = part.split(".")
+        column = pieces[0]
+        desc = "desc" in pieces[1:]
+        nulls_first = "nullsfirst" in pieces[1:] or ("nullslast" not in pieces[1:] and desc)
+        embed = re.match(r"^(\w+)\((\w+)\)$", column)
+        return (embed.groups() if embed else (None, column), desc, nulls_first)
+
+
+class FakePostgREST:
+    def __init__(self, schema: str = SCHEMA, migrations_dir: Path = MIGRATIONS_DIR):
+        self.db = sqlite3.connect(":memory:", isolation_level=None, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(schema)
+        # Columns declared `json` stand in for Postgres arrays/jsonb and are decoded on the way out.
+        self.json_columns = {
+            r["name"]
+            for (table,) in self.db.execute("select name from sqlite_master where type = 'table'").fetchall()
+            for r in self.db.execute(f"pragma table_info({table})").fetchall()
+            if r["type"].lower() == "json"
+        }
+        self.functions: Dict[str, dict] = {}
+        self.rpc_overrides: Dict[str, Callable[[sqlite3.Connection, dict], Any]] = {}
+        self.requests: List[tuple] = []
+        for path in sorted(migrations_dir.glob("*.sql")):
+            self.load_migration(path.read_text())
+        self.url: Optional[str] = None
+        self._runner: Optional[web.AppRunner] = None
+
+    # -----------------------
+    # LIFECYCLE
+    # -----------------------
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/rest/v1/rpc/{function}", self.handle_rpc)
+        app.router.add_route("*", "/rest/v1/{table}", self.handle_table)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.url = f"http://{bound_host}:{bound_port}"
+        return self.url
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def client(self) -> AsyncClient:
+        return AsyncClient(self.url, "fake-postgrest-key", options=AsyncClientOptions(schema="public"))
+
+    # -----------------------
+    # DATA ACCESS FOR TESTS
+    # -----------------------
+
+    def execute(self, sql: str, *args) -> List[dict]:
+        return [self.from_sql(r) for r in self.db.execute(sql, args).fetchall()]
+
+    def seed(self, table: str, rows: List[dict]):
+        if not rows:
+            return
+        columns = list(rows[0])
+        self.db.execute("begin")
+        self.db.executemany(
+            f"insert into {table} ({', '.join(columns)}) values ({', '.join('?' for _ in columns)})",
+            [tuple(self.to_sql(r[c]) for c in columns) for r in rows],
+        )
+        self.db.execute("commit")
+
+    def rows(self, table: str) -> List[dict]:
+        return self.execute(f"select * from {table} order by id")
+
+    def table_columns(self, table: str) -> List[str]:
+        return [r["name"] for r in self.db.execute(f"pragma table_info({table})").fetchall()]
+
+    # -----------------------
+    # READS
+    # -----------------------
+
+    def select(self, table: str, query: Query, cache: dict, rows: Optional[List[dict]] = None) -> List[dict]:
+        results = []
+        for row in self.table_rows(table, cache) if rows is None else rows:
+            if not all(f(row) for f in query.filters):
+                continue
+            embedded = {}
+            for rel, spec in query.embeds.items():
+                embedded[rel] = self.embed(table, row, rel, spec["query"], cache)
+                if spec["inner"] and not embedded[rel]:
+                    break
+            else:
+                results.append((row, embedded))
+        return [self.project(row, embedded, query) for row, embedded in sort_rows(results, query.order)]
+
+    def embed(self, table: str, row: dict, rel: str, query: Query, cache: dict):
+        foreign_key = f"{singular(rel)}_id"
+        if foreign_key in self.table_columns(table):
+            # many-to-one, e.g. users_servers -> users
+            matches = self.select(rel, query, cache, self.index(rel, "id", cache).get(row[foreign_key], []))
+            return matches[0] if matches else None
+        back_key = f"{singular(table)}_id"
+        if back_key in self.table_columns(rel):
+            # one-to-many, e.g. users -> users_servers
+            return self.select(rel, query, cache, self.index(rel, back_key, cache).get(row["id"], []))
+        raise FakePostgRESTError(400, "PGRST200", f"Could not find a relationship between '{table}' and '{rel}'")
+
+    def project(self, row: dict, embedded: dict, query: Query) -> dict:
+        out = {}
+        for alias, column in query.columns:
+            if column == "*":
+                out.update(row)
+            else:
+                out[alias] = row.get(column)
+        for rel, spec in query.embeds.items():
+            if rel in embedded:
+                out[spec["alias"]] = embedded[rel]
+        return out
+
+    def table_rows(self, table: str, cache: dict) -> List[dict]:
+        if table not in cache:
+            try:
+                cache[table] = self.execute(f"select * from {table} order by id")
+            except sqlite3.OperationalError as e:
+                raise FakePostgRESTError(404, "42P01", str(e))
+        return cache[table]
+
+    def index(self, table: str, column: str, cache: dict) -> Dict[Any, List[dict]]:
+        key = (table, column)
+        if key not in cache:
+            grouped: Dict[Any, List[dict]] = {}
+            for row in self.table_rows(table, cache):
+                grouped.setdefault(row.get(column), []).append(row)
+            cache[key] = grouped
+        return cache[key]
+
+    # -----------------------
+    # HTTP HANDLERS
+    # -----------------------
+
+    def parse_query(self, request: web.Request) -> Query:
+        query = Query(request.query.get("select", "*"))
+        for key, value in request.query.items():
+            if key in RESERVED_PARAMS:
+                continue
+            query.add_param(key, value)
+        return query
+
+    def respond(self, request: web.Request, rows: List[dict], status: int = 200, total: Optional[int] = None, offset: int = 0) -> web.Response:
+        prefer = request.headers.get("Prefer", "")
+        headers = {}
+        if "count=" in prefer:
+            count = total if total is not None else len(rows)
+            headers["Content-Range"] = f"{offset}-{offset + len(rows) - 1}/{count}" if rows else f"*/{count}"
+        if request.method in ("POST", "PATCH", "DELETE") and "return=representation" not in prefer:
+            return web.Response(status=201 if request.method == "POST" else 204, headers=headers)
+        if SINGLE_OBJECT in request.headers.get("Accept", ""):
+            if len(rows) != 1:
+                return self.error(406, "PGRST116", "JSON object requested, multiple (or no) rows returned", f"The result contains {len(rows)} rows")
+            return web.json_response(rows[0], status=status, headers=headers)
+        if request.method == "HEAD":
+            return web.Response(status=status, headers=headers)
+        return web.json_response(rows, status=status, headers=headers)
+
+    @staticmethod
+    def error(status: int, code: str, message: str, details: Optional[str] = None) -> web.Response:
+        return web.json_response({"code": code, "message": message, "details": details, "hint": None}, status=status)
+
+    async def handle_table(self, request: web.Request) -> web.Response:
+        table = request.match_info["table"]
+        self.requests.append((request.method, table, request.query_string))
+        try:
+            if request.method in ("GET", "HEAD"):
+                return self.handle_select(request, table)
+            if request.method == "POST":
+                return self.handle_insert(request, table, await request.json())
+            if request.method == "PATCH":
+                return self.handle_update(request, table, await request.json())
+            if request.method == "DELETE":
+                return self.handle_delete(request, table)
+        except FakePostgRESTError as e:
+            return self.error(e.status, e.code, e.message)
+        except sqlite3.IntegrityError as e:
+            return self.error(409, "23505", str(e))
+        except sqlite3.Error as e:
+            return self.error(400, "42000", str(e))
+        return self.error(405, "PGRST000", f"Unsupported method {request.method}")
+
+    def handle_select(self, request: web.Request, table: str) -> web.Response:
+        rows = self.select(table, self.parse_query(request), {})
+        total = len(rows)
+        offset = int(request.query.get("offset", 0))
+        limit = request.query.get("limit")
+        rows = rows[offset:offset + int(limit)] if limit is not None else rows[offset:]
+        return self.respond(request, rows, total=total, offset=offset)
+
+    def handle_insert(self, request: web.Request, table: str, body) -> web.Response:
+        records = body if isinstance(body, list) else [body]
+        prefer = request.headers.get("Prefer", "")
+        columns = list(dict.fromkeys(c for r in records for c in r))
+        conflict = ""
+        if "resolution=" in prefer:
+            targets = request.query.get("on_conflict", "id")
+            # Like PostgREST, merge-duplicates sets every payload column, so the row is returned
+            # even when the payload only holds the conflict columns.
+            updates = [c for c in columns if c not in targets.split(",")] or columns
+            if "ignore-duplicates" in prefer:
+                conflict = f" on conflict ({targets}) do nothing"
+            else:
+                conflict = f" on conflict ({targets}) do update set " + ", ".join(f"{c} = excluded.{c}" for c in updates)
+        sql = f"insert into {table} ({', '.join(columns)}) values ({', '.join('?' for _ in columns)}){conflict} returning *"
+        inserted = []
+        self.db.execute("begin")
+        try:
+            for record in records:
+                inserted += [self.from_sql(r) for r in self.db.execute(sql, [self.to_sql(record.get(c)) for c in columns]).fetchall()]
+            self.db.execute("commit")
+        except Exception:
+            self.db.execute("rollback")
+            raise
+        query = Query(request.query.get("select", "*"))
+        return self.respond(request, [self.project(r, {}, query) for r in inserted], status=201)
+
+    def matching_ids(self, request: web.Request, table: str) -> List[int]:
+        query = self.parse_query(request)
+        return [r["id"] for r in self.table_rows(table, {}) if all(f(r) for f in query.filters)]
+
+    def handle_update(self, request: web.Request, table: str, body: dict) -> web.Response:
+        ids = self.matching_ids(request, table)
+        if not ids or not body:
+            return self.respond(request, [])
+        assignments = ", ".join(f"{c} = ?" for c in body)
+        sql = f"update {table} set {assignments} where id in ({', '.join('?' for _ in ids)}) returning *"
+        updated = [self.from_sql(r) for r in self.db.execute(sql, [self.to_sql(v) for v in body.values()] + ids).fetchall()]
+        return self.respond(request, updated)
+
+    def handle_delete(self, request: web.Request, table: str) -> web.Response:
+        ids = self.matching_ids(request, table)
+        if not ids:
+            return self.respond(request, [])
+        sql = f"delete from {table} where id in ({', '.join('?' for _ in ids)}) returning *"
+        deleted = [self.from_sql(r) for r in self.db.execute(sql, ids).fetchall()]
+        return self.respond(request, deleted)
+
+    @staticmethod
+    def to_sql(value: Any) -> Any:
+        return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+    def from_sql(self, row: sqlite3.Row) -> dict:
+        out = dict(row)
+        for column in self.json_columns.intersection(out):
+            if isinstance(out[column], str):
+                out[column] = json.loads(out[column])
+        return out
+
+    # -----------------------
+    # RPC
+    # -----------------------
+
+    def load_migration(self, sql: str):
+        pattern = re.compile(
+            r"create\s+or\s+replace\s+function\s+(\w+)\s*\((.*?)\)\s*returns\s+(.*?)\s+language\s+(\w+).*?\$\$(.*?)\$\$",
+            re.S | re.I,
+        )
+        for name, params, returns, language, body in pattern.findall(sql):
+            args = []
+            for param in filter(None, (p.strip() for p in params.split(","))):
+                arg_name, _, arg_type = param.partition(" ")
+                args.append((arg_name, arg_type.strip().endswith("[]")))
+            self.functions[name] = {"args": args, "returns": " ".join(returns.split()), "language": language, "body": body}
+
+    def translate(self, function: dict) -> List[str]:
+        sql = function["body"]
+        for name, is_array in function["args"]:
+            if is_array:
+                sql = re.sub(rf"=\s*any\s*\(\s*{name}\s*\)", f"in (select value from json_each({name}))", sql)
+            sql = re.sub(rf"(?<![:\w]){name}\b", f":{name}", sql)
+        sql = re.sub(r"::\w+(\[\])?", "", sql)
+        sql = re.sub(r"\bnow\(\)", "current_timestamp", sql)
+        return [s.strip() for s in split_top_level(sql, ";") if s.strip()]
+
+    def call_function(self, name: str, args: dict) -> Any:
+        if name in self.rpc_overrides:
+            return self.rpc_overrides[name](self.db, args)
+        if name not in self.functions:
+            raise FakePostgRESTError(404, "PGRST202", f"Could not find the function public.{name}")
+        function = self.functions[name]
+        params = {arg: self.to_sql(args.get(arg)) for arg, _ in function["args"]}
+        self.db.execute("begin")
+        try:
+            rows: List[sqlite3.Row] = []
+            for statement in self.translate(function):
+                rows = self.db.execute(statement, params).fetchall()
+            self.db.execute("commit")
+        except Exception:
+            self.db.execute("rollback")
+            raise
+        returns = function["returns"].lower()
+        if returns == "void":
+            return None
+        if returns.startswith("table") or returns.startswith("setof record"):
+            return [dict(r) for r in rows]
+        if returns.startswith("setof "):
+            target = returns.split()[1]
+            if target in {r["name"] for r in self.execute("select name from sqlite_master where type = 'table'")}:
+                return [dict(r) for r in rows]
+            return [r[0] for r in rows]
+        return rows[0][0] if rows else None
+
+    async def handle_rpc(self, request: web.Request) -> web.Response:
+        name = request.match_info["function"]
+        self.requests.append(("RPC", name, request.query_string))
+        body = await request.json() if request.can_read_body else {}
+        try:
+            return web.json_response(self.call_function(name, body))
+        except FakePostgRESTError as e:
+            return self.error(e.status, e.code, e.message)
+        except sqlite3.IntegrityError as e:
+            return self.error(409, "23505", str(e))
+        except sqlite3.Error as e:
+            return self.error(400, "P0001", str(e))
@@ -0,0 +1,61 @@
+"""Per-session Python aggregation of /user_stats, the oracle the get_user_stats RPC is tested against.
+
+This is the pre-RPC implementation: one query per session, so it also serves as a known N+1
+pattern in tests/test_query_budget.py.
+"""
+
+import asyncio
+from helpers.supa_helpers import (
+    get_all_games,
+    get_game_by_id,
+    get_sessions_for_game,
+    get_users_in_session,
+    get_winners_in_session,
+)
+
+
+async def get_total_sessions_played(user_id: int, all_sessions: list[dict]) -> int:
+    session_users = await asyncio.gather(*(get_users_in_session(s["id"]) for s in all_sessions))
+    return sum(
+        user_id in [u["user_id"] for u in users]
+        for users in session_users
+    )
+
+
+async def get_total_wins(user_id: int, all_sessions: list[dict]) -> int:
+    session_winners = await asyncio.gather(*(get_winners_in_session(s["id"]) for s in all_sessions))
+    return sum(
+        user_id in winners
+        for winners in session_winners
+    )
+
+
+async def get_most_played_game(user_id: int, all_sessions: list[dict]) -> tuple[str, int]:
+    game_counts = {}
+    session_users = await asyncio.gather(*(get_users_in_session(s["id"]) for s in all_sessions))
+    for session, users in zip(all_sessions, session_users):
+        if any(u["user_id"] == user_id for u in users):
+            game_id = session["game_id"]
+            game_counts[game_id] = game_counts.get(game_id, 0) + 1
+
+    if not game_counts:
+        return ("N/A", 0)
+
+    most_played_game_id = max(game_counts, key=game_counts.get)
+    game_data = await get_game_by_id(most_played_game_id)
+    return (game_data["name"], game_counts[most_played_game_id])
+
+
+async def get_all_sessions(server_id: int) -> list[dict]:
+    sessions = []
+    seen_ids = set()
+
+    all_games = await get_all_games()
+    sessions_per_game = await asyncio.gather(*(get_sessions_for_game(game["id"], server_id) for game in all_games))
+    for game_sessions in sessions_per_game:
+        for s in game_sessions:
+            if s["id"] not in seen_ids:
+                seen_ids.add(s["id"])
+                sessions.append(s)
+
+    return sessions
@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
-from discord import Interaction, ui
+from discord import Interaction, ui, SelectOption
 from commands.add_session_users import handle_add_session_users, UserSelect, UserSelectView
 
 # Sample user data
@@ -15,8 +15,8 @@ MOCK_USERS = [
 @pytest.mark.asyncio
 @patch("commands.add_session_users.get_all_registered_users", return_value=MOCK_USERS)
 @patch("commands.add_session_users.get_users_in_session", return_value=[{"user_id": 1}, {"user_id": 2}, {"user_id": 3}, {"user_id": 4}])
-@patch("commands.add_session_users.link_user_to_session")
-async def test_handle_add_session_users_no_eligible_users(mock_link_user_to_session, mock_get_users_in_session, mock_get_all_registered_users):
+@patch("commands.add_session_users.link_users_to_session")
+async def test_handle_add_session_users_no_eligible_users(mock_link_users_to_session, mock_get_users_in_session, mock_get_all_registered_users):
     # Mock interaction
     interaction = MagicMock()
     interaction.response.defer = AsyncMock()
@@ -28,7 +28,7 @@ async def test_handle_add_session_users_no_eligible_users(mock_link_user_to_sess
     await handle_add_session_users(interaction, session_id)
 
     # Ensure no users were added
-    mock_link_user_to_session.assert_not_called()
+    mock_link_users_to_session.assert_not_called()
 
     # Check that the response was sent saying everyone is already in the session
     interaction.response.defer.assert_called_once()
@@ -38,8 +38,8 @@ async def test_handle_add_session_users_no_eligible_users(mock_link_user_to_sess
 @pytest.mark.asyncio
 @patch("commands.add_session_users.get_all_registered_users", side_effect=Exception("Database error"))
 @patch("commands.add_session_users.get_users_in_session")
-@patch("commands.add_session_users.link_user_to_session")
-async def test_handle_add_session_users_failure(mock_link_user_to_session, mock_get_users_in_session, mock_get_all_registered_users):
+@patch("commands.add_session_users.link_users_to_session")
+async def test_handle_add_session_users_failure(mock_link_users_to_session, mock_get_users_in_session, mock_get_all_registered_users):
     # Mock interaction
     interaction = MagicMock()
     interaction.response.defer = AsyncMock()
@@ -51,8 +51,27 @@ async def test_handle_add_session_users_failure(mock_link_user_to_session, mock_
     await handle_add_session_users(interaction, session_id)
 
     # Ensure no functions for linking were called
-    mock_link_user_to_session.assert_not_called()
+    mock_link_users_to_session.assert_not_called()
 
     # Check that the error message was sent
     interaction.response.defer.assert_called_once()
     interaction.followup.send.assert_called_once_with("❌ Failed to retrieve users.", ephemeral=True)
+
+# Test that the select reports added and already-linked users from one bulk call
+@pytest.mark.asyncio
+@patch("commands.add_session_users.link_users_to_session", return_value={1: True, 2: False, 3: True})
+async def test_user_select_reports_added_and_skipped(mock_link_users_to_session):
+    options = [SelectOption(label=u["username"], value=str(u["id"])) for u in MOCK_USERS]
+    select = UserSelect(123, options)
+    select._values = ["1", "2", "3"]
+
+    interaction = MagicMock()
+    interaction.response.edit_message = AsyncMock()
+
+    await select.callback(interaction)
+
+    mock_link_users_to_session.assert_awaited_once_with(123, [1, 2, 3])
+    interaction.response.edit_message.assert_called_once_with(
+        content="✅ Added 2 user(s) to the session. ℹ️ 1 already in the session.",
+        view=None,
+    )
@@ -0,0 +1,100 @@
+import json
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from unittest.mock import patch, AsyncMock, MagicMock
+from openai import AsyncOpenAI
+from commands import ask_ai
+from commands.ask_ai import handle_ask_ai, normalize_question
+from helpers.metrics import metrics
+
+ANSWER_PARTS = ["Yes, ", "the robber ", "moves on a 7."]
+
+
+@pytest_asyncio.fixture
+async def fake_openai():
+    """Local OpenAI-compatible server that streams a canned chat completion."""
+    requests = []
+
+    async def chat_completions(request):
+        requests.append(await request.json())
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for part in ANSWER_PARTS:
+            chunk = {
+                "id": "chatcmpl-test",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "gpt-4o",
+                "choices": [{"index": 0, "delta": {"content": part}, "finish_reason": None}],
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    server = TestServer(app)
+    await server.start_server()
+    client = AsyncOpenAI(api_key="test", base_url=str(server.make_url("/v1")))
+    ask_ai.answer_cache.clear()
+    with patch("commands.ask_ai.client", client), patch("commands.ask_ai.EDIT_INTERVAL", 0):
+        yield requests
+    await client.close()
+    await server.close()
+
+
+def make_interaction():
+    interaction = MagicMock()
+    interaction.response.defer = AsyncMock()
+    interaction.edit_original_response = AsyncMock()
+    interaction.followup.send = AsyncMock()
+    return interaction
+
+
+def test_normalize_question():
+    assert normalize_question("  Can the Robber   move on a 7?? ") == "can the robber move on a 7"
+
+
+@pytest.mark.asyncio
+async def test_streams_answer_into_message(fake_openai):
+    interaction = make_interaction()
+    await handle_ask_ai(interaction, "Can the robber move on a 7?")
+
+    assert fake_openai[0]["stream"] is True
+    edits = [c.kwargs["content"] for c in interaction.edit_original_response.call_args_list]
+    assert len(edits) > 1
+    assert edits[-1].endswith("**Answer:** Yes, the robber moves on a 7.")
+    interaction.followup.send.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_repeat_question_is_served_from_cache(fake_openai):
+    await handle_ask_ai(make_interaction(), "Can the robber move on a 7?")
+    interaction = make_interaction()
+    await handle_ask_ai(interaction, "can the robber move on a 7")
+
+    assert len(fake_openai) == 1
+    interaction.edit_original_response.assert_awaited_once()
+    assert "moves on a 7." in interaction.edit_original_response.call_args.kwargs["content"]
+
+
+@pytest.mark.asyncio
+async def test_empty_answer_is_not_cached(fake_openai, monkeypatch):
+    monkeypatch.setattr("tests.test_ask_ai.ANSWER_PARTS", ["", ""])
+    await handle_ask_ai(make_interaction(), "Can the robber move on a 7?")
+    await handle_ask_ai(make_interaction(), "Can the robber move on a 7?")
+
+    assert len(fake_openai) == 2
+    assert ask_ai.answer_cache.get(normalize_question("Can the robber move on a 7?")) is None
+
+
+@pytest.mark.asyncio
+async def test_openai_latency_is_recorded(fake_openai):
+    metrics.clear()
+    await handle_ask_ai(make_interaction(), "Can the robber move on a 7?")
+
+    [(labels, series)] = metrics.of_kind("dependency")
+    assert labels == {"dependency": "openai", "operation": "chat.completions"}
+    assert (series.calls, series.errors) == (1, 0)
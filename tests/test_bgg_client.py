@@ -0,0 +1,121 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from helpers.bgg_client import BGGClient, BGGError
+from helpers.bgg_prefetch import BGGBatchError, BGGPrefetchWorker
+
+FAKE_SEARCH_XML = """<items><item id="13"><name value="Catan"/><yearpublished value="1995"/></item></items>"""
+def large_search_xml(count: int) -> bytes:
+    items = "".join(f'<item type="boardgame" id="{i}"><name type="primary" value="Game {i}"/><yearpublished value="2000"/></item>' for i in range(count))
+    return f'<?xml version="1.0" encoding="utf-8"?><items total="{count}">{items}</items>'.encode()
+
+
+FAKE_THING_XML = """<items><item id="13"><name value="Catan"/><minplayers value="3"/><maxplayers value="4"/></item></items>"""
+
+
+@pytest_asyncio.fixture
+async def bgg_stub():
+    """Local stand-in for the BGG XML API that counts requests per endpoint."""
+    hits = {"search": 0, "thing": 0}
+
+    async def search(request):
+        hits["search"] += 1
+        if request.query["query"] == "broken":
+            return web.Response(status=500)
+        if request.query["query"] == "the":
+            return web.Response(body=large_search_xml(5000), content_type="text/xml")
+        return web.Response(text=FAKE_SEARCH_XML, content_type="text/xml")
+
+    async def thing(request):
+        hits["thing"] += 1
+        return web.Response(text=FAKE_THING_XML, content_type="text/xml")
+
+    app = web.Application()
+    app.router.add_get("/xmlapi2/search", search)
+    app.router.add_get("/xmlapi2/thing", thing)
+    server = TestServer(app)
+    await server.start_server()
+    client = BGGClient(base_url=str(server.make_url("/xmlapi2")))
+    yield client, hits
+    await client.close()
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_search_is_cached(bgg_stub):
+    client, hits = bgg_stub
+    assert [item.get("id") for item in await client.search("Catan")] == ["13"]
+    assert [item.get("id") for item in await client.search("catan")] == ["13"]
+    assert hits["search"] == 1
+    assert client.search_cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_search_stops_after_limit_items(bgg_stub):
+    client, hits = bgg_stub
+    items = await client.search("the", limit=20)
+    assert [item.get("id") for item in items] == [str(i) for i in range(20)]
+    assert items[0].find("name").get("value") == "Game 0"
+
+
+@pytest.mark.asyncio
+async def test_thing_reuses_one_session(bgg_stub):
+    client, hits = bgg_stub
+    await client.thing(13)
+    session = client._session
+    await client.thing(14)
+    assert client._session is session
+    assert hits["thing"] == 2
+
+
+@pytest.mark.asyncio
+async def test_non_200_raises_and_is_not_cached(bgg_stub):
+    client, hits = bgg_stub
+    with pytest.raises(BGGError) as exc:
+        await client.search("broken")
+    assert exc.value.status == 500
+    with pytest.raises(BGGError):
+        await client.search("broken")
+    assert hits["search"] == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_records_batches_ids_within_concurrency_limit():
+    calls, in_flight, peak = [], 0, 0
+
+    async def thing(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        ids = request.query["id"].split(",")
+        calls.append(len(ids))
+        if "999" in ids:
+            return web.Response(status=500)
+        items = "".join(f'<item id="{i}"><name type="primary" value="Game {i}"/></item>' for i in ids)
+        return web.Response(text=f"<items>{items}</items>", content_type="text/xml")
+
+    app = web.Application()
+    app.router.add_get("/xmlapi2/thing", thing)
+    server = TestServer(app)
+    await server.start_server()
+    client = BGGClient(base_url=str(server.make_url("/xmlapi2")))
+    worker = BGGPrefetchWorker(client=client, requests_per_second=1000, batch_size=10)
+    try:
+        ids = list(range(1, 46)) + [1, 2, 999]
+        with pytest.raises(BGGBatchError) as failure:
+            await worker.fetch_records(ids, concurrency=2)
+    finally:
+        await client.close()
+        await server.close()
+
+    assert sorted(calls) == [6, 10, 10, 10, 10]
+    assert peak == 2
+    # The failed chunk is reported, not dropped; everything else is still returned.
+    assert failure.value.failed_ids == [41, 42, 43, 44, 45, 999]
+    assert failure.value.status == 500
+    assert sorted(failure.value.records) == list(range(1, 41))
+    assert failure.value.records[1]["name"] == "Game 1"
@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from helpers.bgg_client import BGGClient
+from helpers.bgg_prefetch import BGGPrefetchWorker
+
+
+def thing_xml(ids):
+    items = "".join(
+        f'<item id="{i}"><name type="primary" value="Game {i}"/><minplayers value="2"/><maxplayers value="4"/></item>'
+        for i in ids
+    )
+    return f"<items>{items}</items>"
+
+
+@pytest_asyncio.fixture
+async def throttling_bgg():
+    """BGG stand-in that answers the first thing request with 429, then serves every id asked for."""
+    calls = []
+
+    async def thing(request):
+        ids = [int(i) for i in request.query["id"].split(",")]
+        calls.append(ids)
+        if len(calls) == 1:
+            return web.Response(status=429)
+        return web.Response(text=thing_xml(ids), content_type="text/xml")
+
+    app = web.Application()
+    app.router.add_get("/xmlapi2/thing", thing)
+    server = TestServer(app)
+    await server.start_server()
+    client = BGGClient(base_url=str(server.make_url("/xmlapi2")))
+    yield client, calls
+    await client.close()
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_refreshes_stale_games_in_batches_with_backoff(throttling_bgg, fake_db):
+    client, calls = throttling_bgg
+    fake_db.seed("games", [
+        {"id": i, "bgg_id": 100 + i, "name": f"Old {i}", "bgg_synced_at": None if i % 2 else "2020-01-01T00:00:00"}
+        for i in range(1, 6)
+    ] + [{"id": 6, "bgg_id": 106, "name": "Fresh", "bgg_synced_at": "2999-01-01T00:00:00"}])
+
+    worker = BGGPrefetchWorker(client=client, requests_per_second=100, batch_size=3, base_backoff=0.01)
+    assert await worker.enqueue_stale_games() == 5
+    assert not worker.enqueue(101)
+
+    worker.start()
+    await asyncio.wait_for(worker.queue.join(), timeout=5)
+    await worker.stop()
+
+    # Never-synced games are queued ahead of merely stale ones.
+    assert calls == [[101, 103, 105], [101, 103, 105], [102, 104]]
+    assert worker.fetched == 5
+    names = {r["bgg_id"]: r["name"] for r in fake_db.rows("games")}
+    assert names == {101: "Game 101", 102: "Game 102", 103: "Game 103", 104: "Game 104", 105: "Game 105", 106: "Fresh"}
+
+
+@pytest.mark.asyncio
+async def test_stale_scan_is_filtered_and_limited_by_the_database(fake_db):
+    fake_db.seed("games", [
+        {"id": 1, "bgg_id": 101, "name": "Old", "bgg_synced_at": "2020-01-01T00:00:00+00:00"},
+        {"id": 2, "bgg_id": 102, "name": "Never synced", "bgg_synced_at": None},
+        {"id": 3, "bgg_id": 103, "name": "Fresh", "bgg_synced_at": "2999-01-01T00:00:00+00:00"},
+        {"id": 4, "bgg_id": None, "name": "Homebrew", "bgg_synced_at": None},
+        {"id": 5, "bgg_id": 105, "name": "Older", "bgg_synced_at": "2019-01-01T00:00:00+00:00"},
+    ])
+
+    worker = BGGPrefetchWorker(max_queue=2)
+    assert await worker.enqueue_stale_games() == 2
+    assert [worker.queue.get_nowait() for _ in range(2)] == [102, 105]
+    assert await BGGPrefetchWorker(max_queue=10).enqueue_stale_games() == 3
+
+
+@pytest.mark.asyncio
+async def test_ids_missing_from_the_response_leave_the_stale_scan(fake_db):
+    class DeletedOnBGG:
+        async def things(self, ids):
+            return thing_xml([i for i in ids if i != 102])
+
+    fake_db.seed("games", [
+        {"id": 1, "bgg_id": 101, "name": "Old", "bgg_synced_at": None},
+        {"id": 2, "bgg_id": 102, "name": "Deleted on BGG", "bgg_synced_at": None},
+    ])
+
+    worker = BGGPrefetchWorker(client=DeletedOnBGG(), requests_per_second=100)
+    assert await worker.fetch_batch([101, 102]) == 1
+    assert await worker.enqueue_stale_games() == 0
+    assert {r["bgg_id"]: r["name"] for r in fake_db.rows("games")} == {101: "Game 101", 102: "Deleted on BGG"}
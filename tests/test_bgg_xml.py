@@ -0,0 +1,28 @@
+import pytest
+import xml.etree.ElementTree as ET
+from helpers.bgg_xml import ItemReader, parse_items
+
+SEARCH_XML = """<?xml version="1.0" encoding="utf-8"?>
+<items total="3" termsofuse="https://boardgamegeek.com/xmlapi/termsofuse">
+  <item type="boardgame" id="13"><name type="primary" value="CATAN"/><yearpublished value="1995"/></item>
+  <item type="boardgame" id="27710"><name type="primary" value="Catan Dice Game"/></item>
+  <item type="boardgame" id="926"><name type="primary" value="Catan Card Game"/><yearpublished value="1996"/></item>
+</items>"""
+
+
+def test_parse_items_matches_full_tree_in_small_chunks():
+    expected = [ET.tostring(item) for item in ET.fromstring(SEARCH_XML).findall("item")]
+    assert [ET.tostring(item) for item in parse_items(SEARCH_XML, chunk_size=7)] == expected
+
+
+def test_reader_stops_at_limit_and_detaches_items():
+    reader = ItemReader(limit=2)
+    assert reader.feed(SEARCH_XML.encode()) is True
+    items = reader.close()
+    assert [item.get("id") for item in items] == ["13", "27710"]
+    assert len(reader._root) == 0
+
+
+def test_truncated_document_raises_parse_error():
+    with pytest.raises(ET.ParseError):
+        parse_items(SEARCH_XML[:120])
@@ -0,0 +1,97 @@
+import discord
+import pytest
+from unittest.mock import AsyncMock, patch
+from discord import app_commands, Interaction
+from helpers import command_sync
+from launcher import shard_ranges
+
+
+def make_tree():
+    client = discord.Client(intents=discord.Intents.none())
+    client._connection.application_id = 42
+    client.http.bulk_upsert_global_commands = AsyncMock(return_value=[])
+    client.http.bulk_upsert_guild_commands = AsyncMock(return_value=[])
+    tree = app_commands.CommandTree(client)
+
+    @tree.command(name="owned_games", description="Show your board game collection")
+    async def owned_games(interaction: Interaction):
+        pass
+
+    return client, tree
+
+
+@pytest.mark.asyncio
+async def test_guild_scope_copies_commands_to_each_guild(tmp_path):
+    client, tree = make_tree()
+    client.http.bulk_upsert_guild_commands.side_effect = [[], discord.Forbidden(AsyncMock(status=403), "Missing Access"), []]
+
+    scopes = await command_sync.sync_commands(tree, [1, 2, 3], scope="guild", state_path=str(tmp_path / "sync.json"))
+
+    assert scopes == ["guild:1", "guild:3"]
+    guild_ids = [call.args[1] for call in client.http.bulk_upsert_guild_commands.await_args_list]
+    assert guild_ids == [1, 2, 3]
+    assert client.http.bulk_upsert_guild_commands.await_args_list[0].kwargs["payload"][0]["name"] == "owned_games"
+    client.http.bulk_upsert_global_commands.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_global_scope_syncs_once_and_clears_old_guild_commands_once(tmp_path):
+    state_path = str(tmp_path / "sync.json")
+    client, tree = make_tree()
+    assert await command_sync.sync_commands(tree, [1, 2], scope="guild", state_path=state_path) == ["guild:1", "guild:2"]
+
+    client, tree = make_tree()
+    assert await command_sync.sync_commands(tree, [1, 2], scope="global", state_path=state_path) == ["global", "guild:1", "guild:2"]
+    client.http.bulk_upsert_global_commands.assert_awaited_once()
+    cleared = client.http.bulk_upsert_guild_commands.await_args_list
+    assert [(call.args[1], call.kwargs["payload"]) for call in cleared] == [(1, []), (2, [])]
+
+    client, tree = make_tree()
+    assert await command_sync.sync_commands(tree, [1, 2], scope="global", state_path=state_path) == []
+    client.http.bulk_upsert_guild_commands.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_tree_skips_sync_until_forced_or_changed(tmp_path):
+    state_path = str(tmp_path / "sync.json")
+    client, tree = make_tree()
+    assert await command_sync.sync_commands(tree, [1, 2], scope="guild", state_path=state_path) == ["guild:1", "guild:2"]
+
+    # A restart builds an identical tree and makes no API calls
+    client, tree = make_tree()
+    assert await command_sync.sync_commands(tree, [1, 2], scope="guild", state_path=state_path) == []
+    client.http.bulk_upsert_guild_commands.assert_not_awaited()
+
+    assert await command_sync.sync_commands(tree, [1], scope="guild", force=True, state_path=state_path) == ["guild:1"]
+
+    @tree.command(name="rate_game", description="Create a poll to rate a game from 1 to 5")
+    async def rate_game(interaction: Interaction, query: str):
+        pass
+
+    assert await command_sync.sync_commands(tree, [1, 2], scope="guild", state_path=state_path) == ["guild:1", "guild:2"]
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_is_retried_next_start(tmp_path):
+    state_path = str(tmp_path / "sync.json")
+    client, tree = make_tree()
+    client.http.bulk_upsert_global_commands.side_effect = discord.HTTPException(AsyncMock(status=429), "rate limited")
+    assert await command_sync.sync_commands(tree, scope="global", state_path=state_path) == []
+
+    client, tree = make_tree()
+    assert await command_sync.sync_commands(tree, scope="global", state_path=state_path) == ["global"]
+
+
+@pytest.mark.asyncio
+@patch("helpers.command_sync.get_registered_server_ids", return_value=[300, 100])
+async def test_guild_ids_merge_config_and_database(mock_server_ids):
+    with patch.object(command_sync, "GUILD_IDS", [100, 200]), patch.object(command_sync, "GUILD_IDS_FROM_DB", True):
+        assert await command_sync.resolve_guild_ids() == [100, 200, 300]
+    with patch.object(command_sync, "GUILD_IDS", [100]), patch.object(command_sync, "GUILD_IDS_FROM_DB", False):
+        assert await command_sync.resolve_guild_ids() == [100]
+
+
+def test_shard_ranges_split_evenly():
+    assert shard_ranges(8, 2) == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    assert shard_ranges(5, 3) == [[0, 1], [2, 3], [4]]
+    assert shard_ranges(2, 4) == [[0], [1]]
@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import AsyncMock
+from helpers.game_index import GameNameIndex
+
+MOCK_GAMES = [
+    {"id": 1, "name": "Catan"},
+    {"id": 2, "name": "Monopoly"},
+    {"id": 3, "name": "Ticket to Ride"},
+]
+
+
+def test_search_returns_best_match_first():
+    index = GameNameIndex()
+    index.replace(MOCK_GAMES)
+    assert index.search("catan", limit=2)[0] == {"id": 1, "name": "Catan"}
+    assert len(index.search("catan", limit=2)) == 2
+
+
+def test_add_makes_new_game_searchable_without_duplicates():
+    index = GameNameIndex()
+    index.replace(MOCK_GAMES)
+    index.add(4, "Spirit Island")
+    index.add(4, "Spirit Island")
+    assert len(index) == 4
+    assert index.search("spirit island", limit=1) == [{"id": 4, "name": "Spirit Island"}]
+
+
+@pytest.mark.asyncio
+async def test_ensure_loaded_only_queries_once():
+    index = GameNameIndex()
+    loader = AsyncMock(return_value=MOCK_GAMES)
+    await index.ensure_loaded(loader)
+    await index.ensure_loaded(loader)
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_games_added_by_other_processes_appear_after_max_age():
+    index = GameNameIndex()
+    await index.ensure_loaded(AsyncMock(return_value=MOCK_GAMES))
+    # This process inserts game 5 while another inserted game 4.
+    index.add(5, "Root")
+    load_newer = AsyncMock(return_value=[{"id": 4, "name": "Spirit Island"}, {"id": 5, "name": "Root"}])
+
+    await index.ensure_loaded(AsyncMock(), load_newer, max_age=60)
+    load_newer.assert_not_awaited()
+
+    await index.ensure_loaded(AsyncMock(), load_newer, max_age=0)
+    load_newer.assert_awaited_once_with(3)
+    assert len(index) == 5
+    assert index.search("spirit island", limit=1) == [{"id": 4, "name": "Spirit Island"}]
+    assert index.loaded_max_id == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_serving_the_loaded_index():
+    index = GameNameIndex()
+    await index.ensure_loaded(AsyncMock(return_value=MOCK_GAMES))
+    await index.ensure_loaded(AsyncMock(), AsyncMock(side_effect=RuntimeError("down")), max_age=0)
+    assert len(index) == 3
+
+
+def test_add_updates_renamed_games_and_remove_drops_them():
+    index = GameNameIndex()
+    index.replace(MOCK_GAMES)
+    index.add(2, "Monopoly Deal")
+    assert index.search("monopoly deal", limit=1) == [{"id": 2, "name": "Monopoly Deal"}]
+
+    index.remove(1)
+    index.remove(1)
+    assert len(index) == 2
+    assert {g["id"] for g in index.search("catan", limit=5)} == {2, 3}
+    index.add(1, "Catan")
+    assert index.search("catan", limit=1) == [{"id": 1, "name": "Catan"}]
+
+
+@pytest.mark.asyncio
+async def test_full_reload_drops_games_deleted_elsewhere():
+    index = GameNameIndex()
+    await index.ensure_loaded(AsyncMock(return_value=MOCK_GAMES))
+    loader = AsyncMock(return_value=MOCK_GAMES[1:])
+    await index.ensure_loaded(loader, AsyncMock(return_value=[]), max_age=60, reload_age=0)
+    loader.assert_awaited_once()
+    assert len(index) == 2
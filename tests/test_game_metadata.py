@@ -0,0 +1,59 @@
+import asyncio
+import xml.etree.ElementTree as ET
+import pytest
+from unittest.mock import patch
+from helpers import game_metadata
+
+CATAN_THING_XML = """<items><item type="boardgame" id="13">
+<thumbnail>https://cf.geekdo-images.com/catan_t.jpg</thumbnail>
+<image>https://cf.geekdo-images.com/catan.jpg</image>
+<name type="primary" sortindex="1" value="CATAN"/>
+<name type="alternate" sortindex="1" value="Die Siedler von Catan"/>
+<yearpublished value="1995"/><minplayers value="3"/><maxplayers value="4"/><playingtime value="120"/>
+<link type="boardgamedesigner" id="11" value="Klaus Teuber"/>
+<link type="boardgamepublisher" id="37" value="KOSMOS"/>
+<link type="boardgamepublisher" id="4" value="Catan Studio"/>
+<statistics page="1"><ratings>
+<usersrated value="120000"/><average value="7.10345"/>
+<ranks><rank type="subtype" id="1" name="boardgame" value="512"/><rank type="family" id="5497" name="strategygames" value="Not Ranked"/></ranks>
+<averageweight value="2.29"/>
+</ratings></statistics>
+</item></items>"""
+
+
+def test_parse_thing_item_keeps_full_record():
+    record = game_metadata.parse_thing_item(ET.fromstring(CATAN_THING_XML).find("item"))
+
+    assert record["name"] == "CATAN"
+    assert (record["year_published"], record["playing_time"]) == (1995, 120)
+    assert record["designers"] == ["Klaus Teuber"]
+    assert record["publishers"] == ["KOSMOS", "Catan Studio"]
+    assert record["publisher"] == "KOSMOS"
+    assert record["image_url"] == "https://cf.geekdo-images.com/catan.jpg"
+    assert (record["rating_avg"], record["rating_count"], record["bgg_rank"], record["weight"]) == (7.1, 120000, 512, 2.29)
+
+
+@pytest.mark.asyncio
+@patch("helpers.game_metadata.bgg.thing", return_value=CATAN_THING_XML)
+async def test_get_game_record_only_hits_bgg_until_stored(mock_thing, fake_db):
+    first = await game_metadata.get_game_record(13)
+    second = await game_metadata.get_game_record(13)
+
+    assert mock_thing.await_count == 1
+    assert second["id"] == first["id"]
+    assert second["publishers"] == ["KOSMOS", "Catan Studio"]
+    assert second["bgg_synced_at"]
+
+
+@pytest.mark.asyncio
+@patch("helpers.game_metadata.bgg.thing", return_value=CATAN_THING_XML)
+async def test_stale_record_is_served_then_refreshed_in_background(mock_thing, fake_db):
+    fake_db.seed("games", [{"id": 1, "bgg_id": 13, "name": "Catan", "bgg_synced_at": "2020-01-01T00:00:00+00:00"}])
+
+    game = await game_metadata.get_game_record(13)
+    assert game["name"] == "Catan"
+
+    await asyncio.gather(*game_metadata._refresh_tasks.values())
+    assert mock_thing.await_count == 1
+    assert fake_db.rows("games")[0]["name"] == "CATAN"
+    assert not game_metadata.is_stale(fake_db.rows("games")[0])
@@ -0,0 +1,49 @@
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+from commands.game_stats import GameSelectView, ShareStatsButton
+
+MOCK_STATS = {
+    "total_plays": 42,
+    "rating_avg": "4.3333333333333333",
+    "rating_count": 3,
+    "win_counts": [
+        {"user_id": 1, "username": "user1", "nickname": "User One", "wins": 20},
+        {"user_id": 2, "username": "user2", "nickname": "", "wins": 12},
+        {"user_id": 3, "username": "user3", "nickname": None, "wins": 5},
+        {"user_id": 4, "username": "user4", "nickname": "User Four", "wins": 1},
+    ],
+}
+
+
+@pytest.mark.asyncio
+@patch("commands.game_stats.get_game_stats", return_value=MOCK_STATS)
+async def test_game_button_renders_stats_from_one_call(mock_get_game_stats):
+    interaction = MagicMock()
+    interaction.guild_id = 99
+    interaction.response.edit_message = AsyncMock()
+
+    button = GameSelectView.GameButton({"id": 7, "name": "Catan"}, interaction)
+    await button.callback(interaction)
+
+    mock_get_game_stats.assert_awaited_once_with(7, 99)
+    content = interaction.response.edit_message.call_args.kwargs["content"]
+    assert "Total plays: **42**" in content
+    assert "Average rating: **4.33 / 5**" in content
+    assert "🏆 User One — 20 win(s)\n🏆 user2 — 12 win(s)\n🏆 user3 — 5 win(s)" in content
+    assert "User Four" not in content
+    assert isinstance(interaction.response.edit_message.call_args.kwargs["view"], ShareStatsButton)
+
+
+@pytest.mark.asyncio
+@patch("commands.game_stats.get_game_stats", return_value={"total_plays": 0, "rating_avg": None, "rating_count": 0, "win_counts": []})
+async def test_game_button_without_sessions(mock_get_game_stats):
+    interaction = MagicMock()
+    interaction.response.edit_message = AsyncMock()
+
+    button = GameSelectView.GameButton({"id": 7, "name": "Catan"}, interaction)
+    await button.callback(interaction)
+
+    interaction.response.edit_message.assert_awaited_once_with(
+        content="📉 **Catan** has no logged sessions yet.",
+        view=None
+    )
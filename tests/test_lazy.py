@@ -0,0 +1,48 @@
+import sys
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from helpers import lazy
+from helpers.startup_profile import DEFERRED_MARKER, parse_importtime, by_package
+
+
+@pytest.mark.asyncio
+async def test_lazy_handler_imports_module_on_first_call(monkeypatch):
+    monkeypatch.delitem(sys.modules, "commands.bot_metrics", raising=False)
+    handler = lazy.LazyHandler("commands.bot_metrics", "handle_bot_metrics")
+    assert "commands.bot_metrics" not in sys.modules
+
+    interaction = MagicMock()
+    interaction.response.send_message = AsyncMock()
+    await handler(interaction)
+
+    assert "commands.bot_metrics" in sys.modules
+    interaction.response.send_message.assert_awaited_once()
+
+
+def test_lazy_client_builds_once_on_first_use():
+    factory = MagicMock(return_value=MagicMock(table=MagicMock(return_value="users")))
+    client = lazy.LazyClient(factory)
+    assert not client.built
+    factory.assert_not_called()
+
+    assert client.table("users") == "users"
+    assert client.table("users") == "users"
+    factory.assert_called_once()
+    lazy._clients.remove(client)
+
+
+def test_parse_importtime_splits_startup_from_deferred():
+    lines = [
+        "import time: self [us] | cumulative | imported package",
+        "import time:       200 |        200 |     discord.utils",
+        "import time:       100 |        300 | discord",
+        "INFO:game-night-bot:some log line",
+        DEFERRED_MARKER,
+        "import time:       400 |        400 |   openai._client",
+        "import time:        50 |        450 | openai",
+    ]
+    startup, deferred = parse_importtime(lines)
+    assert [e.module for e in startup] == ["discord.utils", "discord"]
+    assert deferred[-1].cumulative_us == 450
+    assert by_package(startup) == {"discord": 300}
+    assert by_package(deferred) == {"openai": 450}
@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from commands.list_sessions import GameSessionPaginator
+
+
+@pytest.fixture
+def history(fake_db):
+    fake_db.seed("users", [
+        {"id": 1, "discord_id": 100, "username": "user1", "nickname": "User One"},
+        {"id": 2, "discord_id": 200, "username": "user2", "nickname": ""},
+        {"id": 3, "discord_id": 300, "username": "user3", "nickname": "User Three"},
+    ])
+    fake_db.seed("games", [{"id": 1, "bgg_id": 13, "name": "Catan"}, {"id": 2, "bgg_id": 14, "name": "Azul"}])
+    # Twelve sessions where ids 5-8 share a date and id 12 has none, plus noise from another game and server.
+    dates = {i: f"2025-01-{i:02d}" for i in range(1, 12)}
+    dates.update({5: "2025-01-05", 6: "2025-01-05", 7: "2025-01-05", 8: "2025-01-05", 12: None})
+    fake_db.seed("sessions", [{"id": i, "game_id": 1, "server_id": 7, "date": dates[i], "name": f"Night {i}"} for i in range(1, 13)]
+                 + [{"id": 13, "game_id": 2, "server_id": 7, "date": "2025-02-01", "name": "Other game"},
+                    {"id": 14, "game_id": 1, "server_id": 8, "date": "2025-02-01", "name": "Other server"}])
+    fake_db.seed("sessions_winners", [{"session_id": i, "user_id": 1} for i in range(1, 13, 2)]
+                 + [{"session_id": 2, "user_id": 2}, {"session_id": 2, "user_id": 3}])
+    return fake_db
+
+
+def session_ids(content: str) -> list[int]:
+    return [int(part.split(")")[0]) for part in content.split("Session ID: ")[1:]]
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_walk_history_newest_first(history):
+    view = GameSessionPaginator(1, 7, "Catan")
+    first = view.get_page_content(await view.load_page(0))
+    assert "Page 1/3" in first
+    assert session_ids(first) == [11, 10, 9, 8, 7]
+    assert view.prev_button.disabled and not view.next_button.disabled
+
+    interaction = MagicMock()
+    interaction.response.edit_message = AsyncMock()
+    pages = []
+    for _ in range(2):
+        await view.next_page(interaction)
+        pages.append(interaction.response.edit_message.call_args.kwargs["content"])
+    await view.prev_page(interaction)
+
+    assert session_ids(pages[0]) == [6, 5, 4, 3, 2]
+    assert "user2, User Three" in pages[0]
+    assert session_ids(pages[1]) == [1, 12]
+    assert "No Date" in pages[1]
+    assert session_ids(interaction.response.edit_message.call_args.kwargs["content"]) == [6, 5, 4, 3, 2]
+
+    # Three page queries; the prev flip is served from the page cache.
+    assert [r[:2] for r in history.requests] == [("GET", "sessions")] * 3
+    assert "count" not in history.requests[1][2]
+
+
+@pytest.mark.asyncio
+async def test_last_page_disables_next(history):
+    view = GameSessionPaginator(1, 7, "Catan", per_page=20)
+    sessions = await view.load_page(0)
+    assert len(sessions) == 12
+    assert view.total_pages == 1
+    assert view.next_button.disabled
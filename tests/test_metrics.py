@@ -0,0 +1,60 @@
+import discord
+import pytest
+from discord import app_commands, Interaction
+from unittest.mock import AsyncMock, MagicMock
+from commands.bot_metrics import handle_bot_metrics
+from helpers import supa_helpers
+from helpers.metrics import metrics, timed, timed_command
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+def test_timed_command_keeps_the_slash_command_signature():
+    @app_commands.command(name="owned_games", description="Show your board game collection")
+    @app_commands.describe(user="Whose collection")
+    @timed_command
+    async def owned_games(interaction: Interaction, user: discord.User = None):
+        pass
+
+    assert [p.name for p in owned_games.parameters] == ["user"]
+    assert owned_games.parameters[0].description == "Whose collection"
+    assert not owned_games.parameters[0].required
+
+
+@pytest.mark.asyncio
+async def test_supabase_helpers_and_failures_are_recorded(fake_db):
+    await supa_helpers.get_all_games()
+    await supa_helpers.get_all_games()
+    with pytest.raises(ZeroDivisionError):
+        async with timed("dependency", dependency="bgg", operation="thing"):
+            1 / 0
+
+    series = {(labels["dependency"], labels["operation"]): s for labels, s in metrics.of_kind("dependency")}
+    assert series[("supabase", "get_all_games")].calls == 2
+    assert series[("bgg", "thing")].errors == 1
+
+    text = metrics.render_prometheus()
+    assert 'gamenight_dependency_seconds_count{dependency="supabase",operation="get_all_games"} 2' in text
+    assert 'gamenight_dependency_errors_total{dependency="bgg",operation="thing"} 1' in text
+    assert 'gamenight_dependency_seconds_bucket{dependency="bgg",operation="thing",le="+Inf"} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_bot_metrics_is_admin_only():
+    metrics.observe("command", 0.2, command="user_stats")
+    interaction = MagicMock()
+    interaction.response.send_message = AsyncMock()
+
+    interaction.user.guild_permissions.administrator = False
+    await handle_bot_metrics(interaction)
+    assert "administrators" in interaction.response.send_message.call_args.args[0]
+
+    interaction.user.guild_permissions.administrator = True
+    await handle_bot_metrics(interaction)
+    content = interaction.response.send_message.call_args.args[0]
+    assert "/user_stats" in content and "no calls recorded" in content
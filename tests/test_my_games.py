@@ -0,0 +1,32 @@
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+from commands.my_games import handle_my_games
+
+
+@pytest.mark.asyncio
+@patch("commands.my_games.get_user_by_discord_id", return_value={"id": 1})
+async def test_pages_are_fetched_on_demand_and_cached(mock_get_user, fake_db):
+    fake_db.seed("users", [{"id": 1, "discord_id": 100, "username": "collector"}])
+    fake_db.seed("games", [{"id": i, "bgg_id": 1000 + i, "name": f"Game {i:03d}"} for i in range(1, 536)])
+    fake_db.seed("users_games", [{"user_id": 1, "game_id": i} for i in range(1, 536)])
+
+    interaction = MagicMock()
+    interaction.response.defer = AsyncMock()
+    interaction.followup.send = AsyncMock()
+    await handle_my_games(interaction)
+
+    kwargs = interaction.followup.send.call_args.kwargs
+    assert kwargs["content"].startswith("📚 **Your Games (Page 1/54)**")
+    assert "• Game 010" in kwargs["content"] and "Game 011" not in kwargs["content"]
+    assert len(fake_db.requests) == 1
+
+    view = kwargs["view"]
+    click = MagicMock()
+    click.response.edit_message = AsyncMock()
+    await view.next.callback(click)
+    await view.prev.callback(click)
+    await view.next.callback(click)
+
+    assert "• Game 011" in click.response.edit_message.call_args.kwargs["content"]
+    assert "Page 2/54" in click.response.edit_message.call_args.kwargs["content"]
+    assert len(fake_db.requests) == 2
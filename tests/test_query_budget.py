@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from commands.list_sessions import GameSessionPaginator
+from tests.reference_user_stats import get_total_sessions_played
+from helpers.metrics import timed_command
+from helpers import supa_helpers
+
+
+@pytest.fixture
+def sessions(fake_db):
+    fake_db.seed("users", [{"id": 1, "discord_id": 100, "username": "user1"}])
+    fake_db.seed("games", [{"id": 1, "bgg_id": 13, "name": "Catan"}])
+    fake_db.seed("sessions", [{"id": i, "game_id": 1, "server_id": 7, "date": f"2025-01-{i:02d}"} for i in range(1, 13)])
+    fake_db.seed("sessions_users", [{"session_id": i, "user_id": 1} for i in range(1, 13, 2)])
+    return fake_db
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_page_flip_is_one_query(sessions, query_counter):
+    view = GameSessionPaginator(1, 7, "Catan")
+    await view.load_page(0)
+    interaction = MagicMock()
+    interaction.response.edit_message = AsyncMock()
+
+    with query_counter("page flip") as log:
+        await view.next_page(interaction)
+    assert log.count <= 1
+    assert log.by_operation() == {"get_sessions_page": 1}
+
+
+@pytest.mark.asyncio
+async def test_paginator_click_is_tracked_in_its_own_task(sessions, query_counter, monkeypatch):
+    checked = []
+    monkeypatch.setattr("helpers.metrics.check_budget", lambda log, budget: checked.append(log))
+    view = GameSessionPaginator(1, 7, "Catan")
+    await view.load_page(0)
+    interaction = MagicMock(data={})
+    interaction.response.edit_message = AsyncMock()
+
+    # How discord.py runs a button press: the view's scheduled task, outside any command's context.
+    await asyncio.create_task(view._scheduled_task(view.next_button, interaction))
+
+    interaction.response.edit_message.assert_awaited_once()
+    [log] = checked
+    assert log.name == "list_sessions.page"
+    assert log.by_operation() == {"get_sessions_page": 1}
+
+
+@pytest.mark.asyncio
+async def test_per_session_loop_is_reported_as_n_plus_one(sessions, query_counter):
+    all_sessions = [{"id": i} for i in range(1, 13)]
+    with query_counter("reference stats") as log:
+        assert await get_total_sessions_played(1, all_sessions) == 6
+
+    [(query, times)] = log.repeated()
+    assert (query.operation, query.method, query.resource, times) == ("get_users_in_session", "GET", "sessions_users", 12)
+
+
+@pytest.mark.asyncio
+async def test_command_over_budget_logs_a_warning(sessions, query_counter, caplog, monkeypatch):
+    monkeypatch.setattr("helpers.metrics.DB_QUERY_BUDGET", 3)
+
+    @timed_command
+    async def chatty(interaction):
+        for _ in range(4):
+            await supa_helpers.get_all_games()
+
+    with caplog.at_level(logging.WARNING, logger="helpers.query_tracker"):
+        await chatty(MagicMock())
+
+    assert "/chatty issued 4 database queries (budget 3): get_all_games×4" in caplog.text
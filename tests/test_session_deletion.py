@@ -0,0 +1,49 @@
+import pytest
+from helpers import supa_helpers
+
+
+def seed_sessions(fake_db, session_ids):
+    fake_db.seed("users", [{"id": 1, "discord_id": 100, "username": "user1"}, {"id": 2, "discord_id": 200, "username": "user2"}])
+    fake_db.seed("games", [{"id": 1, "bgg_id": 13, "name": "Catan"}])
+    fake_db.seed("sessions", [{"id": sid, "game_id": 1, "server_id": 1} for sid in session_ids])
+    fake_db.seed("sessions_users", [{"session_id": sid, "user_id": uid} for sid in session_ids for uid in (1, 2)])
+    fake_db.seed("sessions_winners", [{"session_id": sid, "user_id": 1} for sid in session_ids])
+
+
+@pytest.mark.asyncio
+async def test_delete_session_by_id_is_one_round_trip(fake_db):
+    seed_sessions(fake_db, [10, 11])
+
+    await supa_helpers.delete_session_by_id(10)
+
+    assert fake_db.requests == [("RPC", "delete_sessions", "")]
+    assert [s["id"] for s in fake_db.rows("sessions")] == [11]
+    assert {r["session_id"] for r in fake_db.rows("sessions_users")} == {11}
+    assert {r["session_id"] for r in fake_db.rows("sessions_winners")} == {11}
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_returns_deleted_ids(fake_db):
+    seed_sessions(fake_db, [10, 11, 12])
+
+    deleted = await supa_helpers.delete_sessions_by_ids([10, 12, 99])
+
+    assert sorted(deleted) == [10, 12]
+    assert [s["id"] for s in fake_db.rows("sessions")] == [11]
+    assert await supa_helpers.delete_sessions_by_ids([]) == []
+
+
+@pytest.mark.asyncio
+async def test_failed_delete_leaves_session_intact(fake_db):
+    seed_sessions(fake_db, [10])
+    fake_db.db.execute("""
+        create trigger block_session_delete before delete on sessions
+        begin select raise(abort, 'session is locked'); end
+    """)
+
+    with pytest.raises(Exception):
+        await supa_helpers.delete_session_by_id(10)
+
+    assert [s["id"] for s in fake_db.rows("sessions")] == [10]
+    assert len(fake_db.rows("sessions_users")) == 2
+    assert len(fake_db.rows("sessions_winners")) == 1
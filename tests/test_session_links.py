@@ -0,0 +1,27 @@
+import pytest
+from helpers import supa_helpers
+
+
+@pytest.mark.asyncio
+async def test_link_users_to_session_is_one_upsert_per_call(fake_db):
+    fake_db.seed("users", [{"id": uid, "discord_id": uid * 100, "username": f"user{uid}"} for uid in (1, 2, 3)])
+    fake_db.seed("games", [{"id": 1, "bgg_id": 13, "name": "Catan"}])
+    fake_db.seed("sessions", [{"id": 10, "game_id": 1, "server_id": 1}])
+
+    assert await supa_helpers.link_users_to_session(10, [1, 2]) == {1: True, 2: True}
+    assert await supa_helpers.link_users_to_session(10, [2, 3, 3]) == {2: False, 3: True}
+
+    assert [r[:2] for r in fake_db.requests] == [("POST", "sessions_users"), ("POST", "sessions_users")]
+    assert sorted(r["user_id"] for r in fake_db.rows("sessions_users")) == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_link_winners_to_session_skips_existing_winners(fake_db):
+    fake_db.seed("users", [{"id": uid, "discord_id": uid * 100, "username": f"user{uid}"} for uid in (1, 2)])
+    fake_db.seed("games", [{"id": 1, "bgg_id": 13, "name": "Catan"}])
+    fake_db.seed("sessions", [{"id": 10, "game_id": 1, "server_id": 1}])
+    fake_db.seed("sessions_winners", [{"session_id": 10, "user_id": 1}])
+
+    assert await supa_helpers.link_winners_to_session(10, [1, 2]) == {1: False, 2: True}
+    assert await supa_helpers.link_winners_to_session(10, []) == {}
+    assert len(fake_db.rows("sessions_winners")) == 2
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from helpers import supa_helpers
 
 @patch("helpers.supa_helpers.supabase")
@@ -16,3 +16,37 @@ def test_get_or_create_user_new(mock_supabase):
     mock_supabase.table().insert().execute.return_value.data = [{"id": 99}]
     user_id = supa_helpers.get_or_create_user(MagicMock(id=123, __str__=lambda s: "test#1234"))
     assert user_id == 99
+
+@pytest.mark.asyncio
+@patch("helpers.supa_helpers.supabase")
+async def test_get_user_by_id_awaits_client(mock_supabase):
+    mock_supabase.table().select().eq().execute = AsyncMock(return_value=MagicMock(data=[{"id": 7}]))
+    user = await supa_helpers.get_user_by_id(7)
+    assert user == {"id": 7}
+    mock_supabase.table().select().eq().execute.assert_awaited_once()
+
+@pytest.mark.asyncio
+@patch("helpers.supa_helpers._fetch_user_by_discord_id", new_callable=AsyncMock, return_value={"id": 5, "nickname": "Old"})
+@patch("helpers.supa_helpers.supabase")
+async def test_get_user_by_discord_id_is_cached_until_update(mock_supabase, mock_fetch):
+    supa_helpers.user_cache.clear()
+    supa_helpers.user_cache.hits = supa_helpers.user_cache.misses = 0
+    mock_supabase.table().update().eq().execute = AsyncMock(return_value=MagicMock(data=[{"id": 5}]))
+
+    assert await supa_helpers.get_user_by_discord_id(123, 1) == {"id": 5, "nickname": "Old"}
+    await supa_helpers.get_user_by_discord_id(123, 1)
+    assert mock_fetch.await_count == 1
+    assert supa_helpers.get_user_cache_stats() == {"size": 1, "hits": 1, "misses": 1}
+
+    await supa_helpers.update_user(5, {"nickname": "New"})
+    await supa_helpers.get_user_by_discord_id(123, 1)
+    assert mock_fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+@patch("helpers.supa_helpers._fetch_user_by_discord_id", new_callable=AsyncMock, return_value=None)
+async def test_unregistered_users_are_not_cached(mock_fetch):
+    supa_helpers.user_cache.clear()
+    assert await supa_helpers.get_user_by_discord_id(456, 1) is None
+    assert await supa_helpers.get_user_by_discord_id(456, 1) is None
+    assert mock_fetch.await_count == 2
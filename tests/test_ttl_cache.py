@@ -0,0 +1,22 @@
+from unittest.mock import patch
+from helpers.ttl_cache import TTLCache
+
+
+def test_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_entries_expire():
+    cache = TTLCache(maxsize=2, ttl=10)
+    with patch("helpers.ttl_cache.time.monotonic", return_value=100):
+        cache.set("a", 1)
+    with patch("helpers.ttl_cache.time.monotonic", return_value=111):
+        assert cache.get("a") is None
+    assert cache.stats() == {"size": 0, "hits": 0, "misses": 1}
@@ -0,0 +1,49 @@
+import re
+import sqlite3
+from pathlib import Path
+from tests.fake_postgrest import SCHEMA
+
+MIGRATION = Path(__file__).resolve().parent.parent / "migrations" / "005_upsert_constraints.sql"
+
+
+def merge_statements() -> list[str]:
+    # The games/users merge at the top of the migration, in sqlite syntax: `delete ... using`
+    # becomes a rowid subquery and `update t set` gets an explicit alias.
+    sql = MIGRATION.read_text()
+    sql = re.sub(r"--[^\n]*", "", sql[:sql.index("delete from users_game_ratings a\nusing")])
+    statements = []
+    for statement in filter(None, (s.strip() for s in sql.split(";"))):
+        using = re.match(r"delete from (\w+) (\w+)\s+using (\w+) (\w+)\s+where (.*)", statement, re.S)
+        if using:
+            table, alias, other, other_alias, where = using.groups()
+            statement = f"delete from {table} where rowid in (select {alias}.rowid from {table} {alias}, {other} {other_alias} where {where})"
+        statements.append(re.sub(r"^update (\w+) t set", r"update \1 as t set", statement))
+    return statements
+
+
+def test_duplicate_games_and_users_are_merged_into_the_oldest_row():
+    # Before 005: no unique keys on bgg_id, discord_id or the collection/server links.
+    schema = SCHEMA.replace("discord_id integer unique", "discord_id integer").replace("bgg_id integer unique", "bgg_id integer")
+    schema = re.sub(r",\n    unique \((user_id, game_id|user_id, server_id)\)", "", schema)
+    db = sqlite3.connect(":memory:")
+    db.executescript(schema)
+    db.executescript("""
+        insert into users (id, discord_id, username) values (1, 100, 'a'), (2, 100, 'a'), (3, 100, 'a'), (4, 200, 'b');
+        insert into games (id, bgg_id, name) values (1, 13, 'Catan'), (2, 13, 'Catan'), (3, 14, 'Azul');
+        insert into sessions (id, game_id, server_id) values (1, 2, 7), (2, 1, 7);
+        insert into sessions_users (session_id, user_id) values (1, 2), (1, 3), (1, 4), (2, 1), (2, 2);
+        insert into sessions_winners (session_id, user_id) values (1, 3);
+        insert into users_games (user_id, game_id) values (2, 2), (3, 3);
+        insert into users_servers (user_id, server_id) values (3, 7);
+    """)
+
+    for statement in merge_statements():
+        db.execute(statement)
+
+    assert db.execute("select id from users order by id").fetchall() == [(1,), (4,)]
+    assert db.execute("select id from games order by id").fetchall() == [(1,), (3,)]
+    assert db.execute("select game_id from sessions order by id").fetchall() == [(1,), (1,)]
+    assert db.execute("select session_id, user_id from sessions_users order by 1, 2").fetchall() == [(1, 1), (1, 4), (2, 1)]
+    assert db.execute("select session_id, user_id from sessions_winners").fetchall() == [(1, 1)]
+    assert db.execute("select user_id, game_id from users_games order by 2").fetchall() == [(1, 1), (1, 3)]
+    assert db.execute("select user_id from users_servers").fetchall() == [(1,)]
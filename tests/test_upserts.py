@@ -0,0 +1,45 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from helpers import supa_helpers
+
+
+@pytest.mark.asyncio
+async def test_concurrent_ratings_leave_one_row_per_user_and_game(fake_db):
+    fake_db.seed("users", [{"id": uid, "discord_id": uid * 100, "username": f"user{uid}"} for uid in (1, 2, 3, 4)])
+    fake_db.seed("games", [{"id": 1, "bgg_id": 13, "name": "Catan"}])
+    expires_at = datetime.utcnow() + timedelta(days=7)
+
+    # Five rapid clicks from each of four users, all in flight at once.
+    clicks = [(uid, rating) for rating in range(1, 6) for uid in (1, 2, 3, 4)]
+    await asyncio.gather(*(supa_helpers.add_or_update_rating(uid, 1, rating, expires_at) for uid, rating in clicks))
+
+    rows = fake_db.rows("users_game_ratings")
+    assert sorted(r["user_id"] for r in rows) == [1, 2, 3, 4]
+    assert {r["rating"] for r in rows} == {5}
+    assert all(r["created_at"] for r in rows)
+    assert [r[:2] for r in fake_db.requests] == [("POST", "users_game_ratings")] * len(clicks)
+
+
+@pytest.mark.asyncio
+async def test_link_user_game_reports_whether_it_was_added(fake_db):
+    fake_db.seed("users", [{"id": 1, "discord_id": 100, "username": "user1"}])
+    fake_db.seed("games", [{"id": 1, "bgg_id": 13, "name": "Catan"}])
+
+    added = await asyncio.gather(*(supa_helpers.link_user_game(1, 1) for _ in range(5)))
+
+    assert sorted(added) == [False] * 4 + [True]
+    assert len(fake_db.rows("users_games")) == 1
+    assert len(fake_db.requests) == 5
+
+
+@pytest.mark.asyncio
+async def test_register_and_create_user_are_idempotent(fake_db):
+    first = await supa_helpers.create_user(100, "user1", "Nick")
+    again = await supa_helpers.create_user(100, "user1", "")
+    assert first["id"] == again["id"]
+    assert fake_db.rows("users")[0]["nickname"] == "Nick"
+
+    registrations = await asyncio.gather(*(supa_helpers.register_user_to_server(first["id"], 7) for _ in range(3)))
+    assert len(set(registrations)) == 1
+    assert len(fake_db.rows("users_servers")) == 1
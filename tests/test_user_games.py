@@ -0,0 +1,40 @@
+import pytest
+from helpers import supa_helpers
+
+
+@pytest.fixture
+def collection(fake_db):
+    names = ["Wingspan", "azul", "Catan", "Root", "Catan: Seafarers", "Brass_Birmingham", "100% Orange Juice", "Scythe"]
+    fake_db.seed("users", [{"id": 1, "discord_id": 100, "username": "collector"}, {"id": 2, "discord_id": 200, "username": "other"}])
+    fake_db.seed("games", [{"id": i, "bgg_id": 1000 + i, "name": name} for i, name in enumerate(names, start=1)])
+    fake_db.seed("users_games", [{"user_id": 1, "game_id": i} for i in range(1, 8)] + [{"user_id": 2, "game_id": 8}])
+    return fake_db
+
+
+@pytest.mark.asyncio
+async def test_collection_is_one_sorted_paginated_call(collection):
+    names = await supa_helpers.get_user_games_sorted_by_name(1)
+    assert names == sorted(names) and len(names) == 7 and "Scythe" not in names
+
+    page = await supa_helpers.get_user_games(1, offset=2, limit=2)
+    assert [g["name"] for g in page] == names[2:4]
+    assert [r[:2] for r in collection.requests] == [("GET", "users_games"), ("GET", "users_games")]
+
+
+@pytest.mark.asyncio
+async def test_name_search_is_server_side_and_literal(collection):
+    assert [g["name"] for g in await supa_helpers.search_user_games_by_name(1, "CATAN")] == ["Catan", "Catan: Seafarers"]
+    assert [g["name"] for g in await supa_helpers.search_user_games_by_name(1, "s_b")] == ["Brass_Birmingham"]
+    assert [g["name"] for g in await supa_helpers.search_user_games_by_name(1, "0%")] == ["100% Orange Juice"]
+    assert await supa_helpers.search_user_games_by_name(1, "scythe") == []
+    assert len(await supa_helpers.search_user_games_by_name(1, "a", limit=2)) == 2
+
+
+@pytest.mark.asyncio
+async def test_asterisk_in_a_search_matches_any_single_character(fake_db):
+    fake_db.seed("users", [{"id": 1, "discord_id": 100, "username": "collector"}])
+    fake_db.seed("games", [{"id": i, "bgg_id": 1000 + i, "name": name} for i, name in enumerate(["Root*", "Roots", "Root"], start=1)])
+    fake_db.seed("users_games", [{"user_id": 1, "game_id": i} for i in range(1, 4)])
+
+    # PostgREST reads * as %, so it can't be searched for literally; it must not widen the match either.
+    assert [g["name"] for g in await supa_helpers.search_user_games_by_name(1, "root*")] == ["Root*", "Roots"]
@@ -0,0 +1,111 @@
+import random
+import re
+import sqlite3
+from pathlib import Path
+import pytest
+from unittest.mock import patch
+from tests.reference_user_stats import (
+    get_all_sessions,
+    get_total_sessions_played,
+    get_total_wins,
+    get_most_played_game,
+)
+
+SERVER_ID = 1
+OTHER_SERVER_ID = 2
+MIGRATION = Path(__file__).resolve().parent.parent / "migrations" / "001_get_user_stats.sql"
+
+
+def build_fixture(seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    games = [{"id": i, "name": f"Game {i:02d}"} for i in range(1, 16)]
+    sessions, sessions_users, sessions_winners = [], [], []
+    for session_id in range(1, 121):
+        server_id = SERVER_ID if session_id % 5 else OTHER_SERVER_ID
+        sessions.append({
+            "id": session_id,
+            "game_id": rng.choice(games)["id"],
+            "server_id": server_id,
+            "date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        })
+        players = rng.sample(range(1, 9), rng.randint(2, 5))
+        sessions_users += [{"session_id": session_id, "user_id": uid} for uid in players]
+        sessions_winners += [{"session_id": session_id, "user_id": uid} for uid in rng.sample(players, 1)]
+    return {"games": games, "sessions": sessions, "sessions_users": sessions_users, "sessions_winners": sessions_winners}
+
+
+def load_sqlite(fixture: dict) -> sqlite3.Connection:
+    db = sqlite3.connect(":memory:")
+    db.executescript("""
+        create table games (id integer primary key, name text);
+        create table sessions (id integer primary key, game_id integer, server_id integer, date text);
+        create table sessions_users (session_id integer, user_id integer);
+        create table sessions_winners (session_id integer, user_id integer);
+    """)
+    db.executemany("insert into games values (:id, :name)", fixture["games"])
+    db.executemany("insert into sessions values (:id, :game_id, :server_id, :date)", fixture["sessions"])
+    db.executemany("insert into sessions_users values (:session_id, :user_id)", fixture["sessions_users"])
+    db.executemany("insert into sessions_winners values (:session_id, :user_id)", fixture["sessions_winners"])
+    return db
+
+
+def rpc_body_as_sqlite() -> str:
+    # Run the exact SELECT from the migration; only the parameter syntax differs.
+    body = re.search(r"\$\$(.*)\$\$", MIGRATION.read_text(), re.S).group(1)
+    return re.sub(r"\b(p_user_id|p_server_id)\b", r":\1", body)
+
+
+def python_helpers(fixture: dict) -> dict:
+    async def get_all_games():
+        return [{"id": g["id"], "name": g["name"]} for g in fixture["games"]]
+
+    async def get_sessions_for_game(game_id, server_id):
+        rows = [s for s in fixture["sessions"] if s["game_id"] == game_id and s["server_id"] == server_id]
+        return sorted(rows, key=lambda s: s["date"], reverse=True)
+
+    async def get_users_in_session(session_id):
+        return [{"user_id": r["user_id"]} for r in fixture["sessions_users"] if r["session_id"] == session_id]
+
+    async def get_winners_in_session(session_id):
+        return [r["user_id"] for r in fixture["sessions_winners"] if r["session_id"] == session_id]
+
+    async def get_game_by_id(game_id):
+        return next(g for g in fixture["games"] if g["id"] == game_id)
+
+    return {
+        "get_all_games": get_all_games,
+        "get_sessions_for_game": get_sessions_for_game,
+        "get_users_in_session": get_users_in_session,
+        "get_winners_in_session": get_winners_in_session,
+        "get_game_by_id": get_game_by_id,
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("user_id", [1, 2, 3, 4, 5, 6, 7, 8, 99])
+async def test_get_user_stats_rpc_matches_python_implementation(user_id):
+    fixture = build_fixture()
+    db = load_sqlite(fixture)
+    db.row_factory = sqlite3.Row
+    rpc = dict(db.execute(rpc_body_as_sqlite(), {"p_user_id": user_id, "p_server_id": SERVER_ID}).fetchone())
+
+    with patch.multiple("tests.reference_user_stats", **python_helpers(fixture)):
+        all_sessions = await get_all_sessions(SERVER_ID)
+        expected_sessions = await get_total_sessions_played(user_id, all_sessions)
+        expected_wins = await get_total_wins(user_id, all_sessions)
+        expected_name, expected_count = await get_most_played_game(user_id, all_sessions)
+
+    assert rpc["sessions_played"] == expected_sessions
+    assert rpc["wins"] == expected_wins
+    assert rpc["most_played_count"] == expected_count
+    if expected_count:
+        # Ties are broken by name server-side; the Python version picks whichever game it saw first.
+        played_game_ids = [
+            s["game_id"] for s in all_sessions
+            if any(r["session_id"] == s["id"] and r["user_id"] == user_id for r in fixture["sessions_users"])
+        ]
+        tied = {g["name"] for g in fixture["games"] if played_game_ids.count(g["id"]) == expected_count}
+        assert expected_name in tied
+        assert rpc["most_played_name"] == min(tied)
+    else:
+        assert rpc["most_played_name"] is None